@@ -29,19 +29,43 @@ Environment Variables:
     Can be one of 
     "CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", or "NOTSET".
     Defaults to "WARNING".
+- `LOG_ASYNC`: If set to "false", records are formatted and written by
+    the thread logging them. By default, the main process only queues
+    its records, and a background thread formats and writes them.
+    Worker processes always write their records directly.
+- `LOG_FORMAT`: If set to "json", each record is written as a single
+    JSON line with the run ID, the pipeline stage, the process ID and
+    the object identifiers passed in `extra`, instead of colored text.
+    With LOG_HANDLER "File", every process appends whole lines to the
+    same file, so the logs of parallel workers can be aggregated.
+- `LOG_RUN_ID`: The run ID of JSON records. Defaults to a random ID,
+    which worker processes inherit.
 """
 
 import os
+import atexit
+import json
 import logging
+import multiprocessing
+import queue
+import threading
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
 
 EXEC_INFO = os.getenv("EXEC_INFO") == "True"
 LOG_HANDLER = os.getenv("LOG_HANDLER", "Stream")
 LOG_FILE_PATH = os.getenv("LOG_FILE_PATH", "app.log")
 LOGLEVEL = os.getenv('LOGLEVEL', 'INFO').upper()
+LOG_ASYNC = os.getenv("LOG_ASYNC", "true").lower() != "false"
+LOG_FORMAT = os.getenv("LOG_FORMAT", "text").lower()
 
 if LOG_HANDLER not in {"File", "Stream"}:
     LOG_HANDLER = "Stream"
 
+if LOG_FORMAT not in {"text", "json"}:
+    LOG_FORMAT = "text"
+
 if LOGLEVEL not in {"CRITICAL", "ERROR", "WARNING", "INFO", "DEBUG", "NOTSET"}:
     LOGLEVEL = "WARNING"
 
@@ -69,12 +93,121 @@ class CustomFormatter(logging.Formatter):
         logging.CRITICAL: bold_red + format + reset
     }
 
+    def __init__(self):
+        super().__init__()
+        self.formatters = {
+            level: logging.Formatter(log_fmt)
+            for level, log_fmt in self.FORMATS.items()
+        }
+
     def format(self, record):  # pylint: disable=E0102
-        log_fmt = self.FORMATS.get(record.levelno)
-        formatter = logging.Formatter(log_fmt)
+        formatter = self.formatters.get(record.levelno)
+        if formatter is None:
+            formatter = logging.Formatter()
         return formatter.format(record)
 
 
+# Run and stage of the records of this process. Worker processes
+# inherit them, forked ones through memory and spawned ones through
+# the environment. Stages running concurrently in threads also keep
+# their own stage, while other threads get the last stage set.
+context = {
+    "run_id": os.environ.setdefault("LOG_RUN_ID", uuid.uuid4().hex[:12]),
+    "stage": os.getenv("LOG_STAGE"),
+}
+_thread_context = threading.local()
+
+
+def log_stage():
+    """Returns the pipeline stage of the current thread."""
+    return getattr(_thread_context, "stage", context["stage"])
+
+
+def set_log_stage(name):
+    """Sets the pipeline stage of the next records.
+
+    Args:
+        name (str): The stage name, or None outside of stages.
+
+    Returns:
+        str: The previous stage name of the current thread.
+    """
+    previous = log_stage()
+    _thread_context.stage = name
+    context["stage"] = name
+    if name is None:
+        os.environ.pop("LOG_STAGE", None)
+    else:
+        os.environ["LOG_STAGE"] = name
+    return previous
+
+
+class ContextFilter(logging.Filter):  # pylint: disable=R0903
+    """Adds the run ID and the stage to the records.
+
+    The filter runs in the thread logging a record, so that records
+    queued for the listener thread keep the stage they were logged in.
+    Records that already have them are left unchanged.
+    """
+
+    def filter(self, record):
+        if not hasattr(record, "run_id"):
+            record.run_id = context["run_id"]
+            record.stage = log_stage()
+        return True
+
+
+# Attributes of every LogRecord, the others are passed in `extra`.
+RECORD_ATTRIBUTES = frozenset(
+    logging.LogRecord("", 0, "", 0, "", (), None).__dict__) | {
+        "message", "asctime", "run_id", "stage"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as single-line JSON objects.
+
+    Each line holds the time, level, logger, message, run ID, stage,
+    process and file location of the record, its exception if any,
+    and the fields passed in `extra`, e.g. the object identifiers
+    `{"object_type": "apis", "object_name": "orders"}`.
+    """
+
+    def format(self, record):
+        entry = {
+            "time": datetime.fromtimestamp(
+                record.created, timezone.utc).isoformat(
+                    timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "run_id": getattr(record, "run_id", context["run_id"]),
+            "stage": getattr(record, "stage", log_stage()),
+            "pid": record.process,
+            "process": record.processName,
+            "file": f"{record.filename}:{record.lineno}",
+        }
+        for key, value in record.__dict__.items():
+            if key not in RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class AsyncQueueHandler(QueueHandler):
+    """Queues records for the QueueListener of this process.
+
+    The message is merged with its arguments by the logging thread,
+    so that later changes to the arguments do not show in the log,
+    while the formatting and writing is left to the listener.
+    """
+
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
 logger = logging.getLogger("Migratool")
 
 if LOG_HANDLER == "File":
@@ -86,6 +219,48 @@ else:
 ch.setLevel(getattr(logging, LOGLEVEL))
 logger.setLevel(ch.level)
 
-ch.setFormatter(CustomFormatter())
+if LOG_FORMAT == "json":
+    ch.setFormatter(JsonFormatter())
+    ch.addFilter(ContextFilter())
+else:
+    ch.setFormatter(CustomFormatter())
+
+listener = None
+queue_handler = None
 
-logger.addHandler(ch)
+
+def _write_directly():
+    """Writes the next records directly, without the listener thread.
+
+    Used in forked children, where the listener thread of the parent
+    does not exist.
+    """
+    global listener  # pylint: disable=W0603
+    listener = None
+    if queue_handler is not None:
+        logger.removeHandler(queue_handler)
+    logger.addHandler(ch)
+
+
+def stop_logging():
+    """Writes the queued records and stops the listener thread.
+
+    Records logged afterwards are written directly.
+    """
+    if listener is not None:
+        listener.stop()
+        _write_directly()
+
+
+if LOG_ASYNC and multiprocessing.parent_process() is None:
+    queue_handler = AsyncQueueHandler(queue.SimpleQueue())
+    for log_filter in ch.filters:
+        queue_handler.addFilter(log_filter)
+    listener = QueueListener(queue_handler.queue, ch,
+                             respect_handler_level=True)
+    listener.start()
+    atexit.register(stop_logging)
+    os.register_at_fork(after_in_child=_write_directly)
+    logger.addHandler(queue_handler)
+else:
+    logger.addHandler(ch)
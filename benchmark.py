@@ -0,0 +1,524 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""End to end benchmark of the assessment pipeline.
+
+This module runs the steps of `main.main` one stage at a time against
+a synthetic organization served by the mock Apigee API, and records
+for each stage its wall time, CPU time, peak memory and the number of
+API requests it made:
+
+- startup: imports main.py in a new interpreter, like a run of the
+  tool does before its first stage, and records the slowest imports.
+- export: exports the organization and downloads the proxy bundles.
+- unzip: unzips the proxy bundles.
+- dependency_map: builds the proxy dependency map, which includes
+  splitting proxies with too many proxy endpoints.
+- sharding: shards the environments.
+- unifier: splits the proxies with too many proxy endpoints again,
+  on its own.
+- validation: validates the artifacts, against a mock Apigee X
+  organization when --validate-target is set.
+- visualization, topology and report: generate the outputs.
+
+Each stage runs in a forked process, so its CPU time and peak memory
+cover the stage and its worker processes only. The results can be
+saved as a baseline, and later runs fail when a stage regresses by
+more than the thresholds of the [benchmark] section of
+backend.properties.
+
+The benchmark must be run from the root directory of the tool, like
+main.py; it runs the stages in a separate working directory.
+
+Usage:
+    python benchmark.py --proxies 1000 --update-baseline
+    python benchmark.py --proxies 1000
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from unittest.mock import patch
+import sharding
+import unifier
+import utils
+from base_logger import logger
+from core_wrappers import (
+    get_topology,
+    qualification_report,
+    validate_artifacts,
+    visualize_artifacts,
+)
+from exporter import ApigeeExporter
+from mock_apigee import MockApigeeServer, SyntheticOrg
+
+STAGES = ["startup", "export", "unzip", "dependency_map", "sharding",
+          "unifier", "validation", "visualization", "topology", "report"]
+# Metrics compared to the baseline, with the setting of their threshold
+# and of the minimum change considered a regression.
+METRICS = {
+    "wall_seconds": ("WALL_TIME_THRESHOLD", "MIN_TIME_DELTA"),
+    "cpu_seconds": ("CPU_TIME_THRESHOLD", "MIN_TIME_DELTA"),
+    "peak_rss_mb": ("PEAK_RSS_THRESHOLD", "MIN_RSS_DELTA_MB"),
+    "requests": ("REQUESTS_THRESHOLD", None),
+}
+DEFAULT_THRESHOLDS = {
+    "WALL_TIME_THRESHOLD": 0.25,
+    "CPU_TIME_THRESHOLD": 0.25,
+    "PEAK_RSS_THRESHOLD": 0.25,
+    "REQUESTS_THRESHOLD": 0.0,
+    "MIN_TIME_DELTA": 0.25,
+    "MIN_RSS_DELTA_MB": 20.0,
+}
+# ru_maxrss is in bytes on macOS, and in kilobytes elsewhere.
+RSS_SCALE = 1024 * 1024 if sys.platform == "darwin" else 1024
+SOURCE_ORG = "mock-org"
+TARGET_ORG = "mock-target"
+RESOURCES = ["all"]
+
+
+def write_input_properties(workdir, source_url, target_url=None):
+    """Writes the input.properties of a benchmark run.
+
+    Args:
+        workdir (str): The working directory of the run.
+        source_url (str): The URL of the mock source organization.
+        target_url (str): The URL of the mock target organization.
+    """
+    with open(os.path.join(workdir, "input.properties"), "w",
+              encoding="utf-8") as fl:
+        fl.write("[inputs]\n"
+                 f"SOURCE_URL={source_url}\n"
+                 f"SOURCE_ORG={SOURCE_ORG}\n"
+                 "SOURCE_AUTH_TYPE=basic\n"
+                 "SOURCE_APIGEE_VERSION=OPDK\n"
+                 f"TARGET_URL={target_url or 'https://apigee.googleapis.com/v1'}\n"  # noqa pylint: disable=C0301
+                 f"GCP_PROJECT_ID={TARGET_ORG}\n"
+                 "TARGET_DIR=target\n"
+                 "TARGET_COMPARE=false\n"
+                 "SSL_VERIFICATION=false\n")
+
+
+def stage_export(cfg, backend_cfg, state):
+    """Exports the organization, like `export_artifacts`."""
+    export_dir = f"{cfg.get('inputs', 'TARGET_DIR')}/{backend_cfg.get('export', 'EXPORT_DIR')}"  # noqa pylint: disable=C0301
+    utils.create_dir(f"{export_dir}/apis")
+    utils.create_dir(f"{export_dir}/sharedflows")
+    apigee_export = ApigeeExporter(
+        cfg.get("inputs", "SOURCE_URL"), cfg.get("inputs", "SOURCE_ORG"),
+        utils.get_source_auth_token(), cfg.get("inputs", "SOURCE_AUTH_TYPE"),
+        cfg.getboolean("inputs", "SSL_VERIFICATION"))
+    state["export_data"] = apigee_export.get_export_data(
+        RESOURCES, export_dir)
+    apigee_export.create_export_state(export_dir)
+
+
+def stage_unzip(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Unzips the exported proxy bundles."""
+    sharding.unzip_all_bundles(cfg)
+
+
+def stage_dependency_map(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Builds the proxy dependency map of the unzipped bundles."""
+    state["export_data"]["proxy_dependency_map"] = (
+        sharding.proxy_dependency_map(cfg, state["export_data"], unzip=False))
+
+
+def stage_sharding(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Shards the environments."""
+    export_data = state["export_data"]
+    export_data["sharding_output"] = sharding.sharding_wrapper(
+        export_data["proxy_dependency_map"], export_data)
+
+
+def stage_unifier(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Splits the proxies with too many proxy endpoints."""
+    split_proxies = [
+        proxy for proxy, dependencies in
+        state["export_data"]["proxy_dependency_map"].items()
+        if dependencies.get("is_split")]
+    if split_proxies:
+        utils.run_parallel(unifier.proxy_unifier, split_proxies)
+
+
+def stage_validation(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Validates the artifacts, like `main.main`.
+
+    The access token of the mock target organization cannot be
+    checked with Google, so its check is bypassed.
+    """
+    with patch("core_wrappers.get_access_token", return_value="token"):
+        report = validate_artifacts(
+            cfg, RESOURCES, state["export_data"],
+            not state["validate_target"])
+    report["report"] = True
+    state["export_data"]["validation_report"] = report
+    state["report"] = report
+
+
+def stage_visualization(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Writes the visualization of the artifacts."""
+    visualize_artifacts(cfg, state["export_data"], state.get("report", {}))
+
+
+def stage_topology(cfg, backend_cfg, state):  # noqa pylint: disable=W0613
+    """Maps and draws the OPDK topology."""
+    state["topology_mapping"] = get_topology(cfg)
+
+
+def stage_report(cfg, backend_cfg, state):
+    """Writes the qualification report."""
+    qualification_report(cfg, backend_cfg, state["export_data"],
+                         state.get("topology_mapping", {}))
+
+
+STAGE_FUNCTIONS = {
+    "export": stage_export,
+    "unzip": stage_unzip,
+    "dependency_map": stage_dependency_map,
+    "sharding": stage_sharding,
+    "unifier": stage_unifier,
+    "validation": stage_validation,
+    "visualization": stage_visualization,
+    "topology": stage_topology,
+    "report": stage_report,
+}
+
+
+def rss_mb(usage):
+    """Converts the peak RSS of a resource usage to megabytes."""
+    return usage.ru_maxrss / RSS_SCALE
+
+
+def run_stage(stage, state, connection):
+    """Runs a stage in a forked process and sends back its results.
+
+    Args:
+        stage (str): The stage name.
+        state (dict): The data produced by the previous stages.
+        connection (multiprocessing.connection.Connection): The pipe
+            the updated state and metrics are sent to.
+    """
+    cfg = utils.parse_config("input.properties")
+    backend_cfg = utils.parse_config("backend.properties")
+    metrics = {"error": None}
+    start_wall = time.perf_counter()
+    start_self = resource.getrusage(resource.RUSAGE_SELF)
+    start_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    try:
+        STAGE_FUNCTIONS[stage](cfg, backend_cfg, state)
+    except (Exception, SystemExit):  # noqa pylint: disable=W0718
+        metrics["error"] = traceback.format_exc(limit=3)
+    end_self = resource.getrusage(resource.RUSAGE_SELF)
+    end_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    metrics["wall_seconds"] = time.perf_counter() - start_wall
+    metrics["cpu_seconds"] = (
+        end_self.ru_utime + end_self.ru_stime
+        - start_self.ru_utime - start_self.ru_stime
+        + end_children.ru_utime + end_children.ru_stime
+        - start_children.ru_utime - start_children.ru_stime)
+    metrics["peak_rss_mb"] = max(rss_mb(end_self), rss_mb(end_children))
+    connection.send((state, metrics))
+    connection.close()
+
+
+def measure_startup(root_dir, top=10):
+    """Measures the time and memory needed to import main.py.
+
+    Args:
+        root_dir (str): The root directory of the tool.
+        top (int): The number of slowest imports to record.
+
+    Returns:
+        dict: The metrics of the startup, and the cumulative import
+              time in seconds of the slowest modules imported by
+              main.py.
+    """
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import json, resource, main; "
+         "usage = resource.getrusage(resource.RUSAGE_SELF); "
+         "print(json.dumps([usage.ru_utime + usage.ru_stime, "
+         "usage.ru_maxrss]))"],
+        cwd=root_dir, capture_output=True, text=True, check=False)
+    wall_seconds = time.perf_counter() - started
+    if result.returncode != 0:
+        return {"error": result.stderr[-2000:]}
+    cpu_seconds, maxrss = json.loads(result.stdout.splitlines()[-1])
+    imports = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit() and \
+                len(name) - len(name.lstrip()) <= 3:
+            imports[name.strip()] = int(cumulative) / 1e6
+    return {
+        "error": None,
+        "wall_seconds": wall_seconds,
+        "cpu_seconds": cpu_seconds,
+        "peak_rss_mb": maxrss / RSS_SCALE,
+        "requests": 0,
+        "imports": dict(sorted(
+            imports.items(), key=lambda item: -item[1])[:top]),
+    }
+
+
+def total_requests(servers):
+    """Returns the number of requests served by the mock servers."""
+    return sum(server.stats()["requests"] for server in servers)
+
+
+def run_benchmark(workdir, org, stages=None, latency=0.0,  # noqa pylint: disable=R0913,R0914,R0917
+                  error_rate=0.0, validate_target=False):
+    """Runs the pipeline stages against a mock organization.
+
+    Args:
+        workdir (str): The working directory of the run. Its target
+                       directory is removed first.
+        org (SyntheticOrg): The source organization.
+        stages (list): The stages to run, all stages when None.
+        latency (float): Seconds added to every mock API response.
+        error_rate (float): Fraction of mock API requests failing.
+        validate_target (bool): Whether to validate the bundles
+                                against a mock Apigee X organization.
+
+    Returns:
+        dict: The metrics of each stage, by stage name, and an error
+              for the stages that failed.
+    """
+    stages = [stage for stage in STAGES if stage in (stages or STAGES)]
+    root_dir = os.getcwd()
+    os.makedirs(workdir, exist_ok=True)
+    shutil.copy(os.path.join(root_dir, "backend.properties"), workdir)
+    shutil.rmtree(os.path.join(workdir, "target"), ignore_errors=True)
+    if "topology" in stages and shutil.which("dot") is None:
+        logger.warning("Graphviz is not installed, skipping the topology stage")  # noqa pylint: disable=C0301
+        stages.remove("topology")
+
+    results = {}
+    if "startup" in stages:
+        logger.info("Benchmarking stage startup")
+        results["startup"] = measure_startup(root_dir)
+        stages.remove("startup")
+
+    servers = [MockApigeeServer(org, latency=latency, error_rate=error_rate)]
+    if validate_target:
+        servers.append(MockApigeeServer(
+            SyntheticOrg(TARGET_ORG, proxies=0, sharedflows=0),
+            flavor="x", latency=latency, error_rate=error_rate))
+    for server in servers:
+        server.start()
+    os.environ.setdefault("SOURCE_AUTH_TOKEN", "bW9jazptb2Nr")
+    context = multiprocessing.get_context("fork")
+    state = {"validate_target": validate_target}
+    try:
+        os.chdir(workdir)
+        write_input_properties(
+            workdir, servers[0].url,
+            servers[1].url if validate_target else None)
+        for stage in stages:
+            logger.info(f"Benchmarking stage {stage}")  # noqa pylint: disable=W1203
+            requests_before = total_requests(servers)
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(
+                target=run_stage, args=(stage, state, sender))
+            process.start()
+            sender.close()
+            try:
+                state, metrics = receiver.recv()
+            except EOFError:
+                metrics = {"error": f"Stage process exited with code {process.exitcode}"}  # noqa pylint: disable=C0301
+            process.join()
+            metrics["requests"] = total_requests(servers) - requests_before
+            results[stage] = metrics
+            if metrics["error"]:
+                logger.error(f"Stage {stage} failed: {metrics['error']}")  # noqa pylint: disable=W1203
+    finally:
+        os.chdir(root_dir)
+        for server in servers:
+            server.stop()
+    return results
+
+
+def load_thresholds(backend_cfg):
+    """Reads the regression thresholds of backend.properties.
+
+    Args:
+        backend_cfg (configparser.ConfigParser): The backend
+                                                 configuration.
+
+    Returns:
+        dict: The value of each threshold setting.
+    """
+    return {
+        key: backend_cfg.getfloat("benchmark", key, fallback=default)
+        for key, default in DEFAULT_THRESHOLDS.items()
+    }
+
+
+def compare_to_baseline(results, baseline, thresholds):
+    """Finds the stage metrics that regressed from the baseline.
+
+    A metric regresses when it grows by more than its relative
+    threshold and, for time and memory, by more than a minimum
+    amount, so that short stages do not fail on noise.
+
+    Args:
+        results (dict): The benchmark results.
+        baseline (dict): The baseline results.
+        thresholds (dict): The threshold settings.
+
+    Returns:
+        list: A description of each regression.
+    """
+    regressions = []
+    if results.get("settings") != baseline.get("settings"):
+        regressions.append(
+            f"settings {results.get('settings')} differ from the baseline "
+            f"settings {baseline.get('settings')}")
+        return regressions
+    for stage, metrics in results["stages"].items():
+        if metrics.get("error"):
+            regressions.append(f"{stage}: failed")
+            continue
+        base = baseline["stages"].get(stage)
+        if not base or base.get("error"):
+            continue
+        for metric, (threshold_key, delta_key) in METRICS.items():
+            current, previous = metrics[metric], base[metric]
+            min_delta = thresholds[delta_key] if delta_key else 0
+            if (current > previous * (1 + thresholds[threshold_key])
+                    and current - previous > min_delta):
+                regressions.append(
+                    f"{stage}: {metric} {current:.2f} > baseline "
+                    f"{previous:.2f} (+{thresholds[threshold_key]:.0%})")
+    return regressions
+
+
+def format_results(results, baseline=None):
+    """Formats the results as a table.
+
+    Args:
+        results (dict): The benchmark results.
+        baseline (dict): The baseline results, shown as relative
+                         changes when given.
+
+    Returns:
+        str: The table.
+    """
+    lines = [f"{'stage':<16}" + "".join(f"{metric:>16}" for metric in METRICS)]
+    for stage, metrics in results["stages"].items():
+        if metrics.get("error"):
+            lines.append(f"{stage:<16}{'failed':>16}")
+            continue
+        cells = []
+        base = (baseline or {}).get("stages", {}).get(stage) or {}
+        for metric in METRICS:
+            cell = f"{metrics[metric]:.2f}" if metric != "requests" \
+                else str(metrics[metric])
+            if base.get(metric):
+                cell += f" ({metrics[metric] / base[metric] - 1:+.0%})"
+            cells.append(f"{cell:>16}")
+        lines.append(f"{stage:<16}" + "".join(cells))
+    imports = results["stages"].get("startup", {}).get("imports")
+    if imports:
+        lines.append("slowest imports: " + ", ".join(
+            f"{name} {seconds:.3f}s" for name, seconds in imports.items()))
+    return "\n".join(lines)
+
+
+def main():
+    """Runs the benchmark and compares it to the baseline."""
+    parser = argparse.ArgumentParser(
+        description="Benchmarks the assessment pipeline end to end.")
+    parser.add_argument("--proxies", type=int, default=100)
+    parser.add_argument("--sharedflows", type=int, default=5)
+    parser.add_argument("--apps", type=int, default=100)
+    parser.add_argument("--developers", type=int, default=50)
+    parser.add_argument("--environments", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every mock API response.")
+    parser.add_argument("--stages", type=str, default=",".join(STAGES),
+                        help="Comma separated stages to run.")
+    parser.add_argument("--validate-target", action="store_true",
+                        dest="validate_target",
+                        help="Validate bundles against a mock Apigee X org.")
+    parser.add_argument("--workdir", type=str, default=None,
+                        help="Working directory, a temporary one if unset.")
+    parser.add_argument("--baseline", type=str, default=None,
+                        help="Baseline file, BASELINE_FILE if unset.")
+    parser.add_argument("--update-baseline", action="store_true",
+                        dest="update_baseline",
+                        help="Save the results as the new baseline.")
+    parser.add_argument("--output", type=str, default=None,
+                        help="File to write the results to.")
+    args = parser.parse_args()
+
+    backend_cfg = utils.parse_config("backend.properties")
+    baseline_file = args.baseline or backend_cfg.get(
+        "benchmark", "BASELINE_FILE", fallback="benchmark_baseline.json")
+    settings = {
+        "proxies": args.proxies, "sharedflows": args.sharedflows,
+        "apps": args.apps, "developers": args.developers,
+        "environments": args.environments, "seed": args.seed,
+        "latency": args.latency, "validate_target": args.validate_target,
+    }
+    org = SyntheticOrg(
+        SOURCE_ORG, proxies=args.proxies, sharedflows=args.sharedflows,
+        environments=args.environments, developers=args.developers,
+        apps=args.apps, seed=args.seed)
+    workdir = args.workdir or tempfile.mkdtemp(prefix="benchmark-")
+    results = {
+        "settings": settings,
+        "stages": run_benchmark(
+            os.path.abspath(workdir), org, args.stages.split(","),
+            args.latency, validate_target=args.validate_target),
+    }
+    if args.output:
+        utils.write_json(args.output, results)
+
+    if args.update_baseline:
+        utils.write_json(baseline_file, results)
+        print(format_results(results))
+        print(f"Baseline saved to {baseline_file}")
+        return 0
+    if not os.path.exists(baseline_file):
+        print(format_results(results))
+        print(f"No baseline found at {baseline_file}, "
+              "run with --update-baseline to record one")
+        return 1 if any(m.get("error") for m in results["stages"].values()) else 0  # noqa pylint: disable=C0301
+    baseline = utils.parse_json(baseline_file)
+    print(format_results(results, baseline))
+    regressions = compare_to_baseline(
+        results, baseline, load_thresholds(backend_cfg))
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -28,6 +28,10 @@ Key Functions:
 
 - `pre_validation_checks`: Performs checks on the input configuration.
 - `export_artifacts`: Exports artifacts from the source Apigee instance.
+- `map_proxy_dependencies`: Maps the dependencies of the exported
+                        proxies.
+- `shard_environments`: Distributes the proxies across target
+                        environments.
 - `validate_artifacts`: Validates the exported artifacts against the
                         target environment.
 - `visualize_artifacts`: Creates a visual representation of the
@@ -44,16 +48,21 @@ Constants:
 """
 
 import os
-
-import networkx as nx  # pylint: disable=E0401
-from pyvis.network import Network  # pylint: disable=E0401
+import concurrent.futures
 
 import sharding
 from base_logger import logger
 from classic import ApigeeClassic
 from exporter import ApigeeExporter
+from instrumentation import stage
 from nextgen import ApigeeNewGen
-from qualification_report import QualificationReport
+from prevalidation import PreValidator
+from qualification_report import (
+    QualificationReport,
+    build_report_index,
+    write_report_csv,
+)
+from report_cache import ReportFingerprints
 from topology import ApigeeTopology
 from utils import (
     create_dir,
@@ -63,7 +72,9 @@ from utils import (
     parse_json,
     write_json,
 )
+from validation_cache import ValidationCache
 from validator import ApigeeValidator
+from visualization import build_artifact_graph
 
 SEPERATOR = " | "
 DEFAULT_GCP_ENV_TYPE = "ENVIRONMENT_TYPE_UNSPECIFIED"
@@ -180,6 +191,7 @@ def pre_validation_checks(cfg, skip_target_validation=False):  # noqa pylint: di
     return True
 
 
+@stage("export")
 def export_artifacts(cfg, resources_list): # noqa pylint: disable=R0914
     """Exports artifacts from the source Apigee environment.
 
@@ -229,17 +241,50 @@ def export_artifacts(cfg, resources_list): # noqa pylint: disable=R0914
         export_data = apigee_export.get_export_data(resources_list, export_dir)
         logger.debug(export_data)
         apigee_export.create_export_state(export_dir)
-    proxy_dependency_map = sharding.proxy_dependency_map(cfg, export_data)
-    export_data["proxy_dependency_map"] = proxy_dependency_map
-    if not os.environ.get("IGNORE_ENV_SHARD") == "true":
-        sharding_output = sharding.sharding_wrapper(
-            proxy_dependency_map, export_data)
-        export_data["sharding_output"] = sharding_output
     return export_data
 
 
+@stage("dependency_map")
+def map_proxy_dependencies(cfg, export_data):
+    """Maps the dependencies of the exported proxies.
+
+    Unzips the exported proxy bundles and collects the sharedflows,
+    KVMs, target servers and references each proxy depends on,
+    splitting proxies with too many proxy endpoints.
+
+    Args:
+        cfg (configparser.ConfigParser): The parsed configuration from
+                                        input.properties.
+        export_data (dict): A dictionary containing the exported
+                            artifact data.
+
+    Returns:
+        dict: The proxy dependency map.
+    """
+    logger.info("------------------- DEPENDENCY MAP -----------------------")  # noqa
+    return sharding.proxy_dependency_map(cfg, export_data)
+
+
+@stage("sharding")
+def shard_environments(proxy_dependency_map, export_data):
+    """Distributes the proxies across target environments.
+
+    Args:
+        proxy_dependency_map (dict): The proxy dependency map.
+        export_data (dict): A dictionary containing the exported
+                            artifact data.
+
+    Returns:
+        dict: The sharding results of each environment.
+    """
+    logger.info("------------------- SHARDING -----------------------")
+    return sharding.sharding_wrapper(proxy_dependency_map, export_data)
+
+
+@stage("validate")
 def validate_artifacts(
-    cfg, resources_list, export_data, skip_target_validation=False
+    cfg, resources_list, export_data, skip_target_validation=False,
+    force_revalidation=False
 ):  # noqa pylint: disable=R0914,R0912,R0915
     """Validates exported artifacts against the target environment.
 
@@ -254,6 +299,8 @@ def validate_artifacts(
                                         input.properties.
         export_data (dict): A dictionary containing the exported artifact
                             data.
+        force_revalidation (bool): Ignore cached proxy bundle
+                            validation results.
 
     Returns:
         dict: A dictionary containing the validation report.
@@ -309,93 +356,140 @@ def validate_artifacts(
             r for r in resources_list if r in target_resources
         ]  # noqa pylint: disable=C0301
     target_export_data = parse_json(target_export_data_file)
+    target_export = None
     if target_compare and (not target_export_data.get("export", False)):
         apigee_export = ApigeeExporter(
             target_url, gcp_project_id, gcp_token, "oauth", ssl_verification
         )
-        target_export_data = apigee_export.get_export_data(
-            target_resource_list, target_export_dir
+
+        def export_target():
+            exported_data = apigee_export.get_export_data(
+                target_resource_list, target_export_dir
+            )  # noqa pylint: disable=C0301
+            exported_data["export"] = True
+            write_json(target_export_data_file, exported_data)
+            return exported_data
+
+        # The target export runs in the background while the source
+        # bundles are validated; the validator waits for it only when
+        # target data is first needed.
+        target_export = concurrent.futures.ThreadPoolExecutor(max_workers=1)
+        target_export_data = target_export.submit(export_target)
+    try:
+        validation_cache = None
+        if backend_cfg.getboolean("validate", "VALIDATION_CACHE",
+                                  fallback=False):
+            validation_cache = ValidationCache(
+                f"{target_dir}/{backend_cfg.get('validate', 'VALIDATION_CACHE_FILE')}",  # noqa pylint: disable=C0301
+                backend_cfg.getint("validate", "VALIDATION_CACHE_MAX_ENTRIES"),
+                backend_cfg.getint("validate",
+                                   "VALIDATION_CACHE_MAX_AGE_DAYS"),
+                force_revalidation
+            )
+        pre_validator = None
+        if backend_cfg.getboolean("validate", "LOCAL_PREVALIDATION",
+                                  fallback=False):
+            pre_validator = PreValidator(
+                export_data.get("proxy_dependency_map", {}))
+        apigee_validator = ApigeeValidator(
+            target_url,
+            gcp_project_id,
+            gcp_token,
+            gcp_env_type,
+            target_export_data,
+            target_compare,
+            skip_target_validation,
+            ssl_verification,
+            validation_workers=backend_cfg.getint(
+                "validate", "VALIDATION_WORKERS", fallback=1),
+            validation_rate_per_minute=backend_cfg.getint(
+                "validate", "VALIDATION_RATE_PER_MINUTE", fallback=0),
+            validation_cache=validation_cache,
+            compare_workers=backend_cfg.getint(
+                "validate", "COMPARE_WORKERS", fallback=1),
+            pre_validator=pre_validator
         )  # noqa pylint: disable=C0301
-        target_export_data["export"] = True
-        write_json(target_export_data_file, target_export_data)
-    apigee_validator = ApigeeValidator(
-        target_url,
-        gcp_project_id,
-        gcp_token,
-        gcp_env_type,
-        target_export_data,
-        target_compare,
-        skip_target_validation,
-        ssl_verification
-    )  # noqa pylint: disable=C0301
-
-    for env, _ in export_data["envConfig"].items():
-        logger.info(f"Environment -- {env}")  # pylint: disable=W1203
-        target_servers = export_data["envConfig"][env]["targetServers"]
-        resourcefiles = export_data["envConfig"][env]["resourcefiles"]
-        flowhooks = export_data["envConfig"][env]["flowhooks"]
-        keyvaluemaps = export_data["envConfig"][env]["kvms"]
-        if "all" in resources_list or "keyvaluemaps" in resources_list:
-            report[env + SEPERATOR + "targetServers"] = (
-                apigee_validator.validate_env_targetservers(
-                    env, target_servers)
+
+        # Proxy bundles are validated first so their remote validation
+        # overlaps with a running target export.
+        proxy_report = {}
+        if "all" in resources_list or "apis" in resources_list:
+            apis = (
+                export_data.get("orgConfig", {}).get("apis", {}).keys()
             )  # noqa pylint: disable=C0301
-        if "all" in resources_list or "resourcefiles" in resources_list:
-            report[env + SEPERATOR + "resourcefiles"] = (
-                apigee_validator.validate_env_resourcefiles(env, resourcefiles)
+            apis_validation = apigee_validator.validate_proxy_bundles(
+                apis, export_dir, target_export_dir, "apis"
             )  # noqa pylint: disable=C0301
-        if "all" in resources_list or "flowhooks" in resources_list:
-            report[env + SEPERATOR + "flowhooks"] = (
-                apigee_validator.validate_env_flowhooks(env, flowhooks)
-            )  # noqa
-        if "all" in resources_list or "keyvaluemaps" in resources_list:
-            report[env + SEPERATOR + "keyvaluemaps"] = apigee_validator.validate_kvms( # noqa
-                env, keyvaluemaps
-            )  # noqa
+            # Todo  # pylint: disable=W0511
+            # validate proxy unifier output bundles
+            proxy_report.update(apis_validation)
+        if "all" in resources_list or "sharedflows" in resources_list:
+            sharedflows = (
+                export_data.get("orgConfig", {}).get("sharedflows", {}).keys()
+            )  # noqa pylint: disable=C0301
+            sf_validation = apigee_validator.validate_proxy_bundles(
+                sharedflows, export_dir, target_export_dir, "sharedflows"
+            )  # noqa pylint: disable=C0301
+            # Todo  # pylint: disable=W0511
+            # validate proxy unifier output bundles
+            proxy_report.update(sf_validation)
+
+        for env, _ in export_data["envConfig"].items():
+            logger.info(f"Environment -- {env}")  # pylint: disable=W1203
+            target_servers = export_data["envConfig"][env]["targetServers"]
+            resourcefiles = export_data["envConfig"][env]["resourcefiles"]
+            flowhooks = export_data["envConfig"][env]["flowhooks"]
+            keyvaluemaps = export_data["envConfig"][env]["kvms"]
+            if "all" in resources_list or "keyvaluemaps" in resources_list:
+                report[env + SEPERATOR + "targetServers"] = (
+                    apigee_validator.validate_env_targetservers(
+                        env, target_servers)
+                )  # noqa pylint: disable=C0301
+            if "all" in resources_list or "resourcefiles" in resources_list:
+                report[env + SEPERATOR + "resourcefiles"] = (
+                    apigee_validator.validate_env_resourcefiles(
+                        env, resourcefiles)
+                )  # noqa pylint: disable=C0301
+            if "all" in resources_list or "flowhooks" in resources_list:
+                report[env + SEPERATOR + "flowhooks"] = (
+                    apigee_validator.validate_env_flowhooks(env, flowhooks)
+                )  # noqa
+            if "all" in resources_list or "keyvaluemaps" in resources_list:
+                report[env + SEPERATOR + "keyvaluemaps"] = apigee_validator.validate_kvms( # noqa
+                    env, keyvaluemaps
+                )  # noqa
 
-    if "all" in resources_list or "org_keyvaluemaps" in resources_list:
-        org_keyvaluemaps = export_data["orgConfig"]["kvms"]
-        report["org_keyvaluemaps"] = apigee_validator.validate_kvms(
-            None, org_keyvaluemaps
-        )  # noqa
-    if "all" in resources_list or "developers" in resources_list:
-        developers = export_data["orgConfig"]["developers"]
-        report["developers"] = apigee_validator.validate_org_resource(
-            "developers", developers
-        )  # noqa pylint: disable=C0301
-    if "all" in resources_list or "apiproducts" in resources_list:
-        api_products = export_data["orgConfig"]["apiProducts"]
-        report["apiProducts"] = apigee_validator.validate_org_resource(
-            "apiProducts", api_products
-        )  # noqa pylint: disable=C0301
-    if "all" in resources_list or "apps" in resources_list:
-        apps = export_data["orgConfig"]["apps"]
-        report["apps"] = apigee_validator.validate_org_resource(
-            "apps", apps
-        )  # noqa pylint: disable=C0301
-    if "all" in resources_list or "apis" in resources_list:
-        apis = (
-            export_data.get("orgConfig", {}).get("apis", {}).keys()
-        )  # noqa pylint: disable=C0301
-        apis_validation = apigee_validator.validate_proxy_bundles(
-            apis, export_dir, target_export_dir, "apis"
-        )  # noqa pylint: disable=C0301
-        # Todo  # pylint: disable=W0511
-        # validate proxy unifier output bundles
-        report.update(apis_validation)
-    if "all" in resources_list or "sharedflows" in resources_list:
-        sharedflows = (
-            export_data.get("orgConfig", {}).get("sharedflows", {}).keys()
-        )  # noqa pylint: disable=C0301
-        sf_validation = apigee_validator.validate_proxy_bundles(
-            sharedflows, export_dir, target_export_dir, "sharedflows"
-        )  # noqa pylint: disable=C0301
-        # Todo  # pylint: disable=W0511
-        # validate proxy unifier output bundles
-        report.update(sf_validation)
+        if "all" in resources_list or "org_keyvaluemaps" in resources_list:
+            org_keyvaluemaps = export_data["orgConfig"]["kvms"]
+            report["org_keyvaluemaps"] = apigee_validator.validate_kvms(
+                None, org_keyvaluemaps
+            )  # noqa
+        if "all" in resources_list or "developers" in resources_list:
+            developers = export_data["orgConfig"]["developers"]
+            report["developers"] = apigee_validator.validate_org_resource(
+                "developers", developers
+            )  # noqa pylint: disable=C0301
+        if "all" in resources_list or "apiproducts" in resources_list:
+            api_products = export_data["orgConfig"]["apiProducts"]
+            report["apiProducts"] = apigee_validator.validate_org_resource(
+                "apiProducts", api_products
+            )  # noqa pylint: disable=C0301
+        if "all" in resources_list or "apps" in resources_list:
+            apps = export_data["orgConfig"]["apps"]
+            report["apps"] = apigee_validator.validate_org_resource(
+                "apps", apps
+            )  # noqa pylint: disable=C0301
+        report.update(proxy_report)
+    finally:
+        if target_export is not None:
+            target_export.shutdown()
+    if pre_validator is not None:
+        pre_validator.write_summary(
+            f"{target_dir}/{backend_cfg.get('validate', 'PREVALIDATION_SUMMARY_FILE')}")  # noqa pylint: disable=C0301
     return report
 
 
+@stage("visualize")
 def visualize_artifacts(
     cfg, export_data, report
 ):  # noqa pylint: disable=R0914,R0912,R0915
@@ -423,11 +517,11 @@ def visualize_artifacts(
     api_url = "https://apigee.googleapis.com/v1"
     exportorg = export_data["orgConfig"]
     exportenv = export_data["envConfig"]
-    dg = nx.DiGraph()
-    report.pop("report")
     # Process the report
     final_report = {}
     for res, val in report.items():
+        if res == "report":
+            continue
         final_report[res] = {}
         for i in val:
             if i.get("importable", False):
@@ -452,6 +546,27 @@ def visualize_artifacts(
                 else:
                     final_report[res][i["name"]] = violations  # noqa
 
+    target_dir = cfg.get("inputs", "TARGET_DIR")
+    visualization_graph_file = backend_cfg.get(
+        "visualize", "VISUALIZATION_GRAPH_FILE", fallback="visualization.html"
+    )
+    if backend_cfg.get("visualize", "VISUALIZATION_BACKEND", fallback="pyvis") == "compact":  # noqa pylint: disable=C0301
+        graph = build_artifact_graph(
+            source_url, export_data, final_report,
+            threshold=backend_cfg.getint(
+                "visualize", "VISUALIZATION_THRESHOLD", fallback=100),
+        )
+        graph.write_json(f"{target_dir}/" + backend_cfg.get(
+            "visualize", "VISUALIZATION_GRAPH_JSON",
+            fallback="visualization.json"))
+        graph.write_html(f"{target_dir}/{visualization_graph_file}",
+                         f"Organization - {source_url}")
+        return
+
+    # networkx and pyvis are slow to import, and only needed here.
+    import networkx as nx  # noqa pylint: disable=C0415,E0401
+    from pyvis.network import Network  # noqa pylint: disable=C0415,E0401
+    dg = nx.DiGraph()
     # Org level resources
     org_url = source_ui_url + source_url
     dg.add_node("ORG" + SEPERATOR + source_url, size=30, color="pink")
@@ -616,14 +731,49 @@ def visualize_artifacts(
 
     net = Network(notebook=True, cdn_resources="in_line", width=1000, height=800) # noqa
     net.from_nx(dg)
-    target_dir = cfg.get("inputs", "TARGET_DIR")
-    visualization_graph_file = backend_cfg.get(
-        "visualize", "VISUALIZATION_GRAPH_FILE", fallback="visualization.html"
-    )
     net.show(f"{target_dir}/{visualization_graph_file}")
 
 
-def qualification_report(cfg, backend_cfg, export_data, topology_mapping):
+def qualification_report_csv(backend_cfg, target_dir, report_index,
+                             report_fingerprints=None):
+    """Writes the qualification report sheets as CSV files.
+
+    With report fingerprints, only the sheets whose rows changed since
+    the previous run, or whose file is missing, are written.
+
+    Args:
+        backend_cfg (configparser.ConfigParser): The parsed backend
+                                                configuration.
+        target_dir (str): The target directory of the assessment.
+        report_index (dict): The rows of each report sheet.
+        report_fingerprints (ReportFingerprints): Fingerprints of the
+                                report files written by previous runs.
+    """
+    csv_report_dir = f"{target_dir}/" + backend_cfg.get(
+        "report", "CSV_REPORT_DIR", fallback="qualification_report_csv"
+    )
+    create_dir(csv_report_dir)
+    if not report_fingerprints:
+        write_report_csv(csv_report_dir, report_index)
+        return
+
+    sheet_fingerprints = {
+        sheet: ReportFingerprints.fingerprint(rows)
+        for sheet, rows in report_index.items()
+    }
+    changed_sheets = [
+        sheet for sheet, fingerprint in sheet_fingerprints.items()
+        if not report_fingerprints.is_current(
+            f"{csv_report_dir}/{sheet}.csv", fingerprint)
+    ]
+    write_report_csv(csv_report_dir, report_index, changed_sheets)
+    for sheet in changed_sheets:
+        report_fingerprints.update(
+            f"{csv_report_dir}/{sheet}.csv", sheet_fingerprints[sheet])
+
+
+@stage("qualification_report")
+def qualification_report(cfg, backend_cfg, export_data, topology_mapping):  # noqa pylint: disable=R0915
     """Generates a comprehensive qualification report.
 
     Generates a detailed Excel report summarizing the assessment of
@@ -648,51 +798,105 @@ def qualification_report(cfg, backend_cfg, export_data, topology_mapping):
 
     target_dir = cfg.get("inputs", "TARGET_DIR")
     org_name = cfg.get("inputs", "SOURCE_ORG")
-    qualification_report_name = backend_cfg.get(
+    report_format = backend_cfg.get("report", "REPORT_FORMAT", fallback="xlsx")
+    if report_format not in ("xlsx", "csv", "both"):
+        logger.warning(f"Unknown REPORT_FORMAT {report_format}, generating the xlsx report")  # noqa pylint: disable=W1203
+        report_format = "xlsx"
+
+    # The rows of all sheets are built once, concurrently, and shared
+    # by the xlsx and CSV outputs.
+    report_index = build_report_index(
+        export_data,
+        topology_mapping,
+        org_name,
+        workers=backend_cfg.getint("report", "REPORT_WORKERS", fallback=1),
+    )
+
+    # Report files whose inputs did not change since the previous run
+    # are not written again.
+    report_fingerprints = None
+    if backend_cfg.getboolean("report", "INCREMENTAL_REPORT", fallback=False):
+        report_fingerprints = ReportFingerprints(
+            f"{target_dir}/{backend_cfg.get('report', 'REPORT_FINGERPRINT_FILE', fallback='report_fingerprints.json')}"  # noqa pylint: disable=C0301
+        )
+
+    if report_format in ("csv", "both"):
+        qualification_report_csv(
+            backend_cfg, target_dir, report_index, report_fingerprints)
+
+    source_apigee_version = cfg.get("inputs", "SOURCE_APIGEE_VERSION")
+    qualification_report_path = f"{target_dir}/" + backend_cfg.get(
         "report", "QUALIFICATION_REPORT", fallback="qualification_report.xlsx"
     )
+    # The workbook is a single file, it is written again when any of
+    # its sheets or the limits and options it is built with change.
+    workbook_fingerprint = None
+    if report_fingerprints and report_format != "csv":
+        workbook_fingerprint = ReportFingerprints.fingerprint(
+            report_index,
+            dict(backend_cfg.items("inputs")) if backend_cfg.has_section("inputs") else {},  # noqa pylint: disable=C0301
+            dict(backend_cfg.items("report")),
+            source_apigee_version,
+            os.environ.get("IGNORE_ENV_SHARD"),
+        )
+        if report_fingerprints.is_current(
+                qualification_report_path, workbook_fingerprint):
+            logger.info(f"Qualification report {qualification_report_path} is up to date")  # noqa pylint: disable=W1203
+            report_fingerprints.save()
+            return
+
+    if report_format == "csv":
+        if report_fingerprints:
+            report_fingerprints.save()
+        return
 
     qualification_report_obj = QualificationReport(
-        f"{target_dir}/{qualification_report_name}",
+        qualification_report_path,
         export_data,
         topology_mapping,
         cfg,
         backend_cfg,
         org_name,
+        constant_memory=backend_cfg.getboolean(
+            "report", "XLSX_CONSTANT_MEMORY", fallback=False),
+        index=report_index,
     )
 
-    source_apigee_version = cfg.get("inputs", "SOURCE_APIGEE_VERSION")
-
-    if not os.environ.get("IGNORE_ENV_SHARD") == "true":
-        qualification_report_obj.sharding()
+    # The sheets are written one by one in workbook order.
+    qualification_report_obj.qualification_report_summary()
+    qualification_report_obj.validation_report()
+    qualification_report_obj.report_org_resourcefiles()
+    qualification_report_obj.sharded_proxies()
+    qualification_report_obj.report_alias_keycert()
+    qualification_report_obj.report_proxies_per_env()
+    qualification_report_obj.report_north_bound_mtls()
+    qualification_report_obj.report_company_and_developer()
+    qualification_report_obj.report_anti_patterns()
+    qualification_report_obj.report_cache_without_expiry()
+    qualification_report_obj.report_apps_without_api_products()
+    qualification_report_obj.report_json_path_enabled()
+    qualification_report_obj.report_cname_anomaly()
+    qualification_report_obj.report_unsupported_policies()
+    qualification_report_obj.report_api_limits()
+    qualification_report_obj.report_org_limits()
+    qualification_report_obj.report_env_limits()
+    qualification_report_obj.report_api_with_multiple_basepaths()
 
     if source_apigee_version == "OPDK":
         qualification_report_obj.report_network_topology()
 
-    qualification_report_obj.report_api_with_multiple_basepaths()
-    qualification_report_obj.report_env_limits()
-    qualification_report_obj.report_org_limits()
-    qualification_report_obj.report_api_limits()
-    qualification_report_obj.report_unsupported_policies()
-    qualification_report_obj.report_cname_anomaly()
-    qualification_report_obj.report_json_path_enabled()
-    qualification_report_obj.report_apps_without_api_products()
-    qualification_report_obj.report_cache_without_expiry()
-    qualification_report_obj.report_anti_patterns()
-    qualification_report_obj.report_company_and_developer()
-    qualification_report_obj.report_north_bound_mtls()
-    qualification_report_obj.report_proxies_per_env()
-    qualification_report_obj.report_alias_keycert()
-    qualification_report_obj.sharded_proxies()
-    qualification_report_obj.report_org_resourcefiles()
-    qualification_report_obj.validation_report()
-    qualification_report_obj.qualification_report_summary()
-
-    qualification_report_obj.reverse_sheets()
+    if not os.environ.get("IGNORE_ENV_SHARD") == "true":
+        qualification_report_obj.sharding()
 
     qualification_report_obj.close()
 
+    if report_fingerprints:
+        report_fingerprints.update(
+            qualification_report_path, workbook_fingerprint)
+        report_fingerprints.save()
+
 
+@stage("topology")
 def get_topology(cfg):
     """Determines the topology of the source Apigee OPDK installation.
 
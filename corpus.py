@@ -0,0 +1,410 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Generates a synthetic corpus of proxy and sharedflow bundles.
+
+The bundles resemble real ones closely enough to exercise the proxy
+parsing, dependency map, sharding and unifier code at scale: proxies
+have a varying number of proxy endpoints, base paths, conditional
+flows, route rules and target endpoints, and their policies include
+flow callouts to sharedflows, KVM operations, quotas, caches and
+unsupported policies.
+
+Each bundle is generated from the corpus seed and its own name, so a
+bundle does not depend on the other bundles of the corpus and any
+subset of a corpus can be generated again identically.
+
+Usage:
+    python corpus.py --output corpus --proxies 1000 --seed 7
+"""
+
+import argparse
+import concurrent.futures
+import functools
+import io
+import os
+import random
+import zipfile
+from base_logger import logger
+
+BUNDLE_DATE = (2025, 1, 1, 0, 0, 0)
+BASE_PATH_PREFIXES = [
+    f"{resource}{version}" for version in ("", "-v2", "-legacy")
+    for resource in ("orders", "customers", "payments", "catalog",
+                     "inventory", "shipping", "identity", "reports")]
+# Number of proxy endpoints of a proxy, with their relative weight.
+PROXY_ENDPOINT_WEIGHTS = {1: 60, 2: 15, 3: 8, 4: 5, 6: 5, 10: 4, 14: 2, 20: 1}
+
+
+class ProxyCorpus():
+    """Generates deterministic proxy and sharedflow bundles."""
+
+    def __init__(self, seed=0, sharedflows=None, targetservers=None,  # noqa pylint: disable=R0913,R0917
+                 kvms=None, keystores=None, max_flows=6, max_targets=3):
+        """Initializes ProxyCorpus.
+
+        Args:
+            seed (int): Seed of the corpus.
+            sharedflows (list): Sharedflows called by proxies.
+            targetservers (list): Target servers used by target
+                                  endpoints.
+            kvms (list): KVMs used by KVM policies.
+            keystores (list): Keystores referenced by target endpoints.
+            max_flows (int): Maximum conditional flows per endpoint.
+            max_targets (int): Maximum target endpoints per proxy.
+        """
+        self.seed = seed
+        self.sharedflows = (sharedflows if sharedflows is not None
+                            else [f"sharedflow-{i:03d}" for i in range(5)])
+        self.targetservers = (targetservers if targetservers is not None
+                              else [f"target-{i}" for i in range(3)])
+        self.kvms = kvms if kvms is not None else ["kvm-0", "kvm-1"]
+        self.keystores = (keystores if keystores is not None
+                          else ["keystore-0"])
+        self.max_flows = max_flows
+        self.max_targets = max_targets
+
+    def _rng(self, api_type, name):
+        """Returns the random generator of a bundle."""
+        return random.Random(f"{self.seed}/{api_type}/{name}")
+
+    def _policy(self, rng, name, kind):  # noqa pylint: disable=R0911
+        """Generates the XML of a policy of a kind."""
+        if kind == "FlowCallout":
+            return (f'<FlowCallout name="{name}"><SharedFlowBundle>'
+                    f"{rng.choice(self.sharedflows)}</SharedFlowBundle>"
+                    "</FlowCallout>")
+        if kind == "KeyValueMapOperations":
+            return (f'<KeyValueMapOperations name="{name}" mapIdentifier='
+                    f'"{rng.choice(self.kvms)}"><Scope>environment</Scope>'
+                    '<Get assignTo="private.value"><Key><Parameter>key-0'
+                    "</Parameter></Key></Get></KeyValueMapOperations>")
+        if kind == "Quota":
+            return (f'<Quota name="{name}"><Allow count="100"/>'
+                    "<Interval>1</Interval><TimeUnit>minute</TimeUnit>"
+                    f"<Distributed>{rng.choice(['true', 'false'])}"
+                    "</Distributed><Synchronous>false</Synchronous></Quota>")
+        if kind == "ExtractVariables":
+            variables = "".join(
+                f'<Variable name="var{i}"><JSONPath>$.field{i}</JSONPath>'
+                "</Variable>" for i in range(rng.randint(1, 3)))
+            return (f'<ExtractVariables name="{name}"><Source>request'
+                    f"</Source><JSONPayload>{variables}</JSONPayload>"
+                    "</ExtractVariables>")
+        if kind == "ResponseCache":
+            expiry = ("<ExpirySettings><TimeoutInSec>300</TimeoutInSec>"
+                      "</ExpirySettings>" if rng.random() < 0.7 else "")
+            return (f'<ResponseCache name="{name}"><CacheKey><KeyFragment '
+                    'ref="request.uri"/></CacheKey>'
+                    f"{expiry}</ResponseCache>")
+        if kind == "Javascript":
+            return (f'<Javascript name="{name}" timeLimit="200">'
+                    f"<ResourceURL>jsc://{name}.js</ResourceURL></Javascript>")
+        if kind == "VerifyAPIKey":
+            return (f'<VerifyAPIKey name="{name}"><APIKey '
+                    'ref="request.header.x-api-key"/></VerifyAPIKey>')
+        if kind == "SpikeArrest":
+            return (f'<SpikeArrest name="{name}"><Rate>30ps</Rate>'
+                    '</SpikeArrest>')
+        if kind == "RaiseFault":
+            return (f'<RaiseFault name="{name}"><FaultResponse><Set>'
+                    "<StatusCode>404</StatusCode></Set></FaultResponse>"
+                    "</RaiseFault>")
+        if kind == "StatisticsCollector":
+            return (f'<StatisticsCollector name="{name}"><Statistics>'
+                    '<Statistic name="stat" ref="request.verb" type="string">'
+                    "GET</Statistic></Statistics></StatisticsCollector>")
+        return (f'<AssignMessage name="{name}"><Set><Headers><Header '
+                f'name="x-{name.lower()}">{rng.randint(0, 999)}</Header>'
+                "</Headers></Set></AssignMessage>")
+
+    def _policies(self, rng, count):
+        """Picks the names and kinds of the policies of a bundle.
+
+        Returns:
+            dict: The kind of each policy, by policy name.
+        """
+        kinds = (["AssignMessage"] * 6 + ["FlowCallout"] * 3
+                 + ["KeyValueMapOperations"] * 2 + ["ExtractVariables"] * 2
+                 + ["Javascript"] * 2 + ["Quota", "ResponseCache",
+                                         "VerifyAPIKey", "SpikeArrest",
+                                         "RaiseFault"])
+        if rng.random() < 0.1:
+            kinds.append("StatisticsCollector")
+        if not self.sharedflows:
+            kinds = [kind for kind in kinds if kind != "FlowCallout"]
+        if not self.kvms:
+            kinds = [kind for kind in kinds
+                     if kind != "KeyValueMapOperations"]
+        policies = {}
+        for i in range(count):
+            kind = rng.choice(kinds)
+            prefix = "".join(char for char in kind if char.isupper())
+            policies[f"{prefix}-{i}"] = kind
+        return policies
+
+    @staticmethod
+    def _steps(rng, policies, count):
+        """Generates the steps of a request or response."""
+        if not policies or not count:
+            return ""
+        return "".join(f"<Step><Name>{policy}</Name></Step>"
+                       for policy in rng.sample(policies,
+                                                min(count, len(policies))))
+
+    def _flows(self, rng, policies):
+        """Generates the conditional flows of an endpoint."""
+        flows = []
+        for i in range(rng.randint(0, self.max_flows)):
+            verb = rng.choice(["GET", "POST", "PUT", "DELETE"])
+            flows.append(
+                f'<Flow name="flow-{i}"><Request>'
+                f"{self._steps(rng, policies, rng.randint(1, 2))}</Request>"
+                f"<Response>{self._steps(rng, policies, rng.randint(0, 1))}"
+                "</Response><Condition>(proxy.pathsuffix MatchesPath "
+                f'"/resource{i}/*") and (request.verb = "{verb}")'
+                "</Condition></Flow>")
+        return "".join(flows)
+
+    def _target_endpoint(self, rng, name, policies):
+        """Generates the XML of a target endpoint."""
+        if self.targetservers and rng.random() < 0.6:
+            servers = "".join(
+                f'<Server name="{server}"/>' for server in rng.sample(
+                    self.targetservers,
+                    rng.randint(1, min(2, len(self.targetservers)))))
+            connection = (f"<LoadBalancer>{servers}</LoadBalancer>"
+                          "<Path>/backend</Path>")
+        else:
+            ssl = ""
+            if self.keystores and rng.random() < 0.3:
+                ssl = ("<SSLInfo><Enabled>true</Enabled><KeyStore>ref://"
+                       f"{rng.choice(self.keystores)}-ref</KeyStore>"
+                       "<TrustStore>ref://truststore-ref</TrustStore>"
+                       "</SSLInfo>")
+            connection = (f"{ssl}<URL>https://{name}.backend.example.com"
+                          "</URL>")
+        return (f'<TargetEndpoint name="{name}"><PreFlow name="PreFlow">'
+                f"<Request>{self._steps(rng, policies, rng.randint(0, 2))}"
+                "</Request><Response/></PreFlow><PostFlow name="
+                '"PostFlow"><Request/><Response/></PostFlow>'
+                f"<Flows/><HTTPTargetConnection>{connection}"
+                "</HTTPTargetConnection></TargetEndpoint>")
+
+    def _proxy_endpoint(self, rng, name, base_path, policies, targets):  # noqa pylint: disable=R0913,R0917
+        """Generates the XML of a proxy endpoint."""
+        route_targets = rng.sample(targets, rng.randint(1, len(targets)))
+        routes = "".join(
+            f'<RouteRule name="route-{target}"><Condition>request.header.'
+            f'x-target = "{target}"</Condition><TargetEndpoint>{target}'
+            "</TargetEndpoint></RouteRule>" for target in route_targets[1:])
+        routes += (f'<RouteRule name="default"><TargetEndpoint>'
+                   f"{route_targets[0]}</TargetEndpoint></RouteRule>")
+        return (f'<ProxyEndpoint name="{name}"><Description/>'
+                '<FaultRules/><PreFlow name="PreFlow"><Request>'
+                f"{self._steps(rng, policies, rng.randint(1, 3))}</Request>"
+                f"<Response>{self._steps(rng, policies, rng.randint(0, 1))}"
+                '</Response></PreFlow><PostFlow name="PostFlow"><Request/>'
+                f"<Response>{self._steps(rng, policies, rng.randint(0, 1))}"
+                f"</Response></PostFlow><Flows>{self._flows(rng, policies)}"
+                f"</Flows><HTTPProxyConnection><BasePath>{base_path}"
+                "</BasePath><Properties/><VirtualHost>default</VirtualHost>"
+                "<VirtualHost>secure</VirtualHost></HTTPProxyConnection>"
+                f"{routes}</ProxyEndpoint>")
+
+    def proxy_files(self, name, revision="1"):  # noqa pylint: disable=R0914
+        """Generates the files of a proxy bundle.
+
+        Args:
+            name (str): The proxy name.
+            revision (str): The revision, recorded in the root file.
+
+        Returns:
+            dict: The content of each file, by path in the bundle.
+        """
+        rng = self._rng("apis", name)
+        endpoint_count = rng.choices(
+            list(PROXY_ENDPOINT_WEIGHTS),
+            list(PROXY_ENDPOINT_WEIGHTS.values()))[0]
+        policies = self._policies(rng, rng.randint(3, 8 + 2 * endpoint_count))
+        used = list(policies)[:max(1, len(policies) - rng.randint(0, 2))]
+        targets = ["default"] + [f"target-endpoint-{i}" for i in
+                                 range(1, rng.randint(1, self.max_targets))]
+        prefixes = rng.sample(BASE_PATH_PREFIXES, rng.randint(
+            1, min(endpoint_count, len(BASE_PATH_PREFIXES))))
+        endpoints = ["default"] + [f"endpoint-{i}"
+                                   for i in range(1, endpoint_count)]
+
+        files = {}
+        base_paths = []
+        for i, endpoint in enumerate(endpoints):
+            base_path = f"/{rng.choice(prefixes)}/{name}/v{i + 1}"
+            base_paths.append(base_path)
+            files[f"apiproxy/proxies/{endpoint}.xml"] = self._proxy_endpoint(
+                rng, endpoint, base_path, used, targets)
+        for target in targets:
+            files[f"apiproxy/targets/{target}.xml"] = self._target_endpoint(
+                rng, target, used)
+        for policy, kind in policies.items():
+            files[f"apiproxy/policies/{policy}.xml"] = self._policy(
+                rng, policy, kind)
+            if kind == "Javascript":
+                files[f"apiproxy/resources/jsc/{policy}.js"] = (
+                    f"context.setVariable('{policy}', '{name}');")
+        files[f"apiproxy/{name}.xml"] = (
+            f'<APIProxy revision="{revision}" name="{name}">'
+            f"<Basepaths>{base_paths[0]}</Basepaths>"
+            f"<Description>Synthetic proxy {name}</Description>"
+            "<Policies>" + "".join(f"<Policy>{policy}</Policy>"
+                                   for policy in policies) + "</Policies>"
+            "<ProxyEndpoints>" + "".join(
+                f"<ProxyEndpoint>{endpoint}</ProxyEndpoint>"
+                for endpoint in endpoints) + "</ProxyEndpoints>"
+            "<TargetEndpoints>" + "".join(
+                f"<TargetEndpoint>{target}</TargetEndpoint>"
+                for target in targets) + "</TargetEndpoints></APIProxy>")
+        return files
+
+    def sharedflow_files(self, name, revision="1"):
+        """Generates the files of a sharedflow bundle.
+
+        Sharedflows do not call other sharedflows.
+
+        Args:
+            name (str): The sharedflow name.
+            revision (str): The revision, recorded in the root file.
+
+        Returns:
+            dict: The content of each file, by path in the bundle.
+        """
+        rng = self._rng("sharedflows", name)
+        policies = {policy: kind for policy, kind in
+                    self._policies(rng, rng.randint(1, 6)).items()
+                    if kind != "FlowCallout"} or {"AM-0": "AssignMessage"}
+        files = {}
+        for policy, kind in policies.items():
+            files[f"sharedflowbundle/policies/{policy}.xml"] = self._policy(
+                rng, policy, kind)
+        files["sharedflowbundle/sharedflows/default.xml"] = (
+            '<SharedFlow name="default">'
+            + self._steps(rng, list(policies), len(policies))
+            + "</SharedFlow>")
+        files[f"sharedflowbundle/{name}.xml"] = (
+            f'<SharedFlowBundle revision="{revision}" name="{name}">'
+            "<Policies>" + "".join(f"<Policy>{policy}</Policy>"
+                                   for policy in policies) + "</Policies>"
+            "<SharedFlows><SharedFlow>default</SharedFlow></SharedFlows>"
+            "</SharedFlowBundle>")
+        return files
+
+    def bundle(self, api_type, name, revision="1"):
+        """Generates a zipped bundle.
+
+        The zip entries have fixed timestamps, so the bytes of a
+        bundle only depend on the seed and the arguments.
+
+        Args:
+            api_type (str): 'apis' or 'sharedflows'.
+            name (str): The proxy or sharedflow name.
+            revision (str): The revision.
+
+        Returns:
+            bytes: The zipped bundle.
+        """
+        files = (self.sharedflow_files(name, revision)
+                 if api_type == "sharedflows"
+                 else self.proxy_files(name, revision))
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zf:
+            for path in sorted(files):
+                zf.writestr(zipfile.ZipInfo(path, BUNDLE_DATE), files[path],
+                            compress_type=zipfile.ZIP_DEFLATED)
+        return buffer.getvalue()
+
+    def write_bundle(self, api_type, name, output_dir, unzipped_dir=None):
+        """Writes a bundle as `<output_dir>/<api_type>/<name>.zip`.
+
+        Args:
+            api_type (str): 'apis' or 'sharedflows'.
+            name (str): The proxy or sharedflow name.
+            output_dir (str): The corpus directory.
+            unzipped_dir (str): If set, the bundle is also extracted
+                                to `<unzipped_dir>/<name>/`.
+        """
+        data = self.bundle(api_type, name)
+        with open(os.path.join(output_dir, api_type, f"{name}.zip"),
+                  "wb") as fl:
+            fl.write(data)
+        if unzipped_dir:
+            with zipfile.ZipFile(io.BytesIO(data)) as zf:
+                zf.extractall(os.path.join(unzipped_dir, name))
+
+    def write(self, output_dir, proxies, unzipped_dir=None, workers=1):
+        """Writes the bundles of the corpus.
+
+        Proxies are written to `<output_dir>/apis` and sharedflows to
+        `<output_dir>/sharedflows`, the layout of exported bundles.
+
+        Args:
+            output_dir (str): The corpus directory.
+            proxies (list): The proxy names.
+            unzipped_dir (str): If set, proxies are also extracted
+                                there, the layout of unzipped bundles.
+            workers (int): Number of processes generating bundles.
+        """
+        for api_type in ("apis", "sharedflows"):
+            os.makedirs(os.path.join(output_dir, api_type), exist_ok=True)
+        jobs = [("sharedflows", name) for name in self.sharedflows]
+        jobs.extend(("apis", name) for name in proxies)
+        logger.info(f"Writing {len(proxies)} proxies and {len(self.sharedflows)} sharedflows to {output_dir}")  # noqa pylint: disable=C0301,W1203
+        write = functools.partial(self._write_job, output_dir=output_dir,
+                                  unzipped_dir=unzipped_dir)
+        if workers > 1:
+            with concurrent.futures.ProcessPoolExecutor(
+                    max_workers=workers) as executor:
+                list(executor.map(write, jobs, chunksize=64))
+        else:
+            list(map(write, jobs))
+
+    def _write_job(self, job, output_dir, unzipped_dir):
+        """Writes the bundle of an (api_type, name) job."""
+        api_type, name = job
+        self.write_bundle(api_type, name, output_dir,
+                          unzipped_dir if api_type == "apis" else None)
+
+
+def main():
+    """Writes a corpus of bundles from the command line."""
+    parser = argparse.ArgumentParser(
+        description="Generates synthetic proxy and sharedflow bundles.")
+    parser.add_argument("--output", required=True,
+                        help="Directory of the corpus.")
+    parser.add_argument("--proxies", type=int, default=100)
+    parser.add_argument("--sharedflows", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--unzipped", default=None,
+                        help="Directory to also extract the proxies to.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args()
+
+    corpus = ProxyCorpus(
+        args.seed, [f"sharedflow-{i:03d}" for i in range(args.sharedflows)])
+    corpus.write(args.output, [f"proxy-{i:05d}" for i in range(args.proxies)],
+                 args.unzipped, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -204,7 +204,10 @@ class ApigeeExporter():  # pylint: disable=R0902
                     logger.info(f"--Exporting {each_env_object_type}--")      # noqa pylint: disable=W1203
                     for each_env_object in env_objects:
                         logger.info(    # noqa pylint: disable=W1203
-                            f"Exporting {each_env_object_type} {each_env_object}")  # noqa
+                            f"Exporting {each_env_object_type} {each_env_object}",  # noqa
+                            extra={"env": env,
+                                   "object_type": each_env_object_type,
+                                   "object_name": each_env_object})
                         if self.apigee_type == 'x' and each_env_object_type == 'keyvaluemaps':  # noqa pylint: disable=C0301
                             obj_data = self.apigee.get_env_object(
                                         env, each_env_object_type, f'{each_env_object}/entries')  # noqa pylint: disable=C0301
@@ -266,7 +269,9 @@ class ApigeeExporter():  # pylint: disable=R0902
                 else:
                     for each_org_object in org_objects:
                         logger.info(    # noqa pylint: disable=W1203
-                            f"Exporting {each_org_object_type} {each_org_object}")  # noqa
+                            f"Exporting {each_org_object_type} {each_org_object}",  # noqa
+                            extra={"object_type": each_org_object_type,
+                                   "object_name": each_org_object})
                         obj_data = self.apigee.get_org_object(
                             each_org_object_type, each_org_object)
                         self.export_data['orgConfig'][self.org_object_types[each_org_object_type]][each_org_object] = obj_data  # noqa pylint: disable=C0301
@@ -300,7 +305,9 @@ class ApigeeExporter():  # pylint: disable=R0902
             apis = self.apigee.list_org_objects(each_api_type)
 
             for each_api in apis:
-                logger.info(f"Exporting {each_api_type} {each_api}")    # noqa pylint: disable=W1203
+                logger.info(f"Exporting {each_api_type} {each_api}",    # noqa pylint: disable=W1203
+                            extra={"object_type": each_api_type,
+                                   "object_name": each_api})
                 # extract revisions
                 revs = self.apigee.list_api_revisions(each_api_type, each_api)
                 self.export_data['orgConfig'][each_api_type][each_api] = revs
@@ -0,0 +1,291 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""HTTP request metrics of the Apigee management API calls.
+
+This module groups the requests made by `rest.RestClient` by method,
+host and endpoint template, e.g.
+`/v1/organizations/{org}/apis/{id}/revisions/{id}`, and keeps for each
+group the number of requests, a latency histogram, the bytes sent and
+received, the status codes returned and the number of requests made
+while retrying. The metrics can be written as JSON or as a Prometheus
+textfile at the end of a run.
+"""
+
+import bisect
+import json
+import os
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from base_logger import logger
+
+# Upper bounds, in seconds, of the latency histogram buckets.
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0)
+# Path segments following these names are resource names.
+TEMPLATE_NAMES = {"organizations": "{org}", "environments": "{env}"}
+PROMETHEUS_PREFIX = "apigee_assessment_http"
+
+_local = threading.local()
+
+
+def endpoint_template(url):
+    """Returns the endpoint template of a management API URL.
+
+    The paths of the Apigee management APIs alternate collections
+    and resource names after /organizations, so every other segment
+    is replaced by a placeholder.
+
+    Args:
+        url (str): The request URL.
+
+    Returns:
+        str: The URL path, with resource names replaced.
+    """
+    segments = urlsplit(url).path.split("/")
+    if "organizations" not in segments:
+        return "/".join(segments)
+    start = segments.index("organizations")
+    for index in range(start + 1, len(segments), 2):
+        if segments[index]:
+            segments[index] = TEMPLATE_NAMES.get(
+                segments[index - 1], "{id}")
+    return "/".join(segments)
+
+
+@contextmanager
+def retry_attempt(attempt):
+    """Marks the requests of a block as made by a retry attempt.
+
+    Args:
+        attempt (int): The attempt number, 0 for the first attempt.
+    """
+    previous = getattr(_local, "attempt", 0)
+    _local.attempt = attempt
+    try:
+        yield
+    finally:
+        _local.attempt = previous
+
+
+def body_size(body):
+    """Returns the size of a request body.
+
+    Args:
+        body: The prepared request body.
+
+    Returns:
+        int: Its size in bytes, 0 when unknown (e.g. streamed).
+    """
+    if isinstance(body, str):
+        return len(body.encode())
+    if isinstance(body, bytes):
+        return len(body)
+    return 0
+
+
+class HttpMetrics():
+    """Thread-safe HTTP request metrics by endpoint."""
+
+    def __init__(self):
+        """Initializes HttpMetrics."""
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def reset(self):
+        """Clears all metrics."""
+        with self.lock:
+            self.endpoints = {}
+
+    def _endpoint(self, key):
+        """Returns the metrics of an endpoint key, creating them."""
+        return self.endpoints.setdefault(key, {
+            "requests": 0,
+            "seconds": 0.0,
+            "buckets": [0] * (len(LATENCY_BUCKETS) + 1),
+            "bytes_in": 0,
+            "bytes_out": 0,
+            "retries": 0,
+            "statuses": {},
+        })
+
+    def observe(self, method, url, status, seconds,  # noqa pylint: disable=R0913,R0917
+                bytes_in=0, bytes_out=0):
+        """Records a request.
+
+        Args:
+            method (str): The HTTP method.
+            url (str): The request URL.
+            status: The status code, or "error" when no response
+                was received.
+            seconds (float): The request latency.
+            bytes_in (int): The response body size.
+            bytes_out (int): The request body size.
+        """
+        key = (method, urlsplit(url).netloc, endpoint_template(url))
+        with self.lock:
+            endpoint = self._endpoint(key)
+            endpoint["requests"] += 1
+            endpoint["seconds"] += seconds
+            endpoint["buckets"][
+                bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            endpoint["bytes_in"] += bytes_in
+            endpoint["bytes_out"] += bytes_out
+            endpoint["retries"] += int(getattr(_local, "attempt", 0) > 0)
+            status = str(status)
+            endpoint["statuses"][status] = (
+                endpoint["statuses"].get(status, 0) + 1)
+
+    def snapshot(self):
+        """Returns the metrics of each endpoint.
+
+        Returns:
+            list: One dict per endpoint, with its method, host and
+                  template.
+        """
+        with self.lock:
+            return [
+                {"method": method, "host": host, "endpoint": template,
+                 **endpoint, "buckets": list(endpoint["buckets"]),
+                 "statuses": dict(endpoint["statuses"])}
+                for (method, host, template), endpoint in sorted(
+                    self.endpoints.items())
+            ]
+
+    def merge(self, snapshot):
+        """Adds the metrics of another process.
+
+        Args:
+            snapshot (list): Metrics returned by `snapshot`.
+        """
+        with self.lock:
+            for other in snapshot:
+                endpoint = self._endpoint(
+                    (other["method"], other["host"], other["endpoint"]))
+                for field in ("requests", "seconds", "bytes_in",
+                              "bytes_out", "retries"):
+                    endpoint[field] += other[field]
+                endpoint["buckets"] = [
+                    count + other_count for count, other_count in
+                    zip(endpoint["buckets"], other["buckets"])]
+                for status, count in other["statuses"].items():
+                    endpoint["statuses"][status] = (
+                        endpoint["statuses"].get(status, 0) + count)
+
+    def to_json(self):
+        """Returns the metrics as JSON.
+
+        Returns:
+            str: The bucket bounds and the metrics of each endpoint.
+        """
+        return json.dumps({"latency_buckets": list(LATENCY_BUCKETS),
+                           "endpoints": self.snapshot()}, indent=2)
+
+    def to_prometheus(self):
+        """Returns the metrics in the Prometheus text format.
+
+        Returns:
+            str: The metrics, with method, host and endpoint labels.
+        """
+        name = PROMETHEUS_PREFIX
+        lines = [
+            f"# HELP {name}_requests_total HTTP requests by status code.",
+            f"# TYPE {name}_requests_total counter",
+        ]
+        endpoints = self.snapshot()
+        for endpoint in endpoints:
+            labels = prometheus_labels(endpoint)
+            for status, count in sorted(endpoint["statuses"].items()):
+                lines.append(
+                    f'{name}_requests_total{{{labels},status="{status}"}} {count}')  # noqa pylint: disable=C0301
+        lines += [
+            f"# HELP {name}_request_duration_seconds HTTP request latency.",
+            f"# TYPE {name}_request_duration_seconds histogram",
+        ]
+        for endpoint in endpoints:
+            labels = prometheus_labels(endpoint)
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS + ("+Inf",),
+                                    endpoint["buckets"]):
+                cumulative += count
+                lines.append(
+                    f'{name}_request_duration_seconds_bucket{{{labels},le="{bound}"}} {cumulative}')  # noqa pylint: disable=C0301
+            lines.append(
+                f"{name}_request_duration_seconds_sum{{{labels}}} {endpoint['seconds']:.6f}")  # noqa pylint: disable=C0301
+            lines.append(
+                f"{name}_request_duration_seconds_count{{{labels}}} {endpoint['requests']}")  # noqa pylint: disable=C0301
+        for field, help_text in (
+                ("bytes_in", "HTTP response body bytes received."),
+                ("bytes_out", "HTTP request body bytes sent."),
+                ("retries", "HTTP requests made by retry attempts.")):
+            metric = f"{name}_{field}_total"
+            lines += [f"# HELP {metric} {help_text}",
+                      f"# TYPE {metric} counter"]
+            lines += [
+                f"{metric}{{{prometheus_labels(endpoint)}}} {endpoint[field]}"
+                for endpoint in endpoints]
+        return "\n".join(lines) + "\n"
+
+    def write(self, file, output_format):
+        """Writes the metrics to a file.
+
+        The file is written to a temporary file first and renamed,
+        so that a Prometheus textfile collector never reads it
+        partially written.
+
+        Args:
+            file (str): The file path.
+            output_format (str): 'json' or 'prometheus'.
+        """
+        content = (self.to_prometheus() if output_format == "prometheus"
+                   else self.to_json())
+        logger.info(f"Writing HTTP metrics to File {file}")  # noqa pylint: disable=W1203
+        with open(f"{file}.tmp", "w", encoding="utf-8") as fl:
+            fl.write(content)
+        os.replace(f"{file}.tmp", file)
+
+
+def prometheus_labels(endpoint):
+    """Returns the Prometheus labels of an endpoint."""
+    labels = []
+    for label in ("method", "host", "endpoint"):
+        value = endpoint[label].replace("\\", "\\\\").replace('"', '\\"')
+        labels.append(f'{label}="{value}"')
+    return ",".join(labels)
+
+
+http_metrics = HttpMetrics()
+
+
+def write_http_metrics(backend_cfg, target_dir):
+    """Writes the HTTP metrics in the configured formats.
+
+    Args:
+        backend_cfg (configparser.ConfigParser): The backend
+                                                 configuration.
+        target_dir (str): The directory of relative file paths.
+    """
+    output_format = backend_cfg.get(
+        "metrics", "HTTP_METRICS_FORMAT", fallback="json").lower()
+    if output_format in ("json", "both"):
+        http_metrics.write(os.path.join(target_dir, backend_cfg.get(
+            "metrics", "HTTP_METRICS_JSON_FILE",
+            fallback="http_metrics.json")), "json")
+    if output_format in ("prometheus", "both"):
+        http_metrics.write(os.path.join(target_dir, backend_cfg.get(
+            "metrics", "HTTP_METRICS_PROMETHEUS_FILE",
+            fallback="http_metrics.prom")), "prometheus")
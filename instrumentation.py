@@ -0,0 +1,231 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Lightweight timing and counters for the assessment pipeline.
+
+This module keeps, per process, the number of calls, the time spent,
+the bytes processed and the errors of the pipeline stages and of the
+operations they repeat the most (REST calls, XML parsing, parallel
+tasks). Workers of `utils.run_parallel` send their counters, and
+their HTTP metrics, back with their results, so the summary of a run
+covers all processes.
+"""
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from base_logger import logger, set_log_stage
+from http_metrics import http_metrics, retry_attempt
+from profiler import add_worker_stats, profile_dir, profile_task, profiled
+
+STAGES = "stages"
+OPERATIONS = "operations"
+
+
+class Metrics():
+    """Thread-safe counters of named stages and operations.
+
+    Each name holds its number of calls, the seconds spent in them,
+    the bytes they processed and the number of calls that failed.
+    """
+
+    def __init__(self):
+        """Initializes Metrics."""
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Clears all counters and restarts the run clock."""
+        with self.lock:
+            self.started_at = time.time()
+            self.started = time.perf_counter()
+            self.data = {STAGES: {}, OPERATIONS: {}}
+
+    def record(self, name, seconds=0.0, nbytes=0, errors=0,  # noqa pylint: disable=R0913,R0917
+               category=OPERATIONS, count=1):
+        """Adds calls to the counters of a name.
+
+        Args:
+            name (str): The stage or operation name.
+            seconds (float): The time spent.
+            nbytes (int): The bytes processed.
+            errors (int): The number of failed calls.
+            category (str): STAGES or OPERATIONS.
+            count (int): The number of calls.
+        """
+        with self.lock:
+            counters = self.data[category].setdefault(
+                name, {"count": 0, "seconds": 0.0, "bytes": 0, "errors": 0})
+            counters["count"] += count
+            counters["seconds"] += seconds
+            counters["bytes"] += nbytes
+            counters["errors"] += errors
+
+    def snapshot(self):
+        """Returns a copy of the counters.
+
+        Returns:
+            dict: The counters of each name, by category.
+        """
+        with self.lock:
+            return {category: {name: dict(counters)
+                               for name, counters in names.items()}
+                    for category, names in self.data.items()}
+
+    def merge(self, snapshot):
+        """Adds the counters of another process.
+
+        Args:
+            snapshot (dict): Counters returned by `snapshot`.
+        """
+        for category, names in snapshot.items():
+            for name, counters in names.items():
+                self.record(name, counters["seconds"], counters["bytes"],
+                            counters["errors"], category, counters["count"])
+
+    def summary(self):
+        """Returns the timing summary of the run.
+
+        Returns:
+            dict: The run start time and duration, and the counters
+                  of each stage and operation, the slowest first.
+        """
+        snapshot = self.snapshot()
+        for names in snapshot.values():
+            for counters in names.values():
+                counters["seconds"] = round(counters["seconds"], 4)
+        return {
+            "started_at": datetime.fromtimestamp(
+                self.started_at, timezone.utc).isoformat(),
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            **{category: dict(sorted(
+                names.items(), key=lambda item: -item[1]["seconds"]))
+               for category, names in snapshot.items()},
+        }
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def timed(name, category=OPERATIONS):
+    """Records the time spent in a block.
+
+    The block can set the bytes it processed in the yielded dict.
+    A block that raises is counted as an error.
+
+    Args:
+        name (str): The stage or operation name.
+        category (str): STAGES or OPERATIONS.
+
+    Yields:
+        dict: The counters of the call, with a "bytes" key.
+    """
+    call = {"bytes": 0, "errors": 0}
+    started = time.perf_counter()
+    try:
+        yield call
+    except BaseException:
+        call["errors"] = 1
+        raise
+    finally:
+        metrics.record(name, time.perf_counter() - started,
+                       call["bytes"], call["errors"], category)
+
+
+def stage(name):
+    """Decorates a pipeline stage to record and log its duration,
+    to tag its log records with its name, and to profile it when
+    profiling is enabled.
+
+    Args:
+        name (str): The stage name.
+
+    Returns:
+        The decorator.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            previous = set_log_stage(name)
+            try:
+                with timed(name, STAGES), profiled(name):
+                    result = func(*args, **kwargs)
+            finally:
+                set_log_stage(previous)
+            logger.info(f"Stage {name} completed in {time.perf_counter() - started:.2f}s")  # noqa pylint: disable=C0301,W1203
+            return result
+        return wrapper
+    return decorator
+
+
+def call_with_metrics(func, arg, attempt=0):
+    """Runs a task in a worker process and returns its counters.
+
+    Args:
+        func: The task function.
+        arg: The task argument.
+        attempt (int): The attempt number of the task, 0 for the
+            first attempt.
+
+    Returns:
+        tuple: The task result and the counters, HTTP metrics and
+               profile data of the worker during the task, including
+               the task itself.
+    """
+    metrics.reset()
+    http_metrics.reset()
+    profile = None
+    with timed(f"task.{getattr(func, '__name__', 'task')}"), \
+            retry_attempt(attempt):
+        if profile_dir():
+            result, profile = profile_task(func, arg)
+        else:
+            result = func(arg)
+    return result, {"metrics": metrics.snapshot(),
+                    "http": http_metrics.snapshot(),
+                    "profile": profile}
+
+
+def merge_worker_metrics(worker_metrics):
+    """Adds the counters returned by `call_with_metrics`.
+
+    Args:
+        worker_metrics (dict): The counters, HTTP metrics and profile
+            data of a worker process.
+    """
+    metrics.merge(worker_metrics["metrics"])
+    http_metrics.merge(worker_metrics["http"])
+    if worker_metrics.get("profile"):
+        add_worker_stats(worker_metrics["profile"])
+
+
+def log_summary(summary):
+    """Logs the stages and the slowest operations of a summary.
+
+    Args:
+        summary (dict): A summary returned by `Metrics.summary`.
+    """
+    logger.info(f"Run completed in {summary['wall_seconds']:.2f}s")  # noqa pylint: disable=W1203
+    for category in (STAGES, OPERATIONS):
+        for name, counters in list(summary[category].items())[:10]:
+            logger.info(  # noqa pylint: disable=W1203
+                f"{name}: {counters['count']} calls, "
+                f"{counters['seconds']:.2f}s, {counters['bytes']} bytes, "
+                f"{counters['errors']} errors")
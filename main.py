@@ -20,10 +20,16 @@ This module orchestrates the assessment process:
 1. Parses input configurations.
 2. Performs pre-validation checks.
 3. Exports Apigee artifacts.
-4. Validates the exported artifacts against Apigee X requirements.
-5. Visualizes the assessment results.
-6. Retrieves Apigee topology information (for on-prem).
-7. Generates a qualification report.
+4. Maps the proxy dependencies and shards the proxies across
+   environments.
+5. Validates the exported artifacts against Apigee X requirements.
+6. Visualizes the assessment results.
+7. Retrieves Apigee topology information (for on-prem).
+8. Generates a qualification report.
+
+The steps after the pre-validation checks run as a `pipeline.Pipeline`,
+which reuses the outputs of the previous run for the stages whose
+inputs did not change.
 """
 
 import argparse
@@ -33,22 +39,143 @@ from base_logger import logger
 from core_wrappers import (
     export_artifacts,
     get_topology,
+    map_proxy_dependencies,
     pre_validation_checks,
     qualification_report,
+    shard_environments,
     validate_artifacts,
     visualize_artifacts,
 )
-from utils import parse_config, parse_json, write_json
+from http_metrics import write_http_metrics
+from instrumentation import log_summary, metrics
+from pipeline import Pipeline, Stage
+from profiler import enable_profiling, profile_dir
+from utils import parse_config, write_json
+
+
+def config_section(config, section):
+    """Returns the settings of a configuration section.
+
+    Args:
+        config (configparser.ConfigParser): The configuration.
+        section (str): The section name.
+
+    Returns:
+        dict: Its settings, empty when it does not exist.
+    """
+    if not config.has_section(section):
+        return {}
+    return dict(config.items(section))
+
+
+def assessment_stages(cfg, backend_cfg, args, resources_list):  # noqa pylint: disable=R0914
+    """Returns the stages of the assessment.
+
+    Args:
+        cfg (configparser.ConfigParser): The parsed configuration from
+                                        input.properties.
+        backend_cfg (configparser.ConfigParser): The parsed backend
+                                                configuration.
+        args (argparse.Namespace): The command-line arguments.
+        resources_list (list): The resource types to assess.
+
+    Returns:
+        list: The `pipeline.Stage` of each step, each after the steps
+              it takes outputs of.
+    """
+    target_dir = cfg.get("inputs", "TARGET_DIR")
+    export_dir = f"{target_dir}/{backend_cfg.get('export', 'EXPORT_DIR')}"
+    source_apigee_version = cfg.get("inputs", "SOURCE_APIGEE_VERSION").upper()
+    source = [cfg.get("inputs", "SOURCE_URL"),
+              cfg.get("inputs", "SOURCE_ORG"), source_apigee_version]
+    limits = config_section(backend_cfg, "inputs")
+    sharded = not os.environ.get("IGNORE_ENV_SHARD") == "true"
+    opdk_topology = (source_apigee_version == "OPDK" and
+                     not os.environ.get("IGNORE_OPDK_TOPOLOGY") == "true")
+
+    def run_validation(export, dependency_map):
+        return validate_artifacts(
+            cfg, resources_list,
+            {**export, "proxy_dependency_map": dependency_map},
+            args.skip_target_validation, args.force_revalidation
+        )
+
+    def run_report(export, dependency_map, validate, sharding=None,  # noqa pylint: disable=R0913,R0917
+                   topology=None):
+        export_data = {**export, "proxy_dependency_map": dependency_map,
+                       "validation_report": validate}
+        if sharding is not None:
+            export_data["sharding_output"] = sharding
+        qualification_report(cfg, backend_cfg, export_data, topology or {})
 
+    stages = [
+        Stage("export", lambda: export_artifacts(cfg, resources_list),
+              params={"source": source, "resources": sorted(resources_list),
+                      "ignore_export": os.environ.get("IGNORE_EXPORT")}),
+        Stage("dependency_map",
+              lambda export: map_proxy_dependencies(cfg, export),
+              inputs=["export"],
+              params={"unifier": config_section(backend_cfg, "unifier"),
+                      "limits": limits},
+              files=[f"{export_dir}/apis"]),
+        Stage("validate", run_validation, inputs=["export", "dependency_map"],
+              params={
+                  "resources": sorted(resources_list),
+                  "skip_target_validation": args.skip_target_validation,
+                  "target": [cfg.get("inputs", key, fallback=None) for key
+                             in ("TARGET_URL", "GCP_PROJECT_ID",
+                                 "TARGET_COMPARE")],
+                  "validate": config_section(backend_cfg, "validate"),
+                  "limits": limits},
+              files=[f"{export_dir}/apis", f"{export_dir}/sharedflows"]),
+    ]
+    report_inputs = ["export", "dependency_map", "validate"]
+    if sharded:
+        stages.append(Stage(
+            "sharding",
+            lambda export, dependency_map: shard_environments(
+                dependency_map, export),
+            inputs=["export", "dependency_map"], params={"limits": limits}))
+        report_inputs.append("sharding")
+    if not os.environ.get("IGNORE_VIZ") == "true":
+        stages.append(Stage(
+            "visualize",
+            lambda export, validate: visualize_artifacts(
+                cfg, export, validate),
+            inputs=["export", "validate"],
+            params={"source": source,
+                    "visualize": config_section(backend_cfg, "visualize")},
+            outputs=[f"{target_dir}/" + backend_cfg.get(
+                "visualize", "VISUALIZATION_GRAPH_FILE",
+                fallback="visualization.html")]))
+    if opdk_topology:
+        stages.append(Stage(
+            "topology", lambda: get_topology(cfg),
+            params={"source": source,
+                    "topology": config_section(backend_cfg, "topology")}))
+        report_inputs.append("topology")
+    report_format = backend_cfg.get("report", "REPORT_FORMAT",
+                                    fallback="xlsx")
+    stages.append(Stage(
+        "qualification_report", run_report, inputs=report_inputs,
+        params={"source": source, "limits": limits,
+                "report": config_section(backend_cfg, "report")},
+        outputs=[] if report_format == "csv" else [
+            f"{target_dir}/" + backend_cfg.get(
+                "report", "QUALIFICATION_REPORT",
+                fallback="qualification_report.xlsx")]))
+    return stages
 
-def main():
+
+def main():  # noqa pylint: disable=R0914,R0915
     """Main function to execute the assessment workflow.
 
     Parses command-line arguments for resource selection,
     then executes the steps of the Apigee migration assessment:
-    export, validation, visualization, topology retrieval (on-prem),
-    and qualification report generation.  Handles caching of results
-    between steps to avoid redundant operations.
+    export, dependency mapping, sharding, validation, visualization,
+    topology retrieval (on-prem), and qualification report generation.
+    Steps whose inputs did not change since the previous run reuse
+    their cached outputs.
     """
     # Parse Input
     parser = argparse.ArgumentParser(
@@ -98,6 +225,39 @@ def main():
             "against the target environment."
         ),
     )
+    parser.add_argument(
+        "--force-revalidation",
+        action="store_true",
+        default=False,
+        dest="force_revalidation",
+        help=(
+            "Validate every API and SharedFlow bundle against the "
+            "target environment, ignoring cached validation results."
+        ),
+    )
+
+    parser.add_argument(
+        "--rerun",
+        type=str,
+        dest="rerun",
+        help=(
+            "Comma separated list of stages to run again even if their "
+            "inputs did not change, or 'all'. Stages are export, "
+            "dependency_map, sharding, validate, visualize, topology "
+            "and qualification_report."
+        ),
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        default=False,
+        dest="profile",
+        help=(
+            "Profile each stage, including its worker processes, and "
+            "write the profiles to the PROFILE_DIR of the target "
+            "directory."
+        ),
+    )
 
     args = parser.parse_args()
     resources_list = (
@@ -122,53 +282,40 @@ def main():
         logger.error("Pre validation checks failed. Please, check...")
         return
 
-    topology_mapping = {}
+    if resources_list == []:
+        logger.error(
+            """Please specify --resources argument.
+            Use -h with the script for help"""
+        )
+        return
+
+    metrics.reset()
     target_dir = cfg.get("inputs", "TARGET_DIR")
+    if args.profile:
+        enable_profiling(f"{target_dir}/{backend_cfg.get('metrics', 'PROFILE_DIR', fallback='profiles')}")  # noqa pylint: disable=C0301
     export_dir = backend_cfg.get("export", "EXPORT_DIR")
-    export_file = backend_cfg.get("export", "EXPORT_FILE")
-    export_data_file = f"{target_dir}/{export_dir}/{export_file}"
-    export_data = parse_json(export_data_file)
-
-    report_data_file = f"{target_dir}/{export_dir}/report.json"
-    report = parse_json(report_data_file)
-
-    if not export_data.get("export", False):
-        export_data["export"] = False
-        topology_mapping = {}
-
-        # Export Artifacts from Apigee OPDK/Edge (4G)
-        if resources_list == []:
-            logger.error(
-                """Please specify --resources argument.
-                Use -h with the script for help"""
-            )
-            return
-
-        export_data = export_artifacts(cfg, resources_list)
-        export_data["export"] = True
-        write_json(export_data_file, export_data)
-
-    if not report.get("report", False) or not export_data.get(
-        "validation_report", False
-    ):
-        report = validate_artifacts(
-            cfg, resources_list, export_data, args.skip_target_validation
-        )
-        report["report"] = True
-        export_data["validation_report"] = report
-        write_json(export_data_file, export_data)
-        write_json(report_data_file, report)
-    # Visualize artifacts
-    if not os.environ.get("IGNORE_VIZ") == "true":
-        visualize_artifacts(cfg, export_data, report)
+    cache_dir = backend_cfg.get("pipeline", "CACHE_DIR", fallback="pipeline")
+    rerun = [r.strip() for r in args.rerun.split(",")] if args.rerun else []
+    if args.force_revalidation:
+        rerun.append("validate")
 
-    # get Apigee OPDK/Edge (4G) topology mapping
-    if not os.environ.get("IGNORE_OPDK_TOPOLOGY") == "true":
-        if source_apigee_version == "OPDK":
-            topology_mapping = get_topology(cfg)
+    # Stages run one at a time when profiling, so that each profile
+    # only holds the work of its stage.
+    pipeline = Pipeline(
+        assessment_stages(cfg, backend_cfg, args, resources_list),
+        f"{target_dir}/{export_dir}/{cache_dir}",
+        workers=1 if profile_dir() else backend_cfg.getint(
+            "pipeline", "STAGE_WORKERS", fallback=2),
+    )
+    pipeline.run(rerun)
 
-    # Qualification report
-    qualification_report(cfg, backend_cfg, export_data, topology_mapping)
+    # Timing summary and HTTP metrics
+    summary = metrics.summary()
+    log_summary(summary)
+    timing_file = backend_cfg.get("metrics", "TIMING_SUMMARY_FILE",
+                                  fallback="timing_summary.json")
+    write_json(f"{target_dir}/{timing_file}", summary)
+    write_http_metrics(backend_cfg, target_dir)
 
 
 if __name__ == "__main__":
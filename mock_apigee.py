@@ -0,0 +1,675 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Local mock of the Apigee Management API.
+
+This module serves a synthetic organization over HTTP, so that the
+export, validation and topology steps can be run end to end without
+a live Apigee organization, e.g. to benchmark the tool offline.
+
+The organization is generated from a seed, with a configurable number
+of proxies, revisions, sharedflows, developers, apps, API products,
+KVMs, keystores and environments. Lists are paginated the way the
+Apigee Edge (`count` and `startKey`) and Apigee X (`pageSize` and
+`pageToken`) APIs are, and the proxy bundles generated by `corpus.py`
+can be downloaded. Latency and errors can be injected, and the
+requests served are counted.
+
+Usage:
+    python mock_apigee.py --port 8080 --proxies 1000
+
+then point SOURCE_URL in input.properties to
+http://localhost:8080/v1, with any SOURCE_AUTH_TOKEN.
+"""
+
+import argparse
+import bisect
+import collections
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, unquote, urlparse
+from base_logger import logger
+from corpus import ProxyCorpus
+
+API_PREFIX = "/v1"
+STATS_PATH = "/_mock/stats"
+PODS = ["gateway", "central", "analytics"]
+
+
+class SyntheticOrg():  # noqa pylint: disable=R0902,R0903
+    """A synthetic Apigee organization generated from a seed.
+
+    The same arguments always generate the same organization, so that
+    benchmark runs are comparable.
+    """
+
+    def __init__(self, name="mock-org", proxies=10, revisions=2,  # noqa pylint: disable=R0913,R0914,R0917
+                 sharedflows=2, environments=2, developers=10, apps=20,
+                 apiproducts=5, kvms=2, keystores=1, targetservers=2,
+                 seed=0):
+        """Initializes SyntheticOrg.
+
+        Args:
+            name (str): The organization name.
+            proxies (int): Number of API proxies.
+            revisions (int): Number of revisions of each proxy and
+                             sharedflow.
+            sharedflows (int): Number of sharedflows.
+            environments (int): Number of environments.
+            developers (int): Number of developers.
+            apps (int): Number of developer apps.
+            apiproducts (int): Number of API products.
+            kvms (int): Number of KVMs, per environment and in the org.
+            keystores (int): Number of keystores per environment.
+            targetservers (int): Number of target servers per
+                                 environment.
+            seed (int): Seed of the generated data.
+        """
+        rng = random.Random(seed)
+        self.name = name
+        self.revisions = [str(rev) for rev in range(1, revisions + 1)]
+        self.environments = [f"env-{i}" for i in range(environments)]
+        self.apis = {
+            "apis": [f"proxy-{i:05d}" for i in range(proxies)],
+            "sharedflows": [f"sharedflow-{i:03d}" for i in range(sharedflows)],
+        }
+        self.deployments = {}
+        for api_type, names in self.apis.items():
+            for api in names:
+                self.deployments[(api_type, api)] = sorted(rng.sample(
+                    self.environments, rng.randint(1, environments)))
+
+        self.targetservers = [f"target-{i}" for i in range(targetservers)]
+        self.kvms = [f"kvm-{i}" for i in range(kvms)]
+        self.keystores = [f"keystore-{i}" for i in range(keystores)]
+        self.apiproducts = {}
+        for i in range(apiproducts):
+            product = f"product-{i:04d}"
+            self.apiproducts[product] = {
+                "name": product,
+                "displayName": product,
+                "approvalType": "auto",
+                "environments": self.environments,
+                "proxies": sorted(rng.sample(
+                    self.apis["apis"], min(3, proxies))),
+                "scopes": [],
+                "attributes": [{"name": "access", "value": "public"}],
+            }
+        self.developers = {}
+        for i in range(developers):
+            email = f"developer-{i:05d}@example.com"
+            developer_id = self._uuid(rng)
+            self.developers[email] = {
+                "email": email,
+                "developerId": developer_id,
+                "firstName": "Developer",
+                "lastName": str(i),
+                "userName": f"developer-{i:05d}",
+                "status": "active",
+                "apps": [],
+                "attributes": [],
+            }
+        self.apps = {}
+        emails = list(self.developers)
+        for i in range(apps if developers else 0):
+            app_id = self._uuid(rng)
+            email = emails[i % developers]
+            self.developers[email]["apps"].append(f"app-{i:05d}")
+            self.apps[app_id] = {
+                "appId": app_id,
+                "name": f"app-{i:05d}",
+                "developerId": self.developers[email]["developerId"],
+                "status": "approved",
+                "callbackUrl": "",
+                "attributes": [],
+                "credentials": [{
+                    "consumerKey": self._uuid(rng).replace("-", ""),
+                    "status": "approved",
+                    "apiProducts": [
+                        {"apiproduct": product, "status": "approved"}
+                        for product in rng.sample(
+                            list(self.apiproducts),
+                            min(2, len(self.apiproducts)))],
+                }],
+            }
+        self.corpus = ProxyCorpus(
+            seed, self.apis["sharedflows"], self.targetservers, self.kvms,
+            self.keystores)
+        self.sorted_keys = {
+            "apps": sorted(self.apps),
+            "developers": sorted(self.developers),
+            "apiproducts": sorted(self.apiproducts),
+        }
+
+    @staticmethod
+    def _uuid(rng):
+        """Generates a UUID from the random generator."""
+        value = f"{rng.getrandbits(128):032x}"
+        return (f"{value[:8]}-{value[8:12]}-{value[12:16]}-"
+                f"{value[16:20]}-{value[20:]}")
+
+    def bundle(self, api_type, name, revision):
+        """Generates the bundle of a proxy or sharedflow revision.
+
+        Bundles are generated on demand by the corpus rather than
+        kept in memory.
+
+        Args:
+            api_type (str): 'apis' or 'sharedflows'.
+            name (str): The proxy or sharedflow name.
+            revision (str): The revision.
+
+        Returns:
+            bytes: The zipped bundle.
+        """
+        return self.corpus.bundle(api_type, name, revision)
+
+
+class MockApigeeServer(ThreadingHTTPServer):  # noqa pylint: disable=R0902
+    """Serves a SyntheticOrg as the Apigee Management API.
+
+    The server answers the Apigee Edge API by default, and the Apigee X
+    API when `flavor` is 'x'. Every request waits `latency` seconds
+    plus up to `jitter` seconds, and fails with a 503 error with
+    probability `error_rate`.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, org, port=0, flavor="edge", latency=0.0,  # noqa pylint: disable=R0913,R0917
+                 jitter=0.0, error_rate=0.0, seed=0):
+        """Initializes MockApigeeServer.
+
+        Args:
+            org (SyntheticOrg): The organization served.
+            port (int): The port to listen on, 0 for any free port.
+            flavor (str): 'edge' or 'x'.
+            latency (float): Seconds added to every response.
+            jitter (float): Maximum random seconds added on top of
+                            the latency.
+            error_rate (float): Fraction of requests failing with 503.
+            seed (int): Seed of the injected jitter and errors.
+        """
+        super().__init__(("127.0.0.1", port), MockApigeeHandler)
+        self.org = org
+        self.flavor = flavor
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.request_counts = collections.Counter()
+        self.errors = 0
+        self.thread = None
+
+    @property
+    def url(self):
+        """The base URL to use as SOURCE_URL or TARGET_URL."""
+        return f"http://127.0.0.1:{self.server_address[1]}{API_PREFIX}"
+
+    def start(self):
+        """Serves requests in a background thread.
+
+        Returns:
+            str: The base URL of the API.
+        """
+        self.thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f"Mock Apigee API serving {self.org.name} at {self.url}")  # noqa pylint: disable=W1203
+        return self.url
+
+    def stop(self):
+        """Stops serving requests and closes the socket."""
+        self.shutdown()
+        self.server_close()
+        if self.thread:
+            self.thread.join()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def stats(self):
+        """Returns the number of requests served.
+
+        Returns:
+            dict: The total number of requests and injected errors,
+                  and the number of requests per route.
+        """
+        with self.lock:
+            return {
+                "requests": sum(self.request_counts.values()),
+                "errors": self.errors,
+                "routes": dict(self.request_counts),
+            }
+
+    def inject(self, route):
+        """Counts a request, applies latency and decides on failure.
+
+        Args:
+            route (str): The route template of the request.
+
+        Returns:
+            bool: True if the request must fail.
+        """
+        with self.lock:
+            self.request_counts[route] += 1
+            delay = self.latency + self.rng.uniform(0, self.jitter)
+            fail = self.rng.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if delay:
+            time.sleep(delay)
+        return fail
+
+
+class MockApigeeHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a MockApigeeServer."""
+
+    server: MockApigeeServer
+
+    def log_message(self, format, *args):  # noqa pylint: disable=W0622
+        logger.debug(f"Mock Apigee API: {format % args}")  # noqa pylint: disable=W1203
+
+    def do_GET(self):  # noqa pylint: disable=C0103
+        """Serves a GET request."""
+        self._serve("GET")
+
+    def do_POST(self):  # noqa pylint: disable=C0103
+        """Serves a POST request."""
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self._serve("POST")
+
+    def _serve(self, method):
+        """Routes a request and writes the response."""
+        parsed = urlparse(self.path)
+        if parsed.path == STATS_PATH:
+            self._send(200, self.server.stats())
+            return
+        params = {key: values[-1]
+                  for key, values in parse_qs(parsed.query).items()}
+        parts = [unquote(part) for part in
+                 parsed.path[len(API_PREFIX):].strip("/").split("/")]
+        route = MockApigeeRouter(self.server.org, self.server.flavor)
+        template, handler = route.resolve(method, parts)
+        if self.server.inject(f"{method} {template}"):
+            self._error(503, "Service unavailable (injected error)")
+            return
+        if not self.headers.get("Authorization"):
+            self._error(401, "Unauthorized")
+            return
+        if handler is None:
+            self._error(404, f"Unknown resource {parsed.path}")
+            return
+        response = handler(params)
+        if response is None:
+            self._error(404, f"Resource {parsed.path} not found")
+        elif isinstance(response, bytes):
+            self._send(200, response, "application/octet-stream")
+        else:
+            self._send(200, response)
+
+    def _error(self, status, message):
+        """Writes an error in the format of the API flavor."""
+        if self.server.flavor == "x":
+            body = {"error": {"code": status, "message": message,
+                              "status": "UNAVAILABLE" if status == 503
+                              else "NOT_FOUND"}}
+        else:
+            body = {"code": f"mock.http.{status}", "message": message,
+                    "contexts": []}
+        self._send(status, body)
+
+    def _send(self, status, body, content_type="application/json"):
+        """Writes a response."""
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class MockApigeeRouter():
+    """Maps API paths to the data of a SyntheticOrg."""
+
+    def __init__(self, org, flavor):
+        """Initializes MockApigeeRouter.
+
+        Args:
+            org (SyntheticOrg): The organization served.
+            flavor (str): 'edge' or 'x'.
+        """
+        self.org = org
+        self.flavor = flavor
+
+    def resolve(self, method, parts):  # noqa pylint: disable=R0911,R0912
+        """Finds the handler of a request path.
+
+        Args:
+            method (str): The HTTP method.
+            parts (list): The path segments after the API prefix.
+
+        Returns:
+            tuple: The route template, used to count requests, and a
+                   function of the query parameters returning the
+                   response, or None if the route is unknown.
+        """
+        if parts[:1] == ["servers"]:
+            return "/servers", self.servers
+        if len(parts) < 2 or parts[0] != "organizations" \
+                or parts[1] != self.org.name:
+            return "/" + "/".join(parts), None
+        rest = parts[2:]
+        template = "/organizations/{org}"
+        if not rest:
+            return template, lambda params: {"name": self.org.name}
+        kind = rest[0]
+        template += f"/{kind}"
+        if kind == "environments":
+            if len(rest) == 1:
+                return template, lambda params: self.org.environments
+            if rest[1] not in self.org.environments:
+                return template + "/{env}", None
+            return self._resolve_env(template + "/{env}", rest[1], rest[2:])
+        if kind in ("apis", "sharedflows"):
+            if method == "POST":
+                return template, lambda params: self.validate(kind, params)
+            return self._resolve_api(template, kind, rest[1:])
+        if len(rest) == 1:
+            return template, lambda params: self.list_org_objects(
+                kind, params)
+        template += "/{name}"
+        if kind == "resourcefiles" and len(rest) == 3:
+            return template, lambda params: f"// {rest[2]}".encode()
+        if kind == "keyvaluemaps":
+            return template, lambda params: self.kvm(rest[1], rest[2:])
+        if kind == "envgroups":
+            return template, lambda params: self.envgroup(rest[1])
+        return template, lambda params: self.get_org_object(kind, rest[1])
+
+    def _resolve_api(self, template, api_type, rest):
+        """Resolves the routes of a proxy or sharedflow."""
+        if not rest:
+            return template, lambda params: self.list_apis(api_type, params)
+        name = rest[0]
+        template += "/{name}"
+        if (api_type, name) not in self.org.deployments:
+            return template, None
+        if rest[1:] == ["revisions"]:
+            return template + "/revisions", lambda params: self.org.revisions
+        if rest[1:] == ["deployments"]:
+            return template + "/deployments", lambda params: \
+                self.api_deployments(api_type, name)
+        if len(rest) == 3 and rest[1] == "revisions" \
+                and rest[2] in self.org.revisions:
+            template += "/revisions/{rev}"
+            return template, lambda params: (
+                self.org.bundle(api_type, name, rest[2])
+                if params.get("format") == "bundle"
+                else {"name": name, "revision": rest[2]})
+        return template, None
+
+    def _resolve_env(self, template, env, rest):  # noqa pylint: disable=R0911
+        """Resolves the routes of an environment."""
+        if not rest:
+            return template, lambda params: {"name": env}
+        kind = rest[0]
+        template += f"/{kind}"
+        if kind == "deployments":
+            return template, lambda params: self.env_deployments(env)
+        if len(rest) == 1:
+            return template, lambda params: self.list_env_objects(kind)
+        name = rest[1]
+        template += "/{name}"
+        if kind == "keystores" and len(rest) > 2:
+            template += "/aliases/{alias}"
+            if rest[-1] == "certificate":
+                return template + "/certificate", lambda params: \
+                    f"-----BEGIN CERTIFICATE-----\n{name}\n".encode()
+            return template, lambda params: {
+                "alias": rest[3], "keystore": name,
+                "certsInfo": {"certInfo": [{"subject": f"CN={rest[3]}"}]}}
+        if kind == "resourcefiles" and len(rest) == 3:
+            return template, lambda params: f"// {rest[2]}".encode()
+        return template, lambda params: self.get_env_object(env, kind, name)
+
+    @staticmethod
+    def page(keys, params, limit_key, next_key):
+        """Returns a page of sorted keys.
+
+        Like Apigee, a page starts with the start key itself.
+
+        Args:
+            keys (list): The sorted keys.
+            params (dict): The query parameters.
+            limit_key (str): The page size parameter.
+            next_key (str): The start key parameter.
+
+        Returns:
+            list: The keys of the page.
+        """
+        start = 0
+        if params.get(next_key):
+            start = bisect.bisect_left(keys, params[next_key])
+        if limit_key in params:
+            return keys[start:start + int(params[limit_key])]
+        return keys[start:]
+
+    def list_org_objects(self, kind, params):  # noqa pylint: disable=R0911
+        """Lists the organization objects of a type."""
+        expand = params.get("expand") == "true"
+        if kind in self.org.sorted_keys:
+            objects = getattr(self.org, kind)
+            if "pageSize" in params:
+                keys = self.page(self.org.sorted_keys[kind], params,
+                                 "pageSize", "pageToken")
+            else:
+                keys = self.page(self.org.sorted_keys[kind], params,
+                                 "count", "startKey")
+            expand_key = {"apps": "app", "developers": "developer",
+                          "apiproducts": "apiProduct"}[kind]
+            if expand:
+                return {expand_key: [objects[key] for key in keys]}
+            if self.flavor == "x":
+                id_key = {"apps": "appId", "developers": "email",
+                          "apiproducts": "name"}[kind]
+                response = {expand_key: [{id_key: key} for key in keys]}
+                if kind == "apps" and keys:
+                    response["nextPageToken"] = keys[-1]
+                return response
+            return keys
+        if kind == "keyvaluemaps":
+            return self.org.kvms
+        if kind == "resourcefiles":
+            return {"resourceFile": [{"name": "org-file.js", "type": "jsc"}]}
+        if kind == "companies":
+            return []
+        if kind == "envgroups":
+            return {"environmentGroups": [
+                self.envgroup(env) for env in self.org.environments]}
+        return None
+
+    def get_org_object(self, kind, name):
+        """Returns an organization object."""
+        if kind in self.org.sorted_keys:
+            return getattr(self.org, kind).get(name)
+        return None
+
+    def kvm(self, name, rest):
+        """Returns a KVM, or its entries for Apigee X."""
+        if name not in self.org.kvms:
+            return None
+        entries = [{"name": f"key-{i}", "value": f"value-{i}"}
+                   for i in range(3)]
+        if rest == ["entries"]:
+            return {"keyValueEntries": entries}
+        return {"name": name, "encrypted": False, "entry": entries}
+
+    def envgroup(self, env):
+        """Returns the environment group of an environment."""
+        return {"name": f"{env}-group", "hostnames": [f"{env}.example.com"]}
+
+    def list_apis(self, api_type, params):
+        """Lists proxies or sharedflows."""
+        names = self.page(self.org.apis[api_type], params,
+                          "count", "startKey")
+        if self.flavor == "x":
+            key = "proxies" if api_type == "apis" else "sharedFlows"
+            return {key: [{"name": name} for name in names]}
+        return names
+
+    def api_deployments(self, api_type, name):
+        """Returns the deployments of a proxy or sharedflow."""
+        envs = self.org.deployments[(api_type, name)]
+        revision = self.org.revisions[-1]
+        if self.flavor == "x":
+            return {"deployments": [
+                {"environment": env, "apiProxy": name, "revision": revision}
+                for env in envs]}
+        return {"name": name, "environment": [
+            {"name": env, "revision": [{"name": revision}]}
+            for env in envs]}
+
+    def env_deployments(self, env):
+        """Returns the proxies deployed to an environment."""
+        names = [api for (api_type, api), envs in self.org.deployments.items()
+                 if api_type == "apis" and env in envs]
+        if self.flavor == "x":
+            return {"deployments": [
+                {"apiProxy": name, "revision": self.org.revisions[-1]}
+                for name in names]}
+        return {"name": env, "aPIProxy": [{"name": name} for name in names]}
+
+    def list_env_objects(self, kind):
+        """Lists the environment objects of a type."""
+        objects = {
+            "targetservers": self.org.targetservers,
+            "keyvaluemaps": self.org.kvms,
+            "keystores": self.org.keystores,
+            "references": [f"{keystore}-ref"
+                           for keystore in self.org.keystores],
+            "caches": ["cache-0"],
+            "flowhooks": ["PreProxyFlowHook", "PostProxyFlowHook",
+                          "PreTargetFlowHook", "PostTargetFlowHook"],
+            "virtualhosts": ["default", "secure"],
+            "resourcefiles": {"resourceFile": [
+                {"name": "env-file.js", "type": "jsc"}]},
+        }
+        return objects.get(kind)
+
+    def get_env_object(self, env, kind, name):  # noqa pylint: disable=R0911
+        """Returns an environment object."""
+        if kind == "targetservers" and name in self.org.targetservers:
+            return {"name": name, "host": f"{name}.{env}.example.com",
+                    "port": 443, "isEnabled": True,
+                    "sSLInfo": {"enabled": "true"}}
+        if kind == "keyvaluemaps":
+            return self.kvm(name, [])
+        if kind == "keystores" and name in self.org.keystores:
+            aliases = [f"alias-{i}" for i in range(2)]
+            if self.flavor != "x":
+                aliases = [{"aliasName": alias} for alias in aliases]
+            return {"name": name, "aliases": aliases, "certs": []}
+        if kind == "references":
+            return {"name": name, "refers": name[:-len("-ref")],
+                    "resourceType": "KeyStore"}
+        if kind == "caches":
+            return {"name": name, "expirySettings": {
+                "timeoutInSec": {"value": "300"}}}
+        if kind == "flowhooks":
+            return {"name": name, "continueOnError": True}
+        if kind == "virtualhosts":
+            return {"name": name, "hostAliases": [f"{env}.example.com"],
+                    "port": "443" if name == "secure" else "80"}
+        return None
+
+    def validate(self, api_type, params):
+        """Answers the validation of a bundle by Apigee X."""
+        return {"name": params.get("name"), "revision": "1",
+                "type": api_type, "action": params.get("action")}
+
+    @staticmethod
+    def servers(params):
+        """Returns the components of an OPDK pod."""
+        pod = params.get("pod", "")
+        return [{
+            "externalHostName": f"{pod}-{i}.example.com",
+            "externalIP": f"10.0.{PODS.index(pod) if pod in PODS else 9}.{i}",
+            "internalHostName": f"{pod}-{i}.internal",
+            "internalIP": f"192.168.0.{i}",
+            "isUp": True,
+            "pod": pod,
+            "reachable": True,
+            "region": "dc-1",
+            "type": [f"{pod}-component"],
+        } for i in range(2)]
+
+
+def main():
+    """Runs the mock Apigee Management API until interrupted."""
+    parser = argparse.ArgumentParser(
+        description="Serves a synthetic Apigee organization locally.")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--flavor", choices=["edge", "x"], default="edge")
+    parser.add_argument("--org", default="mock-org")
+    parser.add_argument("--proxies", type=int, default=10)
+    parser.add_argument("--revisions", type=int, default=2)
+    parser.add_argument("--sharedflows", type=int, default=2)
+    parser.add_argument("--environments", type=int, default=2)
+    parser.add_argument("--developers", type=int, default=10)
+    parser.add_argument("--apps", type=int, default=20)
+    parser.add_argument("--apiproducts", type=int, default=5)
+    parser.add_argument("--kvms", type=int, default=2)
+    parser.add_argument("--keystores", type=int, default=1)
+    parser.add_argument("--targetservers", type=int, default=2)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", type=float, default=0.0,
+                        help="Seconds added to every response.")
+    parser.add_argument("--jitter", type=float, default=0.0,
+                        help="Maximum random seconds added to the latency.")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        dest="error_rate",
+                        help="Fraction of requests failing with 503.")
+    args = parser.parse_args()
+
+    org = SyntheticOrg(
+        args.org, args.proxies, args.revisions, args.sharedflows,
+        args.environments, args.developers, args.apps, args.apiproducts,
+        args.kvms, args.keystores, args.targetservers, args.seed)
+    server = MockApigeeServer(
+        org, args.port, args.flavor, args.latency, args.jitter,
+        args.error_rate, args.seed)
+    print(f"Serving {args.org} at {server.url}, "
+          f"request counts at http://127.0.0.1:{args.port}{STATS_PATH}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
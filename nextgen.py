@@ -21,8 +21,6 @@ It offers methods for creating and validating API proxies and sharedflows.
 """
 
 from requests.utils import quote as urlencode  # pylint: disable=E0401
-from google.cloud import resourcemanager_v3  # pylint: disable=E0401
-from google.oauth2.credentials import Credentials  # pylint: disable=E0401
 from utils import parse_json
 from rest import RestClient
 
@@ -70,6 +68,10 @@ class ApigeeNewGen():   # noqa pylint: disable=R0902
         Returns:
             array: A array of missing permissions.
         """
+        # The resource manager client is slow to import, and only
+        # needed here.
+        from google.cloud import resourcemanager_v3  # noqa pylint: disable=C0415,E0401
+        from google.oauth2.credentials import Credentials  # noqa pylint: disable=C0415,E0401
         permissions_list = parse_json('permissions.json')
         credentials = Credentials(self.token)
         projects_client = resourcemanager_v3.ProjectsClient(credentials=credentials)  # noqa pylint: disable=C0301
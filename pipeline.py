@@ -0,0 +1,254 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Runs the assessment stages as a graph with cached outputs.
+
+Each stage declares the stages whose outputs it takes as inputs, the
+settings it depends on, and the files it reads or writes. The output
+of a stage is cached with a fingerprint of its settings, files and
+the outputs of its input stages, and a stage only runs again when
+its fingerprint changes, when its cached output or output files are
+missing, or when it is asked to. A stage whose new output is the same
+as its cached output does not make the stages after it stale.
+
+Stages whose inputs are ready run concurrently, in threads.
+"""
+
+import concurrent.futures
+import hashlib
+import json
+import os
+import threading
+from base_logger import logger
+from utils import create_dir, parse_json, write_json
+
+
+class Stage():  # noqa pylint: disable=R0903
+    """A stage of the pipeline.
+
+    Attributes:
+        name (str): The stage name.
+        func: Called with the outputs of the input stages, as keyword
+              arguments named after them. Its return value is the
+              output of the stage, and must be JSON serializable.
+        inputs (list): The names of the stages it takes outputs of.
+        params: JSON serializable settings the output depends on.
+        files (list): Files or directories read by the stage. Their
+                      size and modification time are fingerprinted.
+        outputs (list): Files written by the stage. The stage runs
+                        again when one of them is missing.
+    """
+
+    def __init__(self, name, func, inputs=(), params=None,  # noqa pylint: disable=R0913,R0917
+                 files=(), outputs=()):
+        """Initializes Stage."""
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.params = params
+        self.files = list(files)
+        self.outputs = list(outputs)
+
+
+def file_stats(paths):
+    """Returns the size and modification time of files.
+
+    Args:
+        paths (list): Files or directories, read recursively.
+
+    Returns:
+        list: The path, size and modification time of each file,
+              sorted by path. Missing paths have no entries.
+    """
+    stats = []
+    for path in paths:
+        if os.path.isfile(path):
+            files = [path]
+        else:
+            files = [os.path.join(root, name)
+                     for root, _, names in os.walk(path) for name in names]
+        for file in files:
+            stat = os.stat(file)
+            stats.append([file, stat.st_size, stat.st_mtime_ns])
+    return sorted(stats)
+
+
+class Pipeline():  # noqa pylint: disable=R0902
+    """Runs stages in dependency order, reusing their cached outputs.
+
+    The outputs are kept as `<stage>.json` in the cache directory,
+    with their fingerprints in `pipeline.json`.
+    """
+
+    def __init__(self, stages, cache_dir, workers=2):
+        """Initializes Pipeline.
+
+        Args:
+            stages (list): The stages, each after its input stages.
+            cache_dir (str): The directory of the cached outputs.
+            workers (int): The number of stages run at once.
+        """
+        self.stages = {}
+        for each_stage in stages:
+            unknown = [name for name in each_stage.inputs
+                       if name not in self.stages]
+            if unknown:
+                raise ValueError(
+                    f"Stage {each_stage.name} takes unknown inputs {unknown}")  # noqa pylint: disable=C0301
+            self.stages[each_stage.name] = each_stage
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.manifest_file = os.path.join(cache_dir, "pipeline.json")
+        self.manifest = {}
+        if os.path.exists(self.manifest_file):
+            self.manifest = parse_json(self.manifest_file).get("stages", {})
+        self.lock = threading.Lock()
+        self.digests = {}
+        self.results = {}
+        self.ran = []
+        self.cached = []
+
+    def output_file(self, name):
+        """Returns the cache file of the output of a stage."""
+        return os.path.join(self.cache_dir, f"{name}.json")
+
+    def fingerprint(self, stage):
+        """Fingerprints the inputs of a stage.
+
+        Args:
+            stage (Stage): A stage whose input stages completed.
+
+        Returns:
+            str: The sha256 of its settings, files and inputs.
+        """
+        return hashlib.sha256(json.dumps({
+            "params": stage.params,
+            "files": file_stats(stage.files),
+            "inputs": {name: self.digests[name] for name in stage.inputs},
+        }, sort_keys=True, default=str).encode()).hexdigest()
+
+    def is_current(self, stage, fingerprint):
+        """Checks if the cached output of a stage can be reused.
+
+        Args:
+            stage (Stage): The stage.
+            fingerprint (str): The fingerprint of its inputs.
+
+        Returns:
+            bool: True if the stage need not run again.
+        """
+        cached = self.manifest.get(stage.name, {})
+        return (cached.get("fingerprint") == fingerprint
+                and os.path.exists(self.output_file(stage.name))
+                and all(os.path.exists(file) for file in stage.outputs))
+
+    def result(self, name):
+        """Returns the output of a completed stage.
+
+        Cached outputs are only read when a stage needs them.
+
+        Args:
+            name (str): The stage name.
+
+        Returns:
+            The output of the stage.
+        """
+        with self.lock:
+            if name not in self.results:
+                self.results[name] = parse_json(self.output_file(name))
+            return self.results[name]
+
+    def save(self, name, fingerprint, output):
+        """Caches the output of a stage.
+
+        Args:
+            name (str): The stage name.
+            fingerprint (str): The fingerprint of its inputs.
+            output: The output of the stage.
+
+        Returns:
+            str: The sha256 of the output.
+        """
+        data = json.dumps(output, sort_keys=True, default=str)
+        digest = hashlib.sha256(data.encode()).hexdigest()
+        file = self.output_file(name)
+        if digest != self.manifest.get(name, {}).get("digest") or \
+                not os.path.exists(file):
+            with open(f"{file}.tmp", "w", encoding="utf-8") as fl:
+                fl.write(data)
+            os.replace(f"{file}.tmp", file)
+        with self.lock:
+            self.results[name] = output
+            self.manifest[name] = {"fingerprint": fingerprint,
+                                   "digest": digest}
+            write_json(self.manifest_file, {"stages": self.manifest})
+        return digest
+
+    def run_stage(self, stage, rerun):
+        """Runs a stage, or reuses its cached output.
+
+        Args:
+            stage (Stage): A stage whose input stages completed.
+            rerun (bool): Run the stage even if its output is current.
+
+        Returns:
+            str: The sha256 of its output.
+        """
+        fingerprint = self.fingerprint(stage)
+        if not rerun and self.is_current(stage, fingerprint):
+            logger.info(f"Stage {stage.name} is up to date, using its cached output")  # noqa pylint: disable=C0301,W1203
+            self.cached.append(stage.name)
+            return self.manifest[stage.name]["digest"]
+        output = stage.func(**{name: self.result(name)
+                               for name in stage.inputs})
+        self.ran.append(stage.name)
+        return self.save(stage.name, fingerprint, output)
+
+    def run(self, rerun=()):
+        """Runs the stages that are stale.
+
+        Args:
+            rerun (iterable): Names of stages to run even if their
+                              outputs are current, or "all".
+
+        Returns:
+            Pipeline: The pipeline, whose `result` returns the output
+                      of each stage.
+        """
+        create_dir(self.cache_dir)
+        rerun = set(self.stages) if "all" in rerun else set(rerun)
+        pending = dict(self.stages)
+        running = {}
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.workers) as executor:
+            while pending or running:
+                for name, each_stage in list(pending.items()):
+                    if all(i in self.digests for i in each_stage.inputs):
+                        running[executor.submit(
+                            self.run_stage, each_stage,
+                            name in rerun)] = name
+                        del pending[name]
+                done, _ = concurrent.futures.wait(
+                    running, return_when=concurrent.futures.FIRST_COMPLETED)  # noqa pylint: disable=C0301
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        self.digests[name] = future.result()
+                    except Exception:
+                        pending.clear()
+                        raise
+        logger.info(f"Pipeline stages run: {self.ran}, up to date: {self.cached}")  # noqa pylint: disable=C0301,W1203
+        return self
@@ -0,0 +1,110 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Local pre-validation of proxy bundles.
+
+This module checks API proxies against rules whose outcome is
+known without calling the target organization, using the parsed
+proxy model already stored in the proxy dependency map. Bundles
+that break a rule are reported as not importable without being
+uploaded for remote validation.
+"""
+
+from base_logger import logger
+from utils import write_json
+
+
+class PreValidator():
+    """Runs local validation rules on exported API proxies.
+
+    Each rule returns a list of violations shaped like the ones
+    returned by the Apigee validate API (type, subject and
+    description), and the number of proxies hit by each rule is
+    counted.
+    """
+
+    def __init__(self, proxy_dependency_map):
+        """Initializes PreValidator.
+
+        Args:
+            proxy_dependency_map (dict): The proxy dependency map
+                built during export.
+        """
+        self.proxy_dependency_map = proxy_dependency_map or {}
+        self.rules = {
+            'unsupported_policies': self.check_unsupported_policies,
+        }
+        self.rule_hits = {rule: 0 for rule in self.rules}
+        self.failed = {}
+
+    def check_unsupported_policies(self, api_name, qualification):
+        """Checks for policies not supported by Apigee X/hybrid.
+
+        Args:
+            api_name (str): The API proxy name.
+            qualification (dict): Qualification info of the proxy.
+
+        Returns:
+            list: Violations found.
+        """
+        return [
+            {
+                'type': 'UnsupportedPolicy',
+                'subject': f"{api_name}/policies/{policy}",
+                'description': f"Policy type {policy_type} is not supported in Apigee X/hybrid",  # noqa pylint: disable=C0301
+            }
+            for policy, policy_type in qualification.get('policies', {}).items()  # noqa pylint: disable=C0301
+        ]
+
+    def validate(self, api_type, api_name):
+        """Runs all rules on an exported API proxy.
+
+        Args:
+            api_type (str): 'apis' or 'sharedflows'.
+            api_name (str): The API proxy name.
+
+        Returns:
+            list: Violations found, empty when the proxy passes
+                every rule or has no parsed model.
+        """
+        if api_type != 'apis':
+            return []
+        qualification = self.proxy_dependency_map.get(
+            api_name, {}).get('qualification')
+        if qualification is None:
+            return []
+        violations = []
+        for rule, check in self.rules.items():
+            rule_violations = check(api_name, qualification)
+            if rule_violations:
+                self.rule_hits[rule] += 1
+                self.failed.setdefault(api_name, []).append(rule)
+                violations.extend(rule_violations)
+        return violations
+
+    def write_summary(self, summary_file):
+        """Logs and writes the rule hit counts.
+
+        Args:
+            summary_file (str): Path of the JSON summary file.
+        """
+        for rule, hits in self.rule_hits.items():
+            logger.info(f"Local pre-validation rule {rule}: {hits} proxies")  # noqa pylint: disable=W1203
+        logger.info(f"Remote validation skipped for {len(self.failed)} proxies")  # noqa pylint: disable=W1203
+        write_json(summary_file, {
+            'rule_hits': self.rule_hits,
+            'skipped_remote_validation': self.failed,
+        })
@@ -0,0 +1,151 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Optional cProfile profiling of the pipeline stages.
+
+Profiling is enabled by the `--profile` argument of main.py, or by
+setting the `PROFILE_DIR` environment variable to the directory the
+profiles are written to. Worker processes of `utils.run_parallel`
+inherit the variable, profile their tasks and send the profile data
+back with their results, so that the profile of a stage includes the
+work done in its worker processes.
+
+For each stage, the directory holds:
+
+- `<stage>.prof`: the stage, including its worker processes.
+- `<stage>.workers.prof`: the worker processes only.
+- `<stage>.txt`: the functions with the highest cumulative time.
+
+The .prof files can be read with `pstats` or tools like snakeviz.
+"""
+
+import cProfile
+import io
+import os
+import pstats
+import threading
+from contextlib import contextmanager
+from base_logger import logger
+
+PROFILE_DIR_ENV = "PROFILE_DIR"
+TOP_FUNCTIONS = 40
+
+_worker_stats = []
+_lock = threading.Lock()
+
+
+def enable_profiling(directory):
+    """Enables profiling for this process and its worker processes.
+
+    Args:
+        directory (str): The directory profiles are written to.
+    """
+    os.makedirs(directory, exist_ok=True)
+    os.environ[PROFILE_DIR_ENV] = directory
+
+
+def profile_dir():
+    """Returns the profile directory, None when profiling is off."""
+    return os.environ.get(PROFILE_DIR_ENV) or None
+
+
+class RawStats():  # noqa pylint: disable=R0903
+    """Profile data received from a worker process, readable by
+    `pstats.Stats`."""
+
+    def __init__(self, stats):
+        """Initializes RawStats.
+
+        Args:
+            stats (dict): The `stats` of a `cProfile.Profile`.
+        """
+        self.stats = stats
+
+    def create_stats(self):
+        """Does nothing, the stats are already created."""
+
+
+def add_worker_stats(stats):
+    """Keeps the profile data of a worker task until its stage ends.
+
+    Args:
+        stats (dict): The `stats` of a `cProfile.Profile`.
+    """
+    with _lock:
+        _worker_stats.append(stats)
+
+
+def profile_task(func, arg):
+    """Runs a worker task under the profiler.
+
+    Args:
+        func: The task function.
+        arg: The task argument.
+
+    Returns:
+        tuple: The task result and the profile data.
+    """
+    profile = cProfile.Profile()
+    result = profile.runcall(func, arg)
+    profile.create_stats()
+    return result, profile.stats
+
+
+def write_stats(stats, file):
+    """Writes profile data and its summary.
+
+    Args:
+        stats (pstats.Stats): The profile data.
+        file (str): The .prof file path.
+    """
+    stats.dump_stats(file)
+    summary = io.StringIO()
+    stats.stream = summary
+    stats.sort_stats("cumulative").print_stats(TOP_FUNCTIONS)
+    with open(f"{file[:-len('.prof')]}.txt", "w", encoding="utf-8") as fl:
+        fl.write(summary.getvalue())
+
+
+@contextmanager
+def profiled(name):
+    """Profiles a stage when profiling is enabled.
+
+    Args:
+        name (str): The stage name, used as the file name.
+    """
+    directory = profile_dir()
+    if directory is None:
+        yield
+        return
+    with _lock:
+        _worker_stats.clear()
+    profile = cProfile.Profile()
+    profile.enable()
+    try:
+        yield
+    finally:
+        profile.disable()
+        with _lock:
+            worker_stats = list(_worker_stats)
+            _worker_stats.clear()
+        stats = pstats.Stats(profile)
+        if worker_stats:
+            workers = pstats.Stats(*[RawStats(s) for s in worker_stats])
+            workers.dump_stats(os.path.join(directory, f"{name}.workers.prof"))  # noqa pylint: disable=C0301
+            stats.add(workers)
+        file = os.path.join(directory, f"{name}.prof")
+        write_stats(stats, file)
+        logger.info(f"Profile of stage {name} written to {file}, with {len(worker_stats)} worker tasks")  # noqa pylint: disable=C0301,W1203
@@ -18,8 +18,10 @@
 for Apigee migration assessment.
 """
 
+import concurrent.futures
+import functools
+import itertools
 import json
-import xlsxwriter  # pylint: disable=E0401
 from qualification_report_mapping.header_mapping import (
     topology_installation_mapping, proxies_per_env_mapping,
     northbound_mtls_mapping, company_and_developers_mapping,
@@ -38,6 +40,411 @@ from qualification_report_mapping.header_mapping import (
 )
 from qualification_report_mapping.report_summary import report_summary
 from base_logger import logger
+from utils import write_csv_report
+
+# The header mapping of each report sheet, keyed by sheet.
+REPORT_SHEETS = {
+    'proxies_per_env': proxies_per_env_mapping,
+    'northbound_mtls': northbound_mtls_mapping,
+    'company_and_developers': company_and_developers_mapping,
+    'anti_patterns': anti_patterns_mapping,
+    'cache_without_expiry': cache_without_expiry_mapping,
+    'apps_without_api_products': apps_without_api_products_mapping,
+    'json_path_enabled': json_path_enabled_mapping,
+    'cname_anomaly': cname_anomaly_mapping,
+    'unsupported_policies': unsupported_polices_mapping,
+    'api_limits': api_limits_mapping,
+    'org_limits': org_limits_mapping,
+    'env_limits': env_limits_mapping,
+    'api_with_multiple_basepaths': api_with_multiple_basepath_mapping,
+    'sharding_output': sharding_output,
+    'aliases_with_private_keys': aliases_with_private_keys,
+    'sharded_proxies': sharded_proxies,
+    'validation_report': validation_report,
+    'org_resourcefiles': org_resourcefiles,
+    'topology_installation': topology_installation_mapping,
+}
+
+
+def index_proxy_dependency_map(index, proxy_map, org_name):
+    """Adds the rows of the sheets built from the proxy dependency map.
+
+    Args:
+        index (dict): The report index being built.
+        proxy_map (dict): The proxy dependency map.
+        org_name (str): The name of the Apigee organization.
+    """
+    for proxy, values in proxy_map.items():
+        if values.get("is_split"):
+            index['sharded_proxies'].append(
+                [org_name, proxy,
+                 '\n'.join(values.get("split_output_names"))])
+
+        if values.get("unifier_created"):
+            continue
+
+        qualification = values.get('qualification', {})
+        for policy, value in qualification.get('AntiPatternQuota', {}).items():   # noqa pylint: disable=C0301
+            index['anti_patterns'].append(
+                [org_name, proxy, policy, value['distributed'],
+                 value['Synchronous']])
+        for policy, value in qualification.get('CacheWithoutExpiry', {}).items():   # noqa pylint: disable=C0301
+            index['cache_without_expiry'].append(
+                [org_name, proxy, policy, value])
+        for policy, value in qualification.get('JsonPathEnabled', {}).items():   # noqa pylint: disable=C0301
+            index['json_path_enabled'].append(
+                [org_name, proxy, policy, value])
+        for policy_name, policy in qualification.get('policies', {}).items():
+            index['unsupported_policies'].append(
+                [org_name, proxy, policy_name, policy])
+
+        base_paths = [
+            str(path) if path is not None else 'None'
+            for path in qualification.get('base_paths', [])]
+        if len(base_paths) > 5:
+            base_paths_cell = ('\n'.join(base_paths), 'danger')
+        elif len(base_paths) > 1:
+            base_paths_cell = ('\n'.join(base_paths), 'yellow')
+        elif len(base_paths) == 1:
+            base_paths_cell = '\n'.join(base_paths)
+        else:
+            base_paths_cell = None
+        index['api_with_multiple_basepaths'].append(
+            [org_name, proxy, base_paths_cell])
+
+
+def index_env_config(index, env_config, org_name):  # noqa pylint: disable=R0914
+    """Adds the rows of the sheets built from the environment config.
+
+    Args:
+        index (dict): The report index being built.
+        env_config (dict): The exported environment configuration.
+        org_name (str): The name of the Apigee organization.
+    """
+    for env, value in env_config.items():
+        num_proxies = len(value.get('apis', []))
+        num_sf = len(value.get('sharedflows', []))
+        index['proxies_per_env'].append(
+            [org_name, env, num_proxies, num_sf, num_proxies + num_sf])
+
+        vhosts = value.get('vhosts', {})
+        for vhost, vhost_content in vhosts.items():
+            sslinfo = vhost_content.get('sSLInfo')
+            if sslinfo:
+                if sslinfo.get('keyStore'):
+                    keystore_cell = (sslinfo['keyStore'], 'danger')
+                elif vhost_content.get("useBuiltInFreeTrialCert") is True:
+                    keystore_cell = ("Free Trial Cert Used", 'danger')
+                else:
+                    keystore_cell = None
+                index['northbound_mtls'].append(
+                    [org_name, env, vhost,
+                     (sslinfo['enabled'], 'danger'),
+                     (sslinfo['clientAuthEnabled'], 'danger'),
+                     keystore_cell])
+            else:
+                index['northbound_mtls'].append(
+                    [org_name, env, vhost, 'False'])
+
+            if vhost_content.get('useBuiltInFreeTrialCert', False):
+                index['cname_anomaly'].append(
+                    [org_name, env, vhost_content['name']])
+
+        certs = 0
+        for keystore, keystore_content in value.get('keystores', {}).items():
+            certs = certs + len(keystore_content.get('aliases', []))
+            for alias, alias_content in (keystore_content.get('alias_data') or {}).items():   # noqa pylint: disable=C0301
+                key_name = alias_content.get('keyName')
+                index['aliases_with_private_keys'].append(
+                    [org_name, env, keystore, alias,
+                     (key_name, 'danger') if key_name else None])
+
+        kvms = value.get('kvms', {})
+        encrypted_count = 0
+        for kvm, kvm_content in kvms.items():
+            if len(kvm) != 0 and kvm_content.get("encrypted"):
+                encrypted_count = encrypted_count+1
+        index['env_limits'].append(
+            [org_name, env, len(value.get('targetServers', [])),
+             len(value.get('caches', [])), certs, len(kvms),
+             (encrypted_count, 'danger') if encrypted_count > 0
+             else encrypted_count,
+             len(kvms) - encrypted_count, len(vhosts),
+             len(value.get('references', []))])
+
+
+def index_org_config(index, org_config, org_name):
+    """Adds the rows of the sheets built from the organization config.
+
+    Args:
+        index (dict): The report index being built.
+        org_config (dict): The exported organization configuration.
+        org_name (str): The name of the Apigee organization.
+    """
+    for company in org_config.get('companies', []):
+        index['company_and_developers'].append([org_name, company])
+
+    apps = org_config.get('apps', {})
+    for app, value in apps.items():
+        credentials = value.get('credentials', [])
+        if len(credentials) == 0:
+            index['apps_without_api_products'].append(
+                [org_name, value.get('name', 'Unknown App Name'), app,
+                 'No Credentials Found'])
+        elif any(len(each_cred.get('apiProducts', [])) == 0
+                 for each_cred in credentials):
+            index['apps_without_api_products'].append(
+                [org_name, value['name'], app, 'No apiProducts associated'])
+
+    apis = org_config.get('apis', {})
+    for key, value in apis.items():
+        index['api_limits'].append([org_name, key, len(value)])
+
+    kvms = org_config.get('kvms', {})
+    encrypted_count = 0
+    for _, kvm_content in kvms.items():
+        if kvm_content.get("encrypted"):
+            encrypted_count = encrypted_count+1
+    index['org_limits'].append(
+        [org_name, len(org_config.get('developers', [])), len(kvms),
+         (encrypted_count, 'danger') if encrypted_count > 0
+         else encrypted_count,
+         len(kvms) - encrypted_count, len(apps),
+         len(org_config.get('apiProducts', [])), len(apis)])
+
+    for key in org_config.get('resourcefiles', []):
+        index['org_resourcefiles'].append([org_name, key])
+
+
+def index_validation_report(index, validation_data):
+    """Adds the rows of the "Validation Report" sheet.
+
+    Args:
+        index (dict): The report index being built.
+        validation_data (dict): The validation report of the export.
+    """
+    for key, value in validation_data.items():
+        if key == "report":
+            continue
+
+        for values in value:
+            cells = [key, values['name']]
+            if values['importable']:
+                violations = [{'violations': []}] if len(values.get('reason',[])) == 0 else values.get('reason',[])   # noqa pylint: disable=C0301
+                if len(violations[0].get('violations', [])) == 0:
+                    cells.extend([(values['importable'], 'green'), 'N/A'])
+                else:
+                    reason_str = violations[0].get('violations', [])
+                    cells.extend([(values['importable'], 'yellow'),
+                                  json.dumps(reason_str, indent=2)])
+            else:
+                violations = values.get('reason', [{'violations': []}])
+                if len(violations[0].get('violations', [])) == 0:
+                    error_code = values.get('error', {}).get('code', 0)
+                    message = values.get('error', {}).get('message', '')
+                    reason_str = {'violations': [
+                        {'description': f"code: {error_code}. error_message: {message}"} # noqa
+                    ]}
+                else:
+                    reason_str = violations[0].get('violations', [])
+                cells.extend([(values['importable'], 'danger'),
+                              json.dumps(reason_str, indent=2)])
+            cells.append(values.get('imported', 'UNKNOWN'))
+            index['validation_report'].append(cells)
+
+
+def index_sharding_output(index, sharding_env_output, org_name):
+    """Adds the rows of the "Target Environments" sheet.
+
+    Args:
+        index (dict): The report index being built.
+        sharding_env_output (dict): The sharding output of the export.
+        org_name (str): The name of the Apigee organization.
+    """
+    for env, sharded_envs in sharding_env_output.items():
+        for sharded_env, content in sharded_envs.items():
+            proxies_list = content.get("proxyname", [])
+            shared_flows_list = content.get("shared_flow", [])
+            index['sharding_output'].append(
+                [org_name, env, sharded_env, '\n'.join(proxies_list),
+                 '\n'.join(shared_flows_list), len(proxies_list),
+                 len(shared_flows_list),
+                 len(proxies_list) + len(shared_flows_list)])
+
+
+def index_topology(index, topology_mapping, key_mapping):
+    """Adds the rows of the "Apigee (4G) components" sheet.
+
+    Args:
+        index (dict): The report index being built.
+        topology_mapping (dict): A dictionary containing the
+                            topology mapping.
+        key_mapping (list): The pod instance keys of the columns
+                            following the component type.
+    """
+    for dc, pods in topology_mapping.get('data_center_mapping', {}).items():
+        for pod, pod_instances in pods.items():
+            for pod_instance in pod_instances:
+                index['topology_installation'].append(
+                    [dc, pod, '\n'.join(pod_instance['type'])] +
+                    [pod_instance[col_key_map] for col_key_map in key_mapping])   # noqa pylint: disable=C0301
+
+
+def run_index_job(job):
+    """Builds the rows of the sheets fed by one slice of the export.
+
+    Args:
+        job (tuple): The indexing function and the export slice.
+
+    Returns:
+        dict: The rows of each sheet, keyed by sheet.
+    """
+    indexer, data = job
+    index = {sheet: [] for sheet in REPORT_SHEETS}
+    indexer(index, data)
+    return index
+
+
+def report_index_jobs(export_data, topology_mapping, org_name, chunks=1):
+    """Splits the export into independent indexing jobs.
+
+    Each export section feeds its own set of sheets, so each section
+    is a job of its own. The proxy dependency map, usually the largest
+    section, is further split into `chunks` consecutive slices.
+
+    Args:
+        export_data (dict): A dictionary containing the exported
+                            Apigee data.
+        topology_mapping (dict): A dictionary containing the
+                            topology mapping.
+        org_name (str): The name of the Apigee organization.
+        chunks (int): Number of slices of the proxy dependency map.
+
+    Returns:
+        list: The (indexing function, export slice) jobs, in the
+              order their rows are merged.
+    """
+    proxy_map = export_data.get('proxy_dependency_map') or {}
+    chunk_size = max(1, -(-len(proxy_map) // max(1, chunks)))
+    proxy_items = iter(proxy_map.items())
+    jobs = [
+        (functools.partial(index_proxy_dependency_map, org_name=org_name),
+         dict(itertools.islice(proxy_items, chunk_size)))
+        for _ in range(0, len(proxy_map), chunk_size)
+    ]
+    jobs.extend([
+        (functools.partial(index_env_config, org_name=org_name),
+         export_data.get('envConfig') or {}),
+        (functools.partial(index_org_config, org_name=org_name),
+         export_data.get('orgConfig') or {}),
+        (functools.partial(index_sharding_output, org_name=org_name),
+         export_data.get('sharding_output') or {}),
+        (index_validation_report,
+         export_data.get('validation_report') or {}),
+        (functools.partial(
+            index_topology,
+            key_mapping=topology_installation_mapping["key_mapping"]),
+         topology_mapping or {}),
+    ])
+    return jobs
+
+
+def build_report_index(export_data, topology_mapping, org_name, workers=1):
+    """Builds the rows of every report sheet in a single pass.
+
+    The proxy dependency map, the environment and organization
+    configs, the sharding output and the validation report are each
+    traversed once. A row is a list of cells, where a cell is a plain
+    value, a (value, format name) tuple, or None for a blank cell.
+    Cells checked against configured limits hold the plain value,
+    the limits are applied when the sheet is written.
+
+    With more than one worker, the export slices are indexed
+    concurrently in worker processes, and merged in job order so the
+    rows are the same as when indexed sequentially.
+
+    Args:
+        export_data (dict): A dictionary containing the exported
+                            Apigee data.
+        topology_mapping (dict): A dictionary containing the
+                            topology mapping.
+        org_name (str): The name of the Apigee organization.
+        workers (int): Number of worker processes.
+
+    Returns:
+        dict: The rows of each sheet, keyed by sheet.
+    """
+    jobs = report_index_jobs(
+        export_data, topology_mapping, org_name, chunks=workers)
+    index = {sheet: [] for sheet in REPORT_SHEETS}
+
+    if workers > 1:
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=workers) as executor:
+            results = list(executor.map(run_index_job, jobs))
+    else:
+        results = map(run_index_job, jobs)
+
+    for result in results:
+        for sheet, rows in result.items():
+            index[sheet].extend(rows)
+    return index
+
+
+def write_report_csv(report_dir, index, sheets=None):
+    """Writes the rows of the report sheets as CSV files.
+
+    Each sheet is streamed to `<report_dir>/<sheet>.csv` with its
+    column headings and plain cell values, without any of the xlsx
+    formatting. Sheets without rows get a file with headings only,
+    so every run produces the same set of files.
+
+    Args:
+        report_dir (str): The directory of the CSV files.
+        index (dict): The rows of each sheet, as built by
+                      `build_report_index`.
+        sheets (list): The sheets to write, all sheets when None.
+    """
+    for sheet, mapping_json in REPORT_SHEETS.items():
+        if sheets is not None and sheet not in sheets:
+            continue
+        logger.info(f"Writing {sheet} report rows to CSV")  # noqa pylint: disable=W1203
+        write_csv_report(
+            f"{report_dir}/{sheet}.csv", mapping_json["headers"],
+            ([cell[0] if isinstance(cell, tuple) else cell for cell in cells]   # noqa pylint: disable=C0301
+             for cells in index[sheet]))
+
+
+def cell_pixel_width(value):
+    """Estimates the pixel width of a cell value like autofit() does.
+
+    Args:
+        value (str|int|float|bool): The value of the cell.
+
+    Returns:
+        int: The width of the value in pixels.
+    """
+    if isinstance(value, bool):
+        # Excel standard widths for TRUE and FALSE.
+        return 31 if value else 36
+    if isinstance(value, (int, float)):
+        return 7 * len(str(value))
+    from xlsxwriter.utility import xl_pixel_width  # noqa pylint: disable=C0415,E0401
+    return max(xl_pixel_width(line) for line in str(value).split('\n'))
+
+
+def pixels_to_width(pixels):
+    """Converts a column width in pixels to character units.
+
+    Args:
+        pixels (int): The width in pixels.
+
+    Returns:
+        float: The width in character units of Calibri 11.
+    """
+    if pixels <= 12:
+        return pixels / 12.0
+    return (pixels - 5.0) / 7.0
 
 
 class QualificationReport():  # noqa pylint: disable=R0902,R0904
@@ -50,7 +457,8 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
     """
 
     def __init__(self, workbookname, export_data,  # noqa pylint: disable=R0913,R0917
-                 topology_mapping, cfg, backend_cfg, org_name):
+                 topology_mapping, cfg, backend_cfg, org_name,
+                 constant_memory=False, index=None):
         """Initializes the QualificationReport object.
 
         Args:
@@ -64,8 +472,17 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
             backend_cfg (configparser.ConfigParser): Backend
                                 configurations.
             org_name (str): The name of the Apigee organization.
+            constant_memory (bool): Flush each sheet row to disk as
+                                soon as the next one is written,
+                                instead of keeping every cell in
+                                memory until the workbook is closed.
+            index (dict): The rows of the sheets, when already built
+                                by `build_report_index`.
         """
-        self.workbook = xlsxwriter.Workbook(workbookname)
+        # xlsxwriter is only imported when an Excel report is written.
+        import xlsxwriter  # noqa pylint: disable=C0415,E0401
+        self.workbook = xlsxwriter.Workbook(
+            workbookname, {'constant_memory': constant_memory})
         self.export_data = export_data
         self.topology_mapping = topology_mapping
         self.org_name = org_name
@@ -79,6 +496,12 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         self.danger_format = self.workbook.add_format({'bg_color': '#f5cbcc'})
         self.yellow_format = self.workbook.add_format({'bg_color': 'yellow'})
         self.green_format = self.workbook.add_format({'bg_color': '#5fbd76'})
+        self.formats = {
+            'danger': self.danger_format,
+            'yellow': self.yellow_format,
+            'green': self.green_format,
+        }
+        self._index = index
 
         # Information blue box formats
         self.info_format = self.workbook.add_format(
@@ -186,75 +609,176 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
 
         return final_text
 
-    def qualification_report_info_box(self, mapping_json, sheet):
-        """Creates an information box within the specified sheet.
+    def qualification_report_info_box(self, mapping_json, sheet):  # noqa pylint: disable=R0914
+        """Prepares the information box of the specified sheet.
+
+        The columns of the box are sized right away, while its cells
+        are returned so that they can be written in row order along
+        with the rows of the sheet.
 
         Args:
             mapping_json (dict):  Configuration for the information box.
             sheet (xlsxwriter.Worksheet): The worksheet object to add
                                             the box to.
+
+        Returns:
+            dict: The cell writes of the box, keyed by row.
         """
         # Information box
-        alph = 65 + len(mapping_json["headers"])
+        col = len(mapping_json["headers"])
+        info_blocks = (mapping_json["info_block"] if isinstance(mapping_json["info_block"], list)   # noqa pylint: disable=C0301
+                       else [mapping_json["info_block"]])
+        writes = {}
 
-        if isinstance(mapping_json["info_block"], dict):
-            sheet.set_column(len(mapping_json["headers"]), len(mapping_json["headers"])+int(mapping_json["info_block"]["col_merge"]), len(   # noqa pylint: disable=C0301
-                mapping_json["info_block"]["text"].split("\n")[int(mapping_json["info_block"]["text_line_no_for_col_count"])]) / int(mapping_json["info_block"]["col_merge"]))   # noqa pylint: disable=C0301
+        for block in info_blocks:
+            if "text_line_no_for_col_count" in block:
+                sheet.set_column(col, col+int(block["col_merge"]), len(   # noqa pylint: disable=C0301
+                    block["text"].split("\n")[int(block["text_line_no_for_col_count"])]) / int(block["col_merge"]))   # noqa pylint: disable=C0301
 
             final_text = self.get_final_info_text_and_format_arr(
-                mapping_json["info_block"]["text"])
-
-            sheet.merge_range(
-                f'{chr(alph)}{int(mapping_json["info_block"]["start_row"])}:{chr(alph+(int(mapping_json["info_block"]["col_merge"])-1))}{int(mapping_json["info_block"]["end_row"])}', "", self.info_format)   # noqa pylint: disable=C0301
-            sheet.write_rich_string(
-                f'{chr(alph)}{int(mapping_json["info_block"]["start_row"])}', *final_text)   # noqa pylint: disable=C0301
-
-        elif isinstance(mapping_json["info_block"], list):
-            for block in mapping_json["info_block"]:
-                if "text_line_no_for_col_count" in block:
-                    sheet.set_column(len(mapping_json["headers"]), len(mapping_json["headers"])+int(block["col_merge"]), len(   # noqa pylint: disable=C0301
-                        block["text"].split("\n")[int(block["text_line_no_for_col_count"])]) / int(block["col_merge"]))   # noqa pylint: disable=C0301
-
-                final_text = self.get_final_info_text_and_format_arr(
-                    block["text"])
-
-                sheet.merge_range(
-                    f'{chr(alph)}{int(block["start_row"])}:{chr(alph+(int(block["col_merge"])-1))}{int(block["end_row"])}', "", self.info_format)   # noqa pylint: disable=C0301
-                sheet.write_rich_string(
-                    f'{chr(alph)}{int(block["start_row"])}', *final_text)
+                block["text"])
+            first_row = int(block["start_row"]) - 1
+            last_row = int(block["end_row"]) - 1
+            last_col = col + int(block["col_merge"]) - 1
+
+            writes.setdefault(first_row, []).append(functools.partial(
+                self.merge_info_block, sheet, first_row, col, last_row,
+                last_col))
+            for row in range(first_row, last_row + 1):
+                for block_col in range(col, last_col + 1):
+                    if row == first_row and block_col == col:
+                        writes[row].append(functools.partial(
+                            sheet.write_rich_string, row, col, *final_text))
+                    else:
+                        writes.setdefault(row, []).append(functools.partial(
+                            sheet.write_blank, row, block_col, None,
+                            self.info_format))
 
-        link_start_row = (int(mapping_json["info_block"]["end_row"])+2 if isinstance(mapping_json["info_block"], dict)   # noqa pylint: disable=C0301
-                            else mapping_json["info_block"][len(mapping_json["info_block"])-1]["end_row"]+2)   # noqa pylint: disable=C0301
+        link_start_row = int(info_blocks[-1]["end_row"])+1
 
         if ("link" in mapping_json["info_block"] or "link" in mapping_json):   # noqa pylint: disable=C0301
 
             link_arr = mapping_json["info_block"]["link"] if isinstance(   # noqa pylint: disable=C0301
                     mapping_json["info_block"], dict) else mapping_json["link"]   # noqa pylint: disable=C0301
 
-            sheet.write_string(f'{chr(alph)}{int(link_start_row)}',
-                               f"Reference Link{'s:' if len(link_arr) > 1 else ':'}", self.ref_link_heading_format)   # noqa pylint: disable=C0301
+            writes.setdefault(link_start_row, []).append(functools.partial(
+                sheet.write_string, link_start_row, col,
+                f"Reference Link{'s:' if len(link_arr) > 1 else ':'}", self.ref_link_heading_format))   # noqa pylint: disable=C0301
             link_start_row = link_start_row+1
 
             for link_item in link_arr:
-                sheet.write_url(f'{chr(alph)}{link_start_row}',
-                                link_item["link"], self.ref_link_format, string=link_item["link_text"])   # noqa pylint: disable=C0301
+                writes.setdefault(link_start_row, []).append(functools.partial(
+                    sheet.write_url, link_start_row, col, link_item["link"],
+                    self.ref_link_format, string=link_item["link_text"]))
                 link_start_row = link_start_row+1
 
+        return writes
+
+    def merge_info_block(self, sheet, first_row, first_col, last_row,  # noqa pylint: disable=R0913,R0917
+                         last_col):
+        """Merges the cells of an information box block.
+
+        The range is merged without data or format, so merge_range()
+        does not pad it with blank cells, which in constant_memory
+        mode would flush the rows of the range before the sheet rows
+        sharing them are written. The cells of the block are written
+        in row order by `write_sheet` instead.
+
+        Args:
+            sheet (xlsxwriter.Worksheet): The worksheet object.
+            first_row (int): The first row of the block.
+            first_col (int): The first column of the block.
+            last_row (int): The last row of the block.
+            last_col (int): The last column of the block.
+        """
+        if first_row == last_row and first_col == last_col:
+            return
+        sheet.merge_range(first_row, first_col, last_row, last_col, None)
+
+    @property
+    def index(self):
+        """dict: The rows of every sheet, built on first use."""
+        if self._index is None:
+            self._index = build_report_index(
+                self.export_data, self.topology_mapping, self.org_name)
+        return self._index
+
+    def apply_limits(self, rows, limits):
+        """Marks the cells above their configured limit as danger.
+
+        Args:
+            rows (list): The rows of a sheet.
+            limits (dict): The configured limit of each checked
+                           column, keyed by column number.
+
+        Yields:
+            list: The cells of each row.
+        """
+        for cells in rows:
+            cells = list(cells)
+            for col, limit in limits.items():
+                if cells[col] > int(limit):
+                    cells[col] = (cells[col], 'danger')
+            yield cells
+
+    def write_sheet(self, name, mapping_json, rows, info_box=True):
+        """Writes a report sheet, streaming its rows in row order.
+
+        The rows and the information box are written strictly in row
+        order, so that in constant_memory mode each row is flushed to
+        disk as soon as the next one starts. Since autofit() needs
+        every cell in memory, the column widths are computed from the
+        cells while they are written instead.
+
+        Args:
+            name (str): The name of the worksheet.
+            mapping_json (dict): The header mapping of the sheet.
+            rows (iterable): The rows to write, each a list of
+                             cells as built by `build_report_index`.
+            info_box (bool): Whether the sheet has an information box.
+        """
+        sheet = self.workbook.add_worksheet(name=name)
+
+        # Headings
+        self.qualification_report_heading(mapping_json["headers"], sheet)
+        col_widths = {
+            col: cell_pixel_width(header)
+            for col, header in enumerate(mapping_json["headers"])
+        }
+
+        # Info block
+        info_writes = (self.qualification_report_info_box(mapping_json, sheet)   # noqa pylint: disable=C0301
+                       if info_box else {})
+
+        for row, cells in enumerate(rows, start=1):
+            for col, cell in enumerate(cells):
+                if cell is None:
+                    continue
+                if isinstance(cell, tuple):
+                    sheet.write(row, col, cell[0], self.formats[cell[1]])
+                    cell = cell[0]
+                else:
+                    sheet.write(row, col, cell)
+                col_widths[col] = max(col_widths.get(col, 0),
+                                      cell_pixel_width(cell))
+            for write in info_writes.pop(row, []):
+                write()
+
+        for row in sorted(info_writes):
+            for write in info_writes[row]:
+                write()
+
+        for col, pixels in col_widths.items():
+            width = min(pixels_to_width(pixels + 7), 255.0)
+            if col >= len(mapping_json["headers"]) or width > len(mapping_json["headers"][col]) + 1:   # noqa pylint: disable=C0301
+                sheet.set_column(col, col, width)
+
     def report_proxies_per_env(self):
         """Generates the "Proxies Per Env" report sheet."""
 
         # Worksheet 1 - [Proxies Per Env]
         logger.info(
             '------------------- Proxies Per Env -----------------------')
-        proxies_per_env_sheet = self.workbook.add_worksheet(
-            name='Proxies Per Env')
-
-        # Headings
-        self.qualification_report_heading(
-            proxies_per_env_mapping["headers"], proxies_per_env_sheet)
-
-        env_config = self.export_data.get('envConfig')
-        row = 1
 
         allowed_no_of_proxies_per_env = self.backend_cfg.get(
             'inputs', 'NO_OF_PROXIES_PER_ENV_LIMITS')
@@ -263,100 +787,21 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         allowed_no_of_proxies_and_shared_flows_per_env = self.backend_cfg.get(
             'inputs', 'NO_OF_PROXIES_AND_SHARED_FLOWS_PER_ENV_LIMITS')
 
-        for key, value in env_config.items():
-            # Org name
-            col = 0
-            proxies_per_env_sheet.write(row, col, self.org_name)
-            # Env name
-            col += 1
-            proxies_per_env_sheet.write(row, col, key)
-            # No of Proxies
-            col += 1
-            num_proxies = len(value['apis'])
-            if num_proxies > int(allowed_no_of_proxies_per_env):
-                proxies_per_env_sheet.write(
-                    row, col, num_proxies, self.danger_format)
-            else:
-                proxies_per_env_sheet.write(row, col, num_proxies)
-            # No of Sharedflows
-            col += 1
-            num_sf = len(value['sharedflows'])
-            if num_sf > int(allowed_no_of_shared_flows_per_env):
-                proxies_per_env_sheet.write(
-                    row, col, num_sf, self.danger_format)
-            else:
-                proxies_per_env_sheet.write(row, col, num_sf)
-            # Total no of Proxies & Sharedflows
-            col += 1
-            total_api_sf = num_proxies + num_sf
-            if total_api_sf > int(allowed_no_of_proxies_and_shared_flows_per_env):   # noqa pylint: disable=C0301
-                proxies_per_env_sheet.write(
-                    row, col, total_api_sf, self.danger_format)
-            else:
-                proxies_per_env_sheet.write(
-                    row, col, total_api_sf)
-            row += 1
-
-        proxies_per_env_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            proxies_per_env_mapping, proxies_per_env_sheet)
+        self.write_sheet(
+            'Proxies Per Env', proxies_per_env_mapping,
+            self.apply_limits(self.index['proxies_per_env'], {
+                2: allowed_no_of_proxies_per_env,
+                3: allowed_no_of_shared_flows_per_env,
+                4: allowed_no_of_proxies_and_shared_flows_per_env,
+            }))
 
     def report_north_bound_mtls(self):
         """Generates the "Northbound mTLS" report sheet."""
         # Worksheet 3 - [Northbound mTLS]
         logger.info(
             '------------------- Northbound mTLS -----------------------')
-        nb_mtls_sheet = self.workbook.add_worksheet(
-            name='Northbound mTLS')
-
-        # Headings
-        self.qualification_report_heading(
-            northbound_mtls_mapping["headers"], nb_mtls_sheet)
-
-        env_config = self.export_data.get('envConfig')
-        row = 1
-
-        for env, value in env_config.items():
-            vhosts = value['vhosts']
-            for vhost, vhost_content in vhosts.items():
-                # org name
-                col = 0
-                nb_mtls_sheet.write(row, col, self.org_name)
-                # Env name
-                col += 1
-                nb_mtls_sheet.write(row, col, env)
-                col += 1
-                nb_mtls_sheet.write(row, col, vhost)
-
-                if vhost_content.get('sSLInfo'):
-                    sslinfo = vhost_content['sSLInfo']
-                    col += 1
-                    nb_mtls_sheet.write(
-                        row, col, sslinfo['enabled'], self.danger_format)
-                    col += 1
-                    nb_mtls_sheet.write(
-                        row, col, sslinfo['clientAuthEnabled'],
-                        self.danger_format)
-                    col += 1
-                    if sslinfo.get('keyStore'):
-                        nb_mtls_sheet.write(
-                            row, col, sslinfo['keyStore'],
-                            self.danger_format)
-                    elif vhost_content.get("useBuiltInFreeTrialCert") is True:
-                        nb_mtls_sheet.write(
-                            row, col, "Free Trial Cert Used",
-                            self.danger_format)
-
-                else:
-                    col += 1
-                    nb_mtls_sheet.write(row, col, 'False')
-                row += 1
-
-        nb_mtls_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            northbound_mtls_mapping, nb_mtls_sheet)
+        self.write_sheet('Northbound mTLS', northbound_mtls_mapping,
+                         self.index['northbound_mtls'])
 
     def report_company_and_developer(self):
         """Generates the "Company And Developers" report sheet."""
@@ -364,66 +809,16 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 4 - [Company And Developers]
         logger.info(
             '------------------- Company And Developers -----------------------')   # noqa pylint: disable=C0301
-        companies_developers = self.workbook.add_worksheet(
-            name='Company And Developers')
-
-        # Headings
-        self.qualification_report_heading(
-            company_and_developers_mapping["headers"], companies_developers)   # noqa pylint: disable=C0301
-
-        org_config = self.export_data.get('orgConfig')
-        companies = org_config['companies']
-        row = 1
-
-        # Org name
-        for company in companies:
-            col = 0
-            companies_developers.write(row, col, self.org_name)
-            col += 1
-            companies_developers.write(row, col, company)
-            row += 1
-
-        companies_developers.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            company_and_developers_mapping, companies_developers)
+        self.write_sheet('Company And Developers',
+                         company_and_developers_mapping,
+                         self.index['company_and_developers'])
 
     def report_anti_patterns(self):
         """Generates the "Anti Patterns" report sheet."""
         # Worksheet 5 - [Anti Patterns]
         logger.info('------------------- Anti Patterns -----------------------')   # noqa pylint: disable=C0301
-        anti_patterns_sheet = self.workbook.add_worksheet(name='Anti Patterns')
-
-        # Headings
-        self.qualification_report_heading(
-            anti_patterns_mapping["headers"], anti_patterns_sheet)
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("unifier_created"):
-                continue
-
-            anti_pattern_quota = values.get('qualification', {}).get('AntiPatternQuota', {})   # noqa pylint: disable=C0301
-            for policy, value in anti_pattern_quota.items():
-                col = 0
-                anti_patterns_sheet.write(row, col, self.org_name)
-                col += 1
-                anti_patterns_sheet.write(row, col, proxy)
-                col += 1
-                anti_patterns_sheet.write(row, col, policy)
-                col += 1
-                anti_patterns_sheet.write(row, col, value['distributed'])
-                col += 1
-                anti_patterns_sheet.write(row, col, value['Synchronous'])
-
-                row += 1
-
-        anti_patterns_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            anti_patterns_mapping, anti_patterns_sheet)
+        self.write_sheet('Anti Patterns', anti_patterns_mapping,
+                         self.index['anti_patterns'])
 
     def report_cache_without_expiry(self):
         """Generates the "Cache Without Expiry" report sheet."""
@@ -431,92 +826,17 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 6 - [Cache Without Expiry]
         logger.info(
             '------------------- Cache Without Expiry -----------------------')   # noqa pylint: disable=C0301
-        cache_without_expiry_sheet = self.workbook.add_worksheet(
-            name='Cache Without Expiry')
-
-        # Headings
-        self.qualification_report_heading(
-            cache_without_expiry_mapping["headers"], cache_without_expiry_sheet)   # noqa pylint: disable=C0301
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("unifier_created"):
-                continue
-
-            cache_without_expiry = values.get('qualification', {}).get('CacheWithoutExpiry', {})   # noqa pylint: disable=C0301
-            for policy, value in cache_without_expiry.items():
-                col = 0
-                cache_without_expiry_sheet.write(row, col, self.org_name)
-                col += 1
-                cache_without_expiry_sheet.write(row, col, proxy)
-                col += 1
-                cache_without_expiry_sheet.write(row, col, policy)
-                col += 1
-                cache_without_expiry_sheet.write(row, col, value)
-
-                row += 1
-
-        cache_without_expiry_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            cache_without_expiry_mapping, cache_without_expiry_sheet)
+        self.write_sheet('Cache Without Expiry', cache_without_expiry_mapping,
+                         self.index['cache_without_expiry'])
 
     def report_apps_without_api_products(self):
         """Generates the "Apps Without ApiProducts" report sheet."""
         # Worksheet 7 - [Apps Without ApiProducts]
         logger.info(
             '------------------- Apps Without ApiProducts -----------------------')   # noqa pylint: disable=C0301
-        apps_without_products_sheet = self.workbook.add_worksheet(
-            name='Apps Without ApiProducts')
-
-        # Headings
-        self.qualification_report_heading(
-            apps_without_api_products_mapping["headers"], apps_without_products_sheet)   # noqa pylint: disable=C0301
-
-        org_config = self.export_data.get('orgConfig')
-        row = 1
-
-        apps = org_config['apps']
-        for app, value in apps.items():
-            credentials = value.get('credentials', [])
-            if len(credentials) == 0:
-                col = 0
-                apps_without_products_sheet.write(row, col, self.org_name)   # noqa pylint: disable=C0301
-                # app name
-                col += 1
-                apps_without_products_sheet.write(row, col, value.get('name', 'Unknown App Name'))   # noqa pylint: disable=C0301
-                # id
-                col += 1
-                apps_without_products_sheet.write(row, col, app)
-                # status
-                col += 1
-                apps_without_products_sheet.write(
-                    row, col, 'No Credentials Found')
-            else:
-                no_products = False
-                for each_cred in credentials:
-                    if len(each_cred.get('apiProducts', [])) == 0:
-                        no_products = True
-                if no_products:
-                    col = 0
-                    apps_without_products_sheet.write(row, col, self.org_name)   # noqa pylint: disable=C0301
-                    # app name
-                    col += 1
-                    apps_without_products_sheet.write(row, col, value['name'])
-                    # id
-                    col += 1
-                    apps_without_products_sheet.write(row, col, app)
-                    # status
-                    col += 1
-                    apps_without_products_sheet.write(
-                        row, col, 'No apiProducts associated')
-
-        apps_without_products_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            apps_without_api_products_mapping, apps_without_products_sheet)  # noqa
+        self.write_sheet('Apps Without ApiProducts',
+                         apps_without_api_products_mapping,
+                         self.index['apps_without_api_products'])
 
     def report_json_path_enabled(self):
         """Generates the "Json Path Enabled" report sheet."""
@@ -524,70 +844,16 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 8 - [Json Path Enabled]
         logger.info(
             '------------------- Json Path Enabled -----------------------')  # noqa
-        json_path_enabled_sheet = self.workbook.add_worksheet(
-            name='Json Path Enabled')
-
-        # Headings
-        self.qualification_report_heading(
-            json_path_enabled_mapping["headers"], json_path_enabled_sheet)
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("unifier_created"):
-                continue
-
-            json_path_enabled = values.get('qualification', {}).get('JsonPathEnabled', {})  # noqa
-
-            for policy, value in json_path_enabled.items():
-                col = 0
-                json_path_enabled_sheet.write(row, col, self.org_name)
-                col += 1
-                json_path_enabled_sheet.write(row, col, proxy)
-                col += 1
-                json_path_enabled_sheet.write(row, col, policy)
-                col += 1
-                json_path_enabled_sheet.write(row, col, value)
-
-                row += 1
-
-        json_path_enabled_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            json_path_enabled_mapping, json_path_enabled_sheet)
+        self.write_sheet('Json Path Enabled', json_path_enabled_mapping,
+                         self.index['json_path_enabled'])
 
     def report_cname_anomaly(self):
         """Generates the "CName Anomaly" report sheet."""
 
         # Worksheet 9 - [CName Anomaly]
         logger.info('------------------- CName Anomaly -----------------------')  # noqa
-        cname_anamoly = self.workbook.add_worksheet(name='CName Anomaly')
-
-        # Headings
-        self.qualification_report_heading(
-            cname_anomaly_mapping["headers"], cname_anamoly)
-
-        env_config = self.export_data.get('envConfig')
-        row = 1
-
-        for key, value in env_config.items():
-            vhosts = value['vhosts']
-            for vhost in vhosts:
-                if vhosts[vhost].get('useBuiltInFreeTrialCert', False):
-                    # org name
-                    col = 0
-                    cname_anamoly.write(row, col, self.org_name)
-                    # Env name
-                    col += 1
-                    cname_anamoly.write(row, col, key)
-                    col += 1
-                    cname_anamoly.write(row, col, vhosts[vhost]['name'])
-                    row += 1
-
-        cname_anamoly.autofit()
-        # Info block
-        self.qualification_report_info_box(cname_anomaly_mapping, cname_anamoly)  # noqa
+        self.write_sheet('CName Anomaly', cname_anomaly_mapping,
+                         self.index['cname_anomaly'])
 
     def report_unsupported_policies(self):
         """Generates the "Unsupported Policies" report sheet."""
@@ -595,37 +861,8 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 10 - [Unsupported Policies]
         logger.info(
             '------------------- Unsupported Policies -----------------------')  # noqa
-        unsupported_polices_sheet = self.workbook.add_worksheet(
-            name='Unsupported Policies')
-
-        # Headings
-        self.qualification_report_heading(
-            unsupported_polices_mapping["headers"], unsupported_polices_sheet)
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("unifier_created"):
-                continue
-
-            policies = values.get('qualification', {}).get('policies', {})
-            for policy_name, policy in policies.items():
-                col = 0
-                unsupported_polices_sheet.write(row, col, self.org_name)
-                col += 1
-                unsupported_polices_sheet.write(row, col, proxy)
-                col += 1
-                unsupported_polices_sheet.write(row, col, policy_name)
-                col += 1
-                unsupported_polices_sheet.write(row, col, policy)
-
-                row += 1
-
-        unsupported_polices_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            unsupported_polices_mapping, unsupported_polices_sheet)
+        self.write_sheet('Unsupported Policies', unsupported_polices_mapping,
+                         self.index['unsupported_policies'])
 
     def report_api_limits(self):
         """Generates the "Product Limits - API Limits" report sheet."""
@@ -633,36 +870,15 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 12 - [Product Limits - API Limits]
         logger.info(
             '------------------- Product Limits - API Limits -----------------------')  # noqa
-        api_limits_sheet = self.workbook.add_worksheet(
-            name='Product Limits - API Limits')
-
-        # Headings
-        self.qualification_report_heading(
-            api_limits_mapping["headers"], api_limits_sheet)
 
         allowed_no_of_revisions_per_proxy = self.backend_cfg.get(
             'inputs', 'NO_OF_API_REVISIONS_IN_API_PROXY')
-        org_config = self.export_data.get('orgConfig')
-        row = 1
 
-        for key, value in org_config['apis'].items():
-            # Org name
-            col = 0
-            api_limits_sheet.write(row, col, self.org_name)
-            # Api name
-            col += 1
-            api_limits_sheet.write(row, col, key)
-            # Revisions
-            col += 1
-            if len(value) > int(allowed_no_of_revisions_per_proxy):
-                api_limits_sheet.write(row, col, len(value), self.danger_format)   # noqa pylint: disable=C0301
-            else:
-                api_limits_sheet.write(row, col, len(value))
-            row += 1
-
-        api_limits_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(api_limits_mapping, api_limits_sheet)   # noqa pylint: disable=C0301
+        self.write_sheet(
+            'Product Limits - API Limits', api_limits_mapping,
+            self.apply_limits(self.index['api_limits'], {
+                2: allowed_no_of_revisions_per_proxy,
+            }))
 
     def report_org_limits(self):
         """Generates the "Product Limits - Org Limits" report sheet."""
@@ -670,8 +886,6 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 13 - [Product Limits - Org Limits]
         logger.info(
             '------------------- Product Limits - Org Limits -----------------------')  # noqa
-        org_limits_sheet = self.workbook.add_worksheet(
-            name='Product Limits - Org Limits')
         allowed_no_of_kvms_per_org = self.backend_cfg.get(
             'inputs', 'NO_OF_KVMS_PER_ORG')
         allowed_no_of_apps_per_org = self.backend_cfg.get(
@@ -679,66 +893,13 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         allowed_no_of_apirproducts_per_org = self.backend_cfg.get(
             'inputs', 'NO_OF_API_PRODUCTS_PER_ORG')
 
-        # Headings
-        self.qualification_report_heading(
-            org_limits_mapping["headers"], org_limits_sheet)
-
-        org_config = self.export_data.get('orgConfig')
-        row = 1
-
-        # Org name
-        col = 0
-        org_limits_sheet.write(row, col, self.org_name)
-        # Developer count
-        col += 1
-        org_limits_sheet.write(row, col, len(org_config['developers']))
-        # KVM count
-        col += 1
-        if len(org_config['kvms']) > int(allowed_no_of_kvms_per_org):
-            org_limits_sheet.write(row, col, len(
-                org_config['kvms']), self.danger_format)
-        else:
-            org_limits_sheet.write(row, col, len(org_config['kvms']))
-
-        # encrypted kvm
-        col += 1
-        encrypted_count = 0
-        for _, kvm_content in org_config['kvms'].items():
-            if kvm_content.get("encrypted"):
-                encrypted_count = encrypted_count+1
-
-        if encrypted_count > 0:
-            org_limits_sheet.write(row, col, encrypted_count, self.danger_format)   # noqa pylint: disable=C0301
-        else:
-            org_limits_sheet.write(row, col, encrypted_count)
-
-        # non encrypted kvm
-        col += 1
-        org_limits_sheet.write(row, col, len(org_config['kvms']) - encrypted_count)  # noqa
-
-        # apps count
-        col += 1
-        if len(org_config['apps']) > int(allowed_no_of_apps_per_org):
-            org_limits_sheet.write(row, col, len(
-                org_config['apps']), self.danger_format)
-        else:
-            org_limits_sheet.write(row, col, len(org_config['apps']))
-
-        # api products count
-        col += 1
-        if len(org_config['apiProducts']) > int(allowed_no_of_apirproducts_per_org):  # noqa
-            org_limits_sheet.write(row, col, len(
-                org_config['apiProducts']), self.danger_format)
-        else:
-            org_limits_sheet.write(row, col, len(org_config['apiProducts']))
-
-        # api count
-        col += 1
-        org_limits_sheet.write(row, col, len(org_config['apis']))
-
-        org_limits_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(org_limits_mapping, org_limits_sheet)  # noqa
+        self.write_sheet(
+            'Product Limits - Org Limits', org_limits_mapping,
+            self.apply_limits(self.index['org_limits'], {
+                2: allowed_no_of_kvms_per_org,
+                5: allowed_no_of_apps_per_org,
+                6: allowed_no_of_apirproducts_per_org,
+            }))
 
     def report_env_limits(self):
         """Generates the "Product Limits - Env Limits" report sheet."""
@@ -746,79 +907,18 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 14 - [Product Limits - Env Limits]
         logger.info(
             '------------------- Product Limits - Env Limits -----------------------')  # noqa
-        env_limits_sheet = self.workbook.add_worksheet(
-            name='Product Limits - Env Limits')
 
         allowed_no_of_kvms_per_env = self.backend_cfg.get(
             'inputs', 'NO_OF_KVMS_PER_ENV')
         allowed_no_of_target_servers_per_env = self.backend_cfg.get(
             'inputs', 'NO_OF_TARGET_SERVERS_PER_ENV')
 
-        # Headings
-        self.qualification_report_heading(
-            env_limits_mapping["headers"], env_limits_sheet)
-
-        env_config = self.export_data.get('envConfig')
-        row = 1
-
-        for key, value in env_config.items():
-            # Org name
-            col = 0
-            env_limits_sheet.write(row, col, self.org_name)
-            # Env name
-            col += 1
-            env_limits_sheet.write(row, col, key)
-            # Target servers
-            col += 1
-            if len(value['targetServers']) > int(allowed_no_of_target_servers_per_env):  # noqa
-                env_limits_sheet.write(row, col, len(
-                    value['targetServers']), self.danger_format)
-            else:
-                env_limits_sheet.write(row, col, len(value['targetServers']))
-            # Caches
-            col += 1
-            env_limits_sheet.write(row, col, len(value['caches']))
-            # Certs
-            col += 1
-            certs = 0
-            for _, keystorecontent in value['keystores'].items():
-                certs = certs + len(keystorecontent['aliases'])
-            env_limits_sheet.write(row, col, certs)
-            # KVMs
-            col += 1
-            if len(value['kvms']) > int(allowed_no_of_kvms_per_env):
-                env_limits_sheet.write(row, col, len(
-                    value['kvms']), self.danger_format)
-            else:
-                env_limits_sheet.write(row, col, len(value['kvms']))
-
-            # encrypted kvm
-            col += 1
-            encrypted_count = 0
-            for kvm, kvm_content in value['kvms'].items():
-                if len(kvm) != 0 and kvm_content.get("encrypted"):
-                    encrypted_count = encrypted_count+1
-
-            if encrypted_count > 0:
-                env_limits_sheet.write(row, col, encrypted_count, self.danger_format)  # noqa
-            else:
-                env_limits_sheet.write(row, col, encrypted_count)
-
-            # non encrypted kvm
-            col += 1
-            env_limits_sheet.write(row, col, len(value['kvms']) - encrypted_count)  # noqa
-
-            # Virtual hosts
-            col += 1
-            env_limits_sheet.write(row, col, len(value['vhosts']))
-            # references
-            col += 1
-            env_limits_sheet.write(row, col, len(value['references']))
-            row += 1
-
-        env_limits_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(env_limits_mapping, env_limits_sheet)   # noqa pylint: disable=C0301
+        self.write_sheet(
+            'Product Limits - Env Limits', env_limits_mapping,
+            self.apply_limits(self.index['env_limits'], {
+                2: allowed_no_of_target_servers_per_env,
+                5: allowed_no_of_kvms_per_env,
+            }))
 
     def report_api_with_multiple_basepaths(self):
         """Generates the "APIs With Multiple BasePaths" report sheet."""
@@ -826,44 +926,9 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 15 - [APIs With Multiple BasePaths]
         logger.info(
             '------------------- APIs With Multiple BasePaths -----------------------')  # noqa
-        api_with_multiple_basepaths_sheet = self.workbook.add_worksheet(
-            name='APIs With Multiple BasePaths')
-
-        # Headings
-        self.qualification_report_heading(
-            api_with_multiple_basepath_mapping["headers"], api_with_multiple_basepaths_sheet)     # noqa pylint: disable=C0301
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("unifier_created"):
-                continue
-
-            base_paths = values.get('qualification', {}).get('base_paths', [])  # noqa
-            base_paths = [
-                str(path) if path is not None else 'None' for path in base_paths]  # noqa
-            col = 0
-            api_with_multiple_basepaths_sheet.write(row, col, self.org_name)
-            col += 1
-            api_with_multiple_basepaths_sheet.write(row, col, proxy)
-            col += 1
-            if len(base_paths) > 5:
-                api_with_multiple_basepaths_sheet.write(
-                    row, col, '\n'.join(base_paths), self.danger_format)
-            elif len(base_paths) > 1:
-                api_with_multiple_basepaths_sheet.write(
-                    row, col, '\n'.join(base_paths), self.yellow_format)
-            elif len(base_paths) == 1:
-                api_with_multiple_basepaths_sheet.write(
-                    row, col, '\n'.join(base_paths))
-
-            row += 1
-
-        api_with_multiple_basepaths_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            api_with_multiple_basepath_mapping, api_with_multiple_basepaths_sheet)  # noqa
+        self.write_sheet('APIs With Multiple BasePaths',
+                         api_with_multiple_basepath_mapping,
+                         self.index['api_with_multiple_basepaths'])
 
     def sharding(self):
         """Generates the "Target Environments" report sheet (Sharding info)."""
@@ -871,183 +936,37 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 11 - [Sharded envs]
         logger.info(
             '------------------- Sharded Env Info -----------------------')  # noqa
-        sharding_output_sheet = self.workbook.add_worksheet(
-            name='Target Environments')
-
-        # Headings
-        self.qualification_report_heading(
-            sharding_output["headers"], sharding_output_sheet)
-
-        sharding_env_output = self.export_data.get('sharding_output')
-        row = 1
-
-        for env, sharded_envs in sharding_env_output.items():
-            for sharded_env, content in sharded_envs.items():
-                col = 0
-                sharding_output_sheet.write(row, col, self.org_name)
-                col += 1
-                sharding_output_sheet.write(row, col, env)
-                col += 1
-                sharding_output_sheet.write(row, col, sharded_env)
-                col += 1
-                proxies_list = content.get("proxyname", [])
-                sharding_output_sheet.write(row, col, '\n'.join(proxies_list))
-                col += 1
-                shared_flows_list = content.get("shared_flow", [])
-                sharding_output_sheet.write(row, col, '\n'.join(shared_flows_list))   # noqa pylint: disable=C0301
-                col += 1
-                sharding_output_sheet.write(row, col, len(proxies_list))
-                col += 1
-                sharding_output_sheet.write(row, col, len(shared_flows_list))
-                col += 1
-                sharding_output_sheet.write(row, col, len(
-                    proxies_list) + len(shared_flows_list))
-                row += 1
-
-        sharding_output_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(sharding_output, sharding_output_sheet)   # noqa pylint: disable=C0301
+        self.write_sheet('Target Environments', sharding_output,
+                         self.index['sharding_output'])
 
     def report_alias_keycert(self):
         """Generates the "Aliases with private keys" report sheet."""
         logger.info(
             '------------------- Aliases with private keys -----------------------')  # noqa
-        aliases_with_private_keys_sheet = self.workbook.add_worksheet(
-            name='Aliases with private keys')
-
-        # Headings
-        self.qualification_report_heading(
-            aliases_with_private_keys["headers"], aliases_with_private_keys_sheet)   # noqa pylint: disable=C0301
-
-        row = 1
-        for env, content in self.export_data['envConfig'].items():  # noqa
-            for keystore, keystore_content in content.get('keystores').items():  # noqa
-                if keystore_content.get('alias_data'):
-                    for alias, alias_content in keystore_content.get('alias_data').items():  # noqa
-                        col = 0
-                        aliases_with_private_keys_sheet.write(row, col, self.org_name)   # noqa pylint: disable=C0301
-                        col += 1
-                        aliases_with_private_keys_sheet.write(row, col, env)
-                        col += 1
-                        aliases_with_private_keys_sheet.write(row, col, keystore)   # noqa pylint: disable=C0301
-                        col += 1
-                        aliases_with_private_keys_sheet.write(row, col, alias)
-                        col += 1
-                        if alias_content.get('keyName'):
-                            aliases_with_private_keys_sheet.write(
-                                row, col, alias_content.get('keyName'), self.danger_format)  # noqa
-                        row += 1
-        aliases_with_private_keys_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            aliases_with_private_keys, aliases_with_private_keys_sheet)
+        self.write_sheet('Aliases with private keys',
+                         aliases_with_private_keys,
+                         self.index['aliases_with_private_keys'])
 
     def sharded_proxies(self):
         """Generates the "Sharded Proxies" report sheet."""
         logger.info(
             '------------------- Sharded Proxies -----------------------')
-        sharded_proxies_sheet = self.workbook.add_worksheet(name='Sharded Proxies')  # noqa
-
-        # Headings
-        self.qualification_report_heading(
-            sharded_proxies["headers"], sharded_proxies_sheet)
-
-        row = 1
-
-        proxy_map = self.export_data['proxy_dependency_map']
-        for proxy, values in proxy_map.items():
-            if values.get("is_split"):
-                sharded_proxies_list = values.get("split_output_names")
-                col = 0
-                sharded_proxies_sheet.write(row, col, self.org_name)
-                col += 1
-                sharded_proxies_sheet.write(row, col, proxy)
-                col += 1
-                sharded_proxies_sheet.write(row, col, '\n'.join(sharded_proxies_list))  # noqa
-                row += 1
-
-        sharded_proxies_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(sharded_proxies, sharded_proxies_sheet)   # noqa pylint: disable=C0301
+        self.write_sheet('Sharded Proxies', sharded_proxies,
+                         self.index['sharded_proxies'])
 
     def validation_report(self):
         """Generates the "Validation Report" sheet."""
         logger.info('------------------- Validation Report -----------------------')  # noqa
-
-        validation_report_sheet = self.workbook.add_worksheet(name='Validation Report')  # noqa
-        self.qualification_report_heading(validation_report["headers"], validation_report_sheet)   # noqa pylint: disable=C0301
-
-        row = 1
-        for key, value in self.export_data['validation_report'].items():
-            # col = 0
-            if key == "report":
-                continue
-            # validation_report_sheet.write(row, col, key)
-
-            for values in value:
-                col = 0
-                validation_report_sheet.write(row, col, key)
-                col += 1
-                validation_report_sheet.write(row, col, values['name'])
-                col += 1
-                if values['importable']:
-                    violations = [{'violations': []}] if len(values.get('reason',[])) == 0 else values.get('reason',[])   # noqa pylint: disable=C0301
-                    if len(violations[0].get('violations', [])) == 0:
-                        validation_report_sheet.write(row, col, values['importable'], self.green_format)   # noqa pylint: disable=C0301
-                        col += 1
-                        validation_report_sheet.write(row, col, 'N/A')
-                    else:
-                        validation_report_sheet.write(row, col, values['importable'], self.yellow_format)   # noqa pylint: disable=C0301
-                        col += 1
-                        reason_str = violations[0].get('violations', [])
-                        validation_report_sheet.write(row, col, json.dumps(reason_str, indent=2))  # noqa pylint: disable=C0301
-                if not values['importable']:
-                    validation_report_sheet.write(row, col, values['importable'], self.danger_format)   # noqa pylint: disable=C0301
-                    col += 1
-                    reason_str = {}
-                    violations = values.get('reason', [{'violations': []}])
-                    if len(violations[0].get('violations', [])) == 0:
-                        error_code = values.get('error', {}).get('code', 0)
-                        message = values.get('error', {}).get('message', '')
-                        reason_str = {'violations': [
-                            {'description': f"code: {error_code}. error_message: {message}"} # noqa
-                        ]}
-                    else:
-                        reason_str = violations[0].get('violations', [])
-                    validation_report_sheet.write(row, col, json.dumps(reason_str, indent=2))   # noqa pylint: disable=C0301
-                col += 1
-                if 'imported' in values:
-                    validation_report_sheet.write(row, col, values['imported'])   # noqa pylint: disable=C0301
-                else:
-                    validation_report_sheet.write(row, col, 'UNKNOWN')
-                row += 1
-        validation_report_sheet.autofit()
+        self.write_sheet('Validation Report', validation_report,
+                         self.index['validation_report'], info_box=False)
 
     def report_org_resourcefiles(self):
         """Generates the "Org Level Resourcefiles" report sheet."""
 
         logger.info(
             '------------------- Org level Resourcefiles -----------------------')  # noqa
-        org_resourcefiles_sheet = self.workbook.add_worksheet(
-            name='Org Level Resourcefiles')
-
-        # Headings
-        self.qualification_report_heading(
-            org_resourcefiles["headers"], org_resourcefiles_sheet)
-
-        row = 1
-
-        for key in self.export_data['orgConfig']["resourcefiles"]:  # noqa
-            col = 0
-            org_resourcefiles_sheet.write(row, col, self.org_name)
-            col += 1
-            org_resourcefiles_sheet.write(row, col, key)
-
-            row += 1
-        org_resourcefiles_sheet.autofit()
-        # Info block
-        self.qualification_report_info_box(
-            org_resourcefiles, org_resourcefiles_sheet)
+        self.write_sheet('Org Level Resourcefiles', org_resourcefiles,
+                         self.index['org_resourcefiles'])
 
     def report_network_topology(self):
         """Generates the "Apigee (4G) components" report sheet (Topology)."""
@@ -1055,38 +974,9 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
         # Worksheet 16 - [Apigee OPDK/Edge (4G) components]
         logger.info(
             '------------------- Apigee OPDK/Edge (4G) components -----------------------')  # noqa
-        topology_installation_sheet = self.workbook.add_worksheet(
-            name='Apigee (4G) components')
-
-        # Headings
-        self.qualification_report_heading(
-            topology_installation_mapping["headers"], topology_installation_sheet)  # noqa
-
-        row = 1
-
-        if len(self.topology_mapping) != 0:
-            for dc in self.topology_mapping['data_center_mapping']:
-
-                for pod in self.topology_mapping['data_center_mapping'][dc]:
-
-                    for pod_instance in self.topology_mapping['data_center_mapping'][dc][pod]:   # noqa pylint: disable=C0301
-                        col = 0
-                        topology_installation_sheet.write(row, col, dc)
-                        col += 1
-                        topology_installation_sheet.write(row, col, pod)
-                        col += 1
-
-                        topology_installation_sheet.write(
-                            row, col, '\n'.join(pod_instance['type']))
-                        col += 1
-
-                        for col_key_map in topology_installation_mapping["key_mapping"]:   # noqa pylint: disable=C0301
-                            topology_installation_sheet.write(
-                                row, col, pod_instance[col_key_map])
-                            col += 1
-
-                        row += 1
-        topology_installation_sheet.autofit()
+        self.write_sheet('Apigee (4G) components',
+                         topology_installation_mapping,
+                         self.index['topology_installation'], info_box=False)
 
     def qualification_report_summary(self):
         """Generates the "Qualification Summary" sheet."""
@@ -1154,10 +1044,6 @@ class QualificationReport():  # noqa pylint: disable=R0902,R0904
                     f'A{row}:B{row}', note["text"], self.summary_note_green_format)  # noqa
             row = row+1
 
-    def reverse_sheets(self):
-        """Reverses the order of worksheets in the workbook."""
-        self.workbook.worksheets().reverse()
-
     def close(self):
         """Closes the Excel workbook."""
         # Close the workbook
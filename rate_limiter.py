@@ -0,0 +1,69 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Client side rate limiting for Apigee management API calls.
+
+This module provides a thread-safe token bucket used to keep
+concurrent callers within the request quotas of the Apigee
+management API (apigee.googleapis.com).
+"""
+
+import threading
+import time
+
+
+class TokenBucket():  # noqa pylint: disable=R0903
+    """A thread-safe token bucket rate limiter.
+
+    Tokens are refilled continuously at `rate` tokens per second,
+    up to `capacity` tokens. Each call to `acquire` consumes one
+    token, blocking until a token is available.
+    """
+
+    def __init__(self, rate, capacity=1):
+        """Initializes TokenBucket.
+
+        Args:
+            rate (float): Tokens added per second.
+            capacity (int): Maximum number of tokens, i.e. the
+                largest burst allowed.
+        """
+        if rate <= 0:
+            raise ValueError("rate must be greater than 0")
+        self.rate = float(rate)
+        self.capacity = max(1, int(capacity))
+        self.tokens = float(self.capacity)
+        self.updated_at = time.monotonic()
+        self.lock = threading.Lock()
+
+    def _refill(self):
+        """Adds the tokens accumulated since the last refill."""
+        now = time.monotonic()
+        self.tokens = min(
+            self.capacity,
+            self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def acquire(self):
+        """Consumes a token, waiting until one is available."""
+        while True:
+            with self.lock:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
@@ -0,0 +1,116 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Tracks the inputs of the qualification report files between runs.
+
+This module records a fingerprint of the inputs of each report file
+written, so that files whose rows, settings and report code did not
+change since the previous assessment are not written again.
+"""
+
+import functools
+import hashlib
+import inspect
+import json
+import os
+import qualification_report
+from qualification_report_mapping import header_mapping, report_summary
+from base_logger import logger
+from utils import parse_json, write_json
+
+
+@functools.lru_cache(maxsize=None)
+def report_code_digest():
+    """Hashes the source code generating the report.
+
+    Returns:
+        str: The sha256 of the report and mapping modules.
+    """
+    digest = hashlib.sha256()
+    for module in (qualification_report, header_mapping, report_summary):
+        digest.update(inspect.getsource(module).encode())
+    return digest.hexdigest()
+
+
+class ReportFingerprints():
+    """The fingerprints of the report files written by previous runs.
+
+    Fingerprints are keyed by the path of the report file, and a file
+    is current when it still exists and its inputs have the same
+    fingerprint as when it was written.
+    """
+
+    def __init__(self, fingerprint_file):
+        """Initializes ReportFingerprints.
+
+        Args:
+            fingerprint_file (str): Path of the JSON fingerprint file.
+        """
+        self.fingerprint_file = fingerprint_file
+        self.fingerprints = {}
+        self.skipped = 0
+        if os.path.exists(fingerprint_file):
+            self.fingerprints = parse_json(
+                fingerprint_file).get('fingerprints', {})
+
+    @staticmethod
+    def fingerprint(*inputs):
+        """Fingerprints the inputs of a report file.
+
+        The fingerprint also covers the report code, so every file is
+        written again after the report code changes.
+
+        Args:
+            *inputs: JSON serializable inputs, such as sheet rows and
+                     report settings.
+
+        Returns:
+            str: The sha256 of the inputs.
+        """
+        digest = hashlib.sha256(report_code_digest().encode())
+        digest.update(json.dumps(
+            inputs, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def is_current(self, path, fingerprint):
+        """Checks if a report file is up to date with its inputs.
+
+        Args:
+            path (str): Path of the report file.
+            fingerprint (str): The fingerprint of its inputs.
+
+        Returns:
+            bool: True if the file need not be written again.
+        """
+        current = (self.fingerprints.get(path) == fingerprint
+                   and os.path.exists(path))
+        if current:
+            self.skipped += 1
+        return current
+
+    def update(self, path, fingerprint):
+        """Records the fingerprint of a report file just written.
+
+        Args:
+            path (str): Path of the report file.
+            fingerprint (str): The fingerprint of its inputs.
+        """
+        self.fingerprints[path] = fingerprint
+
+    def save(self):
+        """Writes the fingerprint file."""
+        logger.info(f"Report files up to date: {self.skipped}")  # noqa pylint: disable=W1203
+        write_json(self.fingerprint_file, {'fingerprints': self.fingerprints})
@@ -29,9 +29,13 @@ Pythonic interface.
 """
 
 import json
+import logging
+import time
 import requests  # pylint: disable=E0401
 from urllib3.exceptions import InsecureRequestWarning  # pylint: disable=E0401
 from base_logger import logger, EXEC_INFO
+from http_metrics import body_size, http_metrics
+from instrumentation import metrics
 
 # Suppress the warnings from urllib3
 requests.packages.urllib3.disable_warnings(category=InsecureRequestWarning)   # noqa pylint: disable=E1101
@@ -118,8 +122,8 @@ class RestClient(object):  # noqa pylint: disable=R0205
                 an error.
         """
         headers = self.base_headers.copy()
-        response = self.session.get(url, params=params, headers=headers)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send('GET', self.session.get, url,
+                              params=params, headers=headers)
         return self._process_response(response)
 
     def file_get(self, url, params=None):
@@ -136,9 +140,9 @@ class RestClient(object):  # noqa pylint: disable=R0205
             ApigeeError: If an error occurs.
         """
         headers = self.base_headers.copy()
-        response = self.session.get(
-            url, params=params, headers=headers, stream=True)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send(
+            'GET', self.session.get, url,
+            params=params, headers=headers, stream=True)
         return self._process_response(response)
 
     def post(self, url, data=None):
@@ -155,9 +159,9 @@ class RestClient(object):  # noqa pylint: disable=R0205
             ApigeeError: If an error occurs.
         """
         headers = self.base_headers.copy()
-        response = self.session.post(
-            url, data=json.dumps(data or {}), headers=headers)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send(
+            'POST', self.session.post, url,
+            data=json.dumps(data or {}), headers=headers)
         return self._process_response(response)
 
     def file_post(self, url, params=None, data=None, files=None):
@@ -178,9 +182,9 @@ class RestClient(object):  # noqa pylint: disable=R0205
         """
         headers = self.base_headers.copy()
         headers['Content-Type'] = 'application/octet-stream'
-        response = self.session.post(
-            url, data=data, files=files, headers=headers, params=params)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send(
+            'POST', self.session.post, url,
+            data=data, files=files, headers=headers, params=params)
         return self._process_response(response)
 
     def patch(self, url, data=None):
@@ -197,9 +201,9 @@ class RestClient(object):  # noqa pylint: disable=R0205
             ApigeeError:  If an error occurs.
         """
         headers = self.base_headers.copy()
-        response = self.session.patch(
-            url, data=json.dumps(data or {}), headers=headers)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send(
+            'PATCH', self.session.patch, url,
+            data=json.dumps(data or {}), headers=headers)
         return self._process_response(response)
 
     def put(self, url, data=None):
@@ -216,9 +220,9 @@ class RestClient(object):  # noqa pylint: disable=R0205
             ApigeeError: If an error occurs.
         """
         headers = self.base_headers.copy()
-        response = self.session.put(
-            url, data=json.dumps(data or {}), headers=headers)
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send(
+            'PUT', self.session.put, url,
+            data=json.dumps(data or {}), headers=headers)
         return self._process_response(response)
 
     def delete(self, url, params=None):
@@ -235,10 +239,42 @@ class RestClient(object):  # noqa pylint: disable=R0205
             ApigeeError: If an error occurs.
         """
         headers = self.base_headers.copy()
-        response = self.session.delete(url, headers=headers, params=params or {})     # noqa pylint: disable=C0301
-        logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        response = self._send('DELETE', self.session.delete, url, headers=headers, params=params or {})     # noqa pylint: disable=C0301
         return self._process_response(response)
 
+    def _send(self, method, send, url, **kwargs):
+        """Sends a request, records its metrics and logs its response
+        at DEBUG level.
+
+        Args:
+            method (str): The HTTP method.
+            send: The session function sending the request.
+            url (str): The URL.
+            **kwargs: The arguments of the session function.
+
+        Returns:
+            The HTTP response object.
+        """
+        started = time.perf_counter()
+        try:
+            response = send(url, **kwargs)
+        except requests.exceptions.RequestException:
+            http_metrics.observe(method, url, "error",
+                                 time.perf_counter() - started)
+            metrics.record(f"rest.{method}", time.perf_counter() - started,
+                           errors=1)
+            raise
+        seconds = time.perf_counter() - started
+        bytes_in = len(response.content or b"")
+        http_metrics.observe(
+            method, url, response.status_code, seconds, bytes_in,
+            body_size(getattr(response.request, "body", None)))
+        metrics.record(f"rest.{method}", seconds, bytes_in,
+                       int(response.status_code >= 400))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Response: {response.content}")  # noqa pylint: disable=W1203
+        return response
+
     def _process_response(self, response):
         """Processes the response from an HTTP request.
 
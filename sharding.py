@@ -111,24 +111,22 @@ def unzip_all_bundles(input_cfg):
     if not os.path.isdir(unzip_dir_name):
         os.makedirs(unzip_dir_name)  # create unzip directory
 
-    # change directory from working dir to dir with files
-    os.chdir('./'+target_dir+'/'+export_dir_name+'/apis')
-    for item in os.listdir('./'):  # loop through items in dir
+    # Paths are absolute instead of changing the working directory,
+    # which is shared by the stages running at the same time.
+    apis_dir = current_dir+'/'+target_dir+'/'+export_dir_name+'/apis'
+    for item in os.listdir(apis_dir):  # loop through items in dir
 
         if item.endswith(extension):  # check for ".zip" extension
 
-            file_name = os.path.abspath(item)  # get full path of files
+            file_name = os.path.join(apis_dir, item)  # get full path of files
 
-            zip_ref = zipfile.ZipFile(file_name)  # create zipfile object  # noqa pylint: disable=R1732
+            with zipfile.ZipFile(file_name) as zip_ref:
+                # extract file to dir
+                zip_ref.extractall(path=os.path.join(
+                    unzip_dir_name, item[:-4]))
 
-            # extract file to dir
-            zip_ref.extractall(f"../{source_unzipped_apis}/{item[:-4]}/")
-            zip_ref.close()  # close file
 
-    os.chdir(current_dir)  # revert to current directory
-
-
-def proxy_dependency_map(cfg, export_data):  # noqa pylint: disable=R0914
+def proxy_dependency_map(cfg, export_data, unzip=True):  # noqa pylint: disable=R0914
     """Creates a proxy dependency map.
 
     This function generates a map indicating \
@@ -141,13 +139,16 @@ def proxy_dependency_map(cfg, export_data):  # noqa pylint: disable=R0914
         input configuration.
         exportData (dict): The exported Apigee \
         data.
+        unzip (bool): Whether to unzip the \
+        exported bundles first.
 
     Returns:
         dict: A dictionary representing the \
         proxy dependency map.
     """
 
-    unzip_all_bundles(cfg)
+    if unzip:
+        unzip_all_bundles(cfg)
 
     input_cfg = utils.parse_config('input.properties')
     backend_cfg = utils.parse_config('backend.properties')
@@ -212,19 +213,17 @@ def proxy_dependency_map_parallel(arg_tuple):  # noqa pylint: disable=R0914
         input_cfg = utils.parse_config('input.properties')
         export_dir_name = cfg.get('export', 'EXPORT_DIR')
         target_dir = input_cfg.get('inputs', 'TARGET_DIR')
-        unifier_output_dir = cfg.get('unifier', 'unifier_output_dir')
+        unifier_zipped_bundles = cfg.get('unifier', 'unifier_zipped_bundles')
 
         if len(each_proxy_rel.keys()) > proxy_endpoint_cnt:
 
             proxy_split_result = unifier.proxy_unifier(each_dir)
             proxy_dependency_map_data[each_dir]["is_split"] = True
             proxy_dependency_map_data[each_dir]["split_output_names"] = []
-            for dir_name in proxy_split_result:
+            for dir_name, split_info in proxy_split_result.items():
                 proxy_dependency_map_data[dir_name] = {}
-                proxy_dict = utils.read_proxy_artifacts(
-                    f"./{target_dir}/{export_dir_name}/{unifier_output_dir}/{dir_name}/apiproxy",  # noqa pylint: disable=C0301
-                    utils.parse_proxy_root_sharding(
-                        f"./{target_dir}/{export_dir_name}/{unifier_output_dir}/{dir_name}/apiproxy")  # noqa pylint: disable=C0301
+                proxy_dict = utils.read_proxy_bundle(
+                    f"./{target_dir}/{export_dir_name}/{unifier_zipped_bundles}/{split_info['Name']}.zip"  # noqa pylint: disable=C0301
                 )
 
                 proxy_rel = utils.get_proxy_objects_relationships(proxy_dict)
@@ -2,6 +2,8 @@
 """
 Tests for the base_logger module.
 """
+import io
+import json
 import unittest
 import logging
 import os
@@ -9,7 +11,7 @@ from unittest.mock import patch
 import importlib
 import base_logger
 
-from base_logger import CustomFormatter, logger
+from base_logger import CustomFormatter, JsonFormatter, logger
 
 
 class TestBaseLogger(unittest.TestCase):
@@ -53,8 +55,9 @@ class TestBaseLogger(unittest.TestCase):
                                      'LOGLEVEL': 'DEBUG'}):
             importlib.reload(base_logger)
             self.assertEqual(len(logger.handlers), 1)
-            self.assertIsInstance(logger.handlers[0],
-                                  type(mock_stream_handler.return_value))
+            self.assertIs(logger.handlers[0], base_logger.queue_handler)
+            self.assertEqual(base_logger.listener.handlers,
+                             (mock_stream_handler.return_value,))
             self.assertEqual(logger.level, logging.DEBUG)
 
     @patch('base_logger.logging.FileHandler')
@@ -68,11 +71,117 @@ class TestBaseLogger(unittest.TestCase):
                                      'LOGLEVEL': 'INFO'}):
             importlib.reload(base_logger)
             self.assertEqual(len(logger.handlers), 1)
-            self.assertIsInstance(logger.handlers[0],
-                                  type(mock_file_handler.return_value))
+            self.assertEqual(base_logger.listener.handlers,
+                             (mock_file_handler.return_value,))
             self.assertEqual(logger.level, logging.INFO)
             mock_file_handler.assert_called_with('test.log', mode='a')
 
+    @patch('base_logger.logging.StreamHandler')
+    def test_logger_sync(self, mock_stream_handler):
+        """
+        Test that records are written directly when LOG_ASYNC is false.
+        """
+        mock_stream_handler.return_value.level = logging.INFO
+        with patch.dict(os.environ, {'LOG_HANDLER': 'Stream',
+                                     'LOG_ASYNC': 'false'}):
+            importlib.reload(base_logger)
+            self.assertEqual(logger.handlers,
+                             [mock_stream_handler.return_value])
+            self.assertIsNone(base_logger.listener)
+
+    def test_async_logging(self):
+        """
+        Test that queued records are formatted and written by the
+        listener, with their arguments merged when logged.
+        """
+        with patch.dict(os.environ, {'LOG_HANDLER': 'Stream',
+                                     'LOGLEVEL': 'INFO'}):
+            importlib.reload(base_logger)
+        stream = io.StringIO()
+        base_logger.ch.setStream(stream)
+        values = ['first']
+        logger.info('Exported %s', values)
+        logger.debug('Not written')
+        values.append('second')
+        base_logger.stop_logging()
+        output = stream.getvalue()
+        self.assertIn("INFO - Exported ['first']", output)
+        self.assertNotIn('Not written', output)
+
+    def test_cached_formatters(self):
+        """
+        Test that the formatter of each level is only built once.
+        """
+        formatter = CustomFormatter()
+        with patch('base_logger.logging.Formatter') as mock_formatter:
+            for level in (logging.INFO, logging.ERROR, logging.INFO):
+                formatter.format(logging.LogRecord(
+                    'test', level, 'test.py', 10, 'message', (), None))
+        mock_formatter.assert_not_called()
+
+    def test_json_formatter(self):
+        """
+        Test that records are formatted as JSON lines with their
+        context and extra fields.
+        """
+        record = logging.LogRecord(
+            'test', logging.INFO, 'test.py', 10, 'Exporting %s',
+            ('apis',), None)
+        record.run_id = 'run'
+        record.stage = 'export'
+        record.object_name = 'orders'
+        formatted_message = JsonFormatter().format(record)
+        self.assertNotIn('\n', formatted_message)
+        entry = json.loads(formatted_message)
+        self.assertEqual(entry['message'], 'Exporting apis')
+        self.assertEqual(entry['level'], 'INFO')
+        self.assertEqual(entry['run_id'], 'run')
+        self.assertEqual(entry['stage'], 'export')
+        self.assertEqual(entry['pid'], os.getpid())
+        self.assertEqual(entry['file'], 'test.py:10')
+        self.assertEqual(entry['object_name'], 'orders')
+        self.assertNotIn('exc', entry)
+
+    def test_json_logging(self):
+        """
+        Test that queued JSON records keep the stage they were
+        logged in.
+        """
+        with patch.dict(os.environ, {'LOG_HANDLER': 'Stream',
+                                     'LOG_FORMAT': 'json',
+                                     'LOG_RUN_ID': 'run',
+                                     'LOGLEVEL': 'INFO'}):
+            importlib.reload(base_logger)
+            stream = io.StringIO()
+            base_logger.ch.setStream(stream)
+            previous = base_logger.set_log_stage('export')
+            logger.info('Exporting', extra={'object_name': 'orders'})
+            base_logger.set_log_stage(previous)
+            try:
+                raise ValueError('failed')
+            except ValueError:
+                logger.exception('Failed')
+            base_logger.stop_logging()
+        entries = [json.loads(line)
+                   for line in stream.getvalue().splitlines()]
+        self.assertEqual(len(entries), 2)
+        self.assertEqual(entries[0]['run_id'], 'run')
+        self.assertEqual(entries[0]['stage'], 'export')
+        self.assertEqual(entries[0]['object_name'], 'orders')
+        self.assertIsNone(entries[1]['stage'])
+        self.assertIn('ValueError: failed', entries[1]['exc'])
+
+    def test_stage_inherited(self):
+        """
+        Test that the stage is passed to spawned processes through
+        the environment.
+        """
+        with patch.dict(os.environ, {}):
+            previous = base_logger.set_log_stage('validate')
+            self.assertEqual(os.environ['LOG_STAGE'], 'validate')
+            base_logger.set_log_stage(previous)
+            self.assertEqual(os.environ.get('LOG_STAGE'), previous)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,109 @@
+"""
+Tests for the benchmark module.
+"""
+import os
+import tempfile
+import unittest
+
+from benchmark import (
+    DEFAULT_THRESHOLDS,
+    compare_to_baseline,
+    format_results,
+    measure_startup,
+    run_benchmark,
+)
+from mock_apigee import SyntheticOrg
+
+
+def stage_metrics(wall=1.0, cpu=1.0, rss=100.0, requests=10):
+    """Returns the metrics of a successful stage."""
+    return {"wall_seconds": wall, "cpu_seconds": cpu,
+            "peak_rss_mb": rss, "requests": requests, "error": None}
+
+
+class TestBenchmark(unittest.TestCase):
+    """
+    Test cases for the benchmark module.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.baseline = {
+            "settings": {"proxies": 10},
+            "stages": {"export": stage_metrics(),
+                       "report": stage_metrics(wall=0.1, cpu=0.1)},
+        }
+
+    def test_no_regression(self):
+        """
+        Test that changes within the thresholds are not regressions.
+        """
+        results = {
+            "settings": {"proxies": 10},
+            "stages": {"export": stage_metrics(wall=1.2, rss=110.0),
+                       "report": stage_metrics(wall=0.3, cpu=0.1)},
+        }
+        self.assertEqual(compare_to_baseline(
+            results, self.baseline, DEFAULT_THRESHOLDS), [])
+
+    def test_regressions(self):
+        """
+        Test that slower stages, extra requests and failures regress.
+        """
+        results = {
+            "settings": {"proxies": 10},
+            "stages": {"export": stage_metrics(cpu=1.5, requests=11),
+                       "report": {"error": "Traceback"}},
+        }
+        regressions = compare_to_baseline(
+            results, self.baseline, DEFAULT_THRESHOLDS)
+        self.assertEqual(len(regressions), 3)
+        self.assertTrue(regressions[0].startswith("export: cpu_seconds"))
+        self.assertTrue(regressions[1].startswith("export: requests"))
+        self.assertEqual(regressions[2], "report: failed")
+
+    def test_settings_mismatch(self):
+        """
+        Test that results of other settings are not compared.
+        """
+        results = {"settings": {"proxies": 20},
+                   "stages": {"export": stage_metrics()}}
+        regressions = compare_to_baseline(
+            results, self.baseline, DEFAULT_THRESHOLDS)
+        self.assertEqual(len(regressions), 1)
+        self.assertIn("differ from the baseline", regressions[0])
+
+    def test_run_benchmark(self):
+        """
+        Test that the first stages run against the mock organization.
+        """
+        org = SyntheticOrg(proxies=3, sharedflows=1, developers=2, apps=2)
+        with tempfile.TemporaryDirectory() as workdir:
+            results = run_benchmark(
+                workdir, org, ["export", "unzip", "dependency_map"])
+        self.assertEqual(list(results),
+                         ["export", "unzip", "dependency_map"])
+        for metrics in results.values():
+            self.assertIsNone(metrics["error"])
+            self.assertGreater(metrics["peak_rss_mb"], 0)
+        self.assertGreater(results["export"]["requests"], 0)
+        self.assertEqual(results["unzip"]["requests"], 0)
+        self.assertIn("dependency_map", format_results({"stages": results}))
+
+    def test_measure_startup(self):
+        """
+        Test that the import time of main.py is measured.
+        """
+        startup = measure_startup(os.getcwd(), top=3)
+        self.assertIsNone(startup["error"])
+        self.assertGreater(startup["wall_seconds"], 0)
+        self.assertEqual(len(startup["imports"]), 3)
+        self.assertIn("main", startup["imports"])
+        self.assertIn("slowest imports: ",
+                      format_results({"stages": {"startup": startup}}))
+
+
+if __name__ == '__main__':
+    unittest.main()
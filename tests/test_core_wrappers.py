@@ -2,6 +2,8 @@
 """
 Tests for the core_wrappers module.
 """
+import os
+import tempfile
 import unittest
 from unittest.mock import patch
 from configparser import ConfigParser
@@ -9,6 +11,8 @@ from configparser import ConfigParser
 from core_wrappers import (
     pre_validation_checks,
     export_artifacts,
+    map_proxy_dependencies,
+    shard_environments,
     validate_artifacts,
     visualize_artifacts,
     qualification_report,
@@ -73,19 +77,46 @@ class TestCoreWrappers(unittest.TestCase):
         mock_get_source_auth_token.return_value = 'source_token'
         mock_exporter.return_value.get_export_data.return_value = {
             'orgConfig': {}, 'envConfig': {}}
-        mock_sharding.proxy_dependency_map.return_value = {}
         result = export_artifacts(self.cfg, ['all'])
-        self.assertIn('proxy_dependency_map', result)
+        self.assertEqual(result, {'orgConfig': {}, 'envConfig': {}})
+        mock_sharding.proxy_dependency_map.assert_not_called()
+
+    @patch('core_wrappers.sharding')
+    def test_map_proxy_dependencies(self, mock_sharding):
+        """
+        Test the map_proxy_dependencies function.
+        """
+        export_data = {'orgConfig': {'apis': {}}, 'envConfig': {}}
+        mock_sharding.proxy_dependency_map.return_value = {'api': {}}
+        self.assertEqual(map_proxy_dependencies(self.cfg, export_data),
+                         {'api': {}})
+        mock_sharding.proxy_dependency_map.assert_called_with(
+            self.cfg, export_data)
+
+    @patch('core_wrappers.sharding')
+    def test_shard_environments(self, mock_sharding):
+        """
+        Test the shard_environments function.
+        """
+        export_data = {'orgConfig': {}, 'envConfig': {'dev': {}}}
+        mock_sharding.sharding_wrapper.return_value = {'dev': {}}
+        self.assertEqual(shard_environments({'api': {}}, export_data),
+                         {'dev': {}})
+        mock_sharding.sharding_wrapper.assert_called_with(
+            {'api': {}}, export_data)
 
     @patch('core_wrappers.parse_config')
     @patch('core_wrappers.create_dir')
     @patch('core_wrappers.get_access_token')
     @patch('core_wrappers.parse_json')
     @patch('core_wrappers.ApigeeValidator')
+    @patch('core_wrappers.ValidationCache')
+    @patch('core_wrappers.PreValidator')
     # noqa pylint: disable=too-many-arguments, unused-argument, too-many-positional-arguments
-    def test_validate_artifacts(self, mock_validator, mock_parse_json,
-                                mock_get_access_token, mock_create_dir,
-                                mock_parse_config):
+    def test_validate_artifacts(self, mock_pre_validator,
+                                mock_validation_cache, mock_validator,
+                                mock_parse_json, mock_get_access_token,
+                                mock_create_dir, mock_parse_config):
         """
         Test the validate_artifacts function.
         """
@@ -106,8 +137,66 @@ class TestCoreWrappers(unittest.TestCase):
         self.assertIsInstance(result, dict)
 
     @patch('core_wrappers.parse_config')
-    @patch('core_wrappers.nx.DiGraph')
-    @patch('core_wrappers.Network')
+    @patch('core_wrappers.create_dir')
+    @patch('core_wrappers.get_access_token')
+    @patch('core_wrappers.parse_json')
+    @patch('core_wrappers.write_json')
+    @patch('core_wrappers.ApigeeExporter')
+    @patch('core_wrappers.ApigeeValidator')
+    @patch('core_wrappers.ValidationCache')
+    @patch('core_wrappers.PreValidator')
+    # noqa pylint: disable=too-many-arguments, unused-argument, too-many-positional-arguments
+    def test_validate_artifacts_target_compare(
+            self, mock_pre_validator, mock_validation_cache, mock_validator,
+            mock_exporter, mock_write_json, mock_parse_json,
+            mock_get_access_token, mock_create_dir, mock_parse_config):
+        """
+        Test that the target export is handed to the validator as a Future.
+        """
+        self.cfg.set('inputs', 'TARGET_COMPARE', 'True')
+        mock_parse_config.return_value.get.return_value = 'export'
+        mock_parse_json.return_value = {}
+        mock_exporter.return_value.get_export_data.return_value = {}
+        export_data = {'envConfig': {}, 'orgConfig': {}}
+        validate_artifacts(self.cfg, ['apis'], export_data)
+        target_export = mock_validator.call_args[0][4]
+        self.assertEqual(target_export.result(), {'export': True})
+        mock_write_json.assert_called_once_with(
+            '/tmp/target/export_data.json', {'export': True})
+        mock_validator.return_value.validate_proxy_bundles.assert_called_once()
+
+    @patch('core_wrappers.parse_config')
+    @patch('core_wrappers.create_dir')
+    @patch('core_wrappers.get_access_token')
+    @patch('core_wrappers.parse_json')
+    @patch('core_wrappers.write_json')
+    @patch('core_wrappers.ApigeeExporter')
+    @patch('core_wrappers.ApigeeValidator')
+    @patch('core_wrappers.ValidationCache')
+    @patch('core_wrappers.PreValidator')
+    @patch('core_wrappers.concurrent.futures.ThreadPoolExecutor')
+    # noqa pylint: disable=too-many-arguments, unused-argument, too-many-positional-arguments
+    def test_validate_artifacts_target_compare_failure(
+            self, mock_executor, mock_pre_validator, mock_validation_cache,
+            mock_validator, mock_exporter,
+            mock_write_json, mock_parse_json, mock_get_access_token,
+            mock_create_dir, mock_parse_config):
+        """
+        Test that the target export is shut down when validation fails.
+        """
+        self.cfg.set('inputs', 'TARGET_COMPARE', 'True')
+        mock_parse_config.return_value.get.return_value = 'export'
+        mock_parse_json.return_value = {}
+        (mock_validator.return_value.
+         validate_proxy_bundles.side_effect) = ValueError('failed')
+        export_data = {'envConfig': {}, 'orgConfig': {}}
+        with self.assertRaises(ValueError):
+            validate_artifacts(self.cfg, ['apis'], export_data)
+        mock_executor.return_value.shutdown.assert_called_once()
+
+    @patch('core_wrappers.parse_config')
+    @patch('networkx.DiGraph')
+    @patch('pyvis.network.Network')
     # pylint: disable=unused-argument
     def test_visualize_artifacts(self, mock_network, mock_digraph,
                                  mock_parse_config):
@@ -120,6 +209,7 @@ class TestCoreWrappers(unittest.TestCase):
         visualize_artifacts(self.cfg, export_data, report)
         mock_network.return_value.show.assert_called_with(
             '/tmp/visualization.html')
+        self.assertEqual(report, {'report': {}})
 
     @patch('core_wrappers.QualificationReport')
     def test_qualification_report(self, mock_qualification_report):
@@ -136,6 +226,63 @@ class TestCoreWrappers(unittest.TestCase):
                                 export_data, topology_mapping
                                 )
         mock_qualification_report.return_value.close.assert_called_once()
+        sheet_calls = [
+            name for name, _, _ in
+            mock_qualification_report.return_value.method_calls]
+        self.assertEqual(sheet_calls[0], 'qualification_report_summary')
+        self.assertEqual(sheet_calls[-2:], ['sharding', 'close'])
+
+    @patch('core_wrappers.QualificationReport')
+    def test_qualification_report_csv(self, mock_qualification_report):
+        """
+        Test the qualification_report function with the CSV format.
+        """
+        backend_cfg = ConfigParser()
+        backend_cfg.add_section('report')
+        backend_cfg.set('report', 'REPORT_FORMAT', 'csv')
+        backend_cfg.set('report', 'CSV_REPORT_DIR', 'report_csv')
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.cfg.set('inputs', 'TARGET_DIR', temp_dir)
+            qualification_report(self.cfg, backend_cfg, {}, {})
+            self.assertIn('validation_report.csv',
+                          os.listdir(os.path.join(temp_dir, 'report_csv')))
+        mock_qualification_report.assert_not_called()
+
+    @patch('core_wrappers.write_report_csv')
+    @patch('core_wrappers.QualificationReport')
+    def test_qualification_report_incremental(
+            self, mock_qualification_report, mock_write_report_csv):
+        """
+        Test that unchanged report files are not written again.
+        """
+        backend_cfg = ConfigParser()
+        backend_cfg.add_section('report')
+        backend_cfg.set('report', 'QUALIFICATION_REPORT', 'report.xlsx')
+        backend_cfg.set('report', 'REPORT_FORMAT', 'both')
+        backend_cfg.set('report', 'INCREMENTAL_REPORT', 'true')
+        export_data = {'orgConfig': {'companies': ['company1']}}
+        with tempfile.TemporaryDirectory() as temp_dir:
+            self.cfg.set('inputs', 'TARGET_DIR', temp_dir)
+            csv_dir = os.path.join(temp_dir, 'qualification_report_csv')
+            mock_write_report_csv.side_effect = lambda d, i, sheets: [
+                open(f"{d}/{sheet}.csv", 'w').close() for sheet in sheets]  # noqa pylint: disable=R1732,W1514
+            mock_qualification_report.return_value.close.side_effect = (
+                lambda: open(f"{temp_dir}/report.xlsx", 'w').close())  # noqa pylint: disable=R1732,W1514
+
+            qualification_report(self.cfg, backend_cfg, export_data, {})
+            self.assertEqual(len(mock_write_report_csv.call_args[0][2]), 19)
+            self.assertEqual(mock_qualification_report.call_count, 1)
+
+            qualification_report(self.cfg, backend_cfg, export_data, {})
+            self.assertEqual(mock_write_report_csv.call_args[0][2], [])
+            self.assertEqual(mock_qualification_report.call_count, 1)
+
+            export_data['orgConfig']['companies'].append('company2')
+            os.remove(os.path.join(csv_dir, 'org_resourcefiles.csv'))
+            qualification_report(self.cfg, backend_cfg, export_data, {})
+            self.assertEqual(mock_write_report_csv.call_args[0][2],
+                             ['company_and_developers', 'org_resourcefiles'])
+            self.assertEqual(mock_qualification_report.call_count, 2)
 
     @patch('core_wrappers.get_source_auth_token')
     @patch('core_wrappers.ApigeeTopology')
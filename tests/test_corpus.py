@@ -0,0 +1,73 @@
+"""
+Tests for the corpus module.
+"""
+import os
+import tempfile
+import unittest
+
+import utils
+from corpus import ProxyCorpus
+
+
+class TestProxyCorpus(unittest.TestCase):
+    """
+    Test cases for the ProxyCorpus class.
+    """
+
+    def test_deterministic(self):
+        """
+        Test that bundles only depend on the seed and their name.
+        """
+        corpus = ProxyCorpus(seed=3)
+        self.assertEqual(corpus.bundle('apis', 'proxy-00001'),
+                         ProxyCorpus(seed=3).bundle('apis', 'proxy-00001'))
+        self.assertNotEqual(corpus.bundle('apis', 'proxy-00001'),
+                            ProxyCorpus(seed=4).bundle('apis', 'proxy-00001'))
+
+    def test_proxies_parse(self):
+        """
+        Test that generated proxies are parsed with their endpoints,
+        policies and sharedflow callouts.
+        """
+        corpus = ProxyCorpus(seed=1, sharedflows=['sf-a', 'sf-b'])
+        endpoint_counts = set()
+        callouts = set()
+        with tempfile.TemporaryDirectory() as output_dir:
+            corpus.write(output_dir, [f'proxy-{i}' for i in range(60)])
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(output_dir, 'sharedflows'))),
+                ['sf-a.zip', 'sf-b.zip'])
+            for i in range(60):
+                proxy = utils.read_proxy_bundle(
+                    os.path.join(output_dir, 'apis', f'proxy-{i}.zip'))
+                relationships = utils.get_proxy_objects_relationships(proxy)
+                endpoint_counts.add(len(relationships))
+                for endpoint in relationships.values():
+                    for policy in endpoint['Policies']:
+                        self.assertIn(policy, proxy['Policies'])
+                        callout = proxy['Policies'][policy].get(
+                            'FlowCallout')
+                        if callout:
+                            callouts.add(callout['SharedFlowBundle'])
+        self.assertIn(1, endpoint_counts)
+        self.assertGreater(max(endpoint_counts), 1)
+        self.assertEqual(callouts, {'sf-a', 'sf-b'})
+
+    def test_unzipped(self):
+        """
+        Test that proxies are also extracted in the unzipped layout.
+        """
+        corpus = ProxyCorpus(sharedflows=[])
+        with tempfile.TemporaryDirectory() as output_dir:
+            unzipped_dir = os.path.join(output_dir, 'unzipped')
+            corpus.write(output_dir, ['proxy-a'], unzipped_dir)
+            proxy_dir = os.path.join(unzipped_dir, 'proxy-a', 'apiproxy')
+            root = utils.parse_proxy_root(proxy_dir)
+            proxy = utils.read_proxy_artifacts(proxy_dir, root)
+        self.assertEqual(proxy['proxyName'], 'proxy-a')
+        self.assertNotIn('FlowCallout', [
+            next(iter(policy)) for policy in proxy['Policies'].values()])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+"""
+Tests for the http_metrics module.
+"""
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+
+from http_metrics import (
+    HttpMetrics,
+    endpoint_template,
+    http_metrics,
+    retry_attempt,
+)
+from rest import RestClient
+from utils import retry
+
+
+class TestHttpMetrics(unittest.TestCase):
+    """
+    Test cases for the HttpMetrics class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        http_metrics.reset()
+
+    def test_endpoint_template(self):
+        """
+        Test that resource names are replaced in endpoint templates.
+        """
+        self.assertEqual(
+            endpoint_template('https://opdk:8080/v1/organizations/o/'
+                              'environments/e/keyvaluemaps/k?expand=true'),
+            '/v1/organizations/{org}/environments/{env}/keyvaluemaps/{id}')
+        self.assertEqual(
+            endpoint_template('https://opdk/v1/organizations/o/apis/p/'
+                              'revisions/3/deployments'),
+            '/v1/organizations/{org}/apis/{id}/revisions/{id}/deployments')
+        self.assertEqual(endpoint_template('https://host/token'), '/token')
+
+    def test_observe_and_merge(self):
+        """
+        Test that requests are grouped by endpoint, with their latency
+        buckets, statuses, bytes and retries.
+        """
+        metrics = HttpMetrics()
+        metrics.observe('GET', 'http://h/v1/organizations/o/apis/a', 200,
+                        0.02, 100)
+        with retry_attempt(1):
+            metrics.observe('GET', 'http://h/v1/organizations/o/apis/b',
+                            503, 3.0, 10)
+        other = HttpMetrics()
+        other.observe('POST', 'http://h/v1/organizations/o/apis', 'error',
+                      0.001, bytes_out=5)
+        metrics.merge(other.snapshot())
+        get, post = metrics.snapshot()
+        self.assertEqual(get['endpoint'], '/v1/organizations/{org}/apis/{id}')
+        self.assertEqual(get['requests'], 2)
+        self.assertEqual(get['bytes_in'], 110)
+        self.assertEqual(get['retries'], 1)
+        self.assertEqual(get['statuses'], {'200': 1, '503': 1})
+        self.assertEqual(get['buckets'][2], 1)
+        self.assertEqual(get['buckets'][9], 1)
+        self.assertEqual(post['statuses'], {'error': 1})
+        self.assertEqual(post['bytes_out'], 5)
+
+    def test_prometheus(self):
+        """
+        Test the Prometheus text format of the metrics.
+        """
+        metrics = HttpMetrics()
+        metrics.observe('GET', 'http://h/v1/organizations/o', 200, 0.2)
+        lines = metrics.to_prometheus().splitlines()
+        labels = 'method="GET",host="h",endpoint="/v1/organizations/{org}"'
+        self.assertIn(
+            f'apigee_assessment_http_requests_total{{{labels},status="200"}} 1',  # noqa pylint: disable=C0301
+            lines)
+        self.assertIn(
+            f'apigee_assessment_http_request_duration_seconds_bucket{{{labels},le="0.1"}} 0',  # noqa pylint: disable=C0301
+            lines)
+        self.assertIn(
+            f'apigee_assessment_http_request_duration_seconds_bucket{{{labels},le="+Inf"}} 1',  # noqa pylint: disable=C0301
+            lines)
+        self.assertIn(
+            f'apigee_assessment_http_retries_total{{{labels}}} 0', lines)
+
+    @patch('rest.requests.Session')
+    def test_rest_client(self, mock_session_class):
+        """
+        Test that RestClient records responses, failed requests and
+        requests made by retries.
+        """
+        session = mock_session_class.return_value
+        response = Mock(status_code=200, content=b'{}', text='{}',
+                        headers={'Content-Type': 'application/json'})
+        response.json.return_value = {}
+        response.request.body = None
+        session.get.side_effect = [requests.exceptions.ConnectionError(),
+                                   response]
+        client = RestClient('basic', 'token')
+
+        @retry(retries=1)
+        def get_org():
+            return client.get('http://h/v1/organizations/o')
+
+        with patch('utils.sleep'):
+            self.assertEqual(get_org(), {})
+        (endpoint,) = http_metrics.snapshot()
+        self.assertEqual(endpoint['statuses'], {'error': 1, '200': 1})
+        self.assertEqual(endpoint['retries'], 1)
+        self.assertEqual(endpoint['bytes_in'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Tests for the instrumentation module.
+"""
+import unittest
+
+import instrumentation
+from instrumentation import OPERATIONS, STAGES, Metrics, stage, timed
+from utils import run_parallel
+
+
+def square(value):
+    """Squares a value in a worker process."""
+    with timed("square"):
+        return value * value
+
+
+class TestMetrics(unittest.TestCase):
+    """
+    Test cases for the Metrics class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        instrumentation.metrics.reset()
+
+    def test_record_and_merge(self):
+        """
+        Test that counters add up, including other processes' counters.
+        """
+        metrics = Metrics()
+        metrics.record("rest.GET", 0.5, 100)
+        metrics.record("rest.GET", 0.25, 50, errors=1)
+        other = Metrics()
+        other.record("rest.GET", 1.0, 10)
+        metrics.merge(other.snapshot())
+        self.assertEqual(metrics.snapshot()[OPERATIONS]["rest.GET"],
+                         {"count": 3, "seconds": 1.75, "bytes": 160,
+                          "errors": 1})
+
+    def test_timed_error(self):
+        """
+        Test that a block that raises is timed and counted as an error.
+        """
+        with self.assertRaises(ValueError):
+            with timed("parse_xml") as call:
+                call["bytes"] = 12
+                raise ValueError("bad xml")
+        counters = instrumentation.metrics.snapshot()[OPERATIONS]["parse_xml"]
+        self.assertEqual((counters["count"], counters["bytes"],
+                          counters["errors"]), (1, 12, 1))
+
+    def test_stage(self):
+        """
+        Test that decorated stages are recorded and sorted by duration.
+        """
+        @stage("export")
+        def export():
+            return {"export": True}
+
+        self.assertEqual(export(), {"export": True})
+        summary = instrumentation.metrics.summary()
+        self.assertEqual(summary[STAGES]["export"]["count"], 1)
+        self.assertIn("started_at", summary)
+
+    def test_run_parallel_workers(self):
+        """
+        Test that counters of run_parallel workers reach the parent.
+        """
+        self.assertEqual(sorted(run_parallel(square, [1, 2, 3], workers=2)),
+                         [1, 4, 9])
+        operations = instrumentation.metrics.snapshot()[OPERATIONS]
+        self.assertEqual(operations["square"]["count"], 3)
+        self.assertEqual(operations["task.square"]["count"], 3)
+        self.assertEqual(operations["run_parallel.square"]["count"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
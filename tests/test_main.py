@@ -2,7 +2,12 @@
 """
 Tests for the main module.
 """
+import os
+import subprocess
+import sys
+import tempfile
 import unittest
+from configparser import ConfigParser
 from unittest.mock import patch, MagicMock
 
 from main import main
@@ -13,51 +18,65 @@ class TestMain(unittest.TestCase):
     Test cases for the main function.
     """
 
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()  # noqa pylint: disable=R1732
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cfg = ConfigParser()
+        self.cfg.read_dict({'inputs': {
+            'SOURCE_URL': 'http://source.com',
+            'SOURCE_ORG': 'source_org',
+            'SOURCE_APIGEE_VERSION': 'OPDK',
+            'TARGET_DIR': self.tmp_dir.name,
+        }})
+        self.backend_cfg = ConfigParser()
+        self.backend_cfg.read_dict({'export': {'EXPORT_DIR': 'export'}})
+        environ = patch.dict(os.environ)
+        environ.start()
+        self.addCleanup(environ.stop)
+        for variable in ('IGNORE_VIZ', 'IGNORE_OPDK_TOPOLOGY',
+                         'IGNORE_ENV_SHARD', 'IGNORE_EXPORT'):
+            os.environ.pop(variable, None)
+
     @patch('main.argparse.ArgumentParser')
     @patch('main.parse_config')
     @patch('main.pre_validation_checks')
     @patch('main.export_artifacts')
+    @patch('main.map_proxy_dependencies')
+    @patch('main.shard_environments')
     @patch('main.validate_artifacts')
     @patch('main.visualize_artifacts')
     @patch('main.get_topology')
     @patch('main.qualification_report')
-    @patch('main.parse_json')
-    @patch('main.write_json')
     # noqa pylint: disable=too-many-arguments, too-many-locals, unused-argument, too-many-positional-arguments
-    def test_main_flow(self, mock_write_json, mock_parse_json,
-                       mock_qualification_report, mock_get_topology,
+    def test_main_flow(self, mock_qualification_report, mock_get_topology,
                        mock_visualize_artifacts, mock_validate_artifacts,
+                       mock_shard_environments, mock_map_proxy_dependencies,
                        mock_export_artifacts, mock_pre_validation_checks,
                        mock_parse_config, mock_arg_parser):
         """
-        Test the main flow of the script.
+        Test the main flow of the script, and that a second run only
+        runs the stages whose inputs changed.
         """
         # Mock command line arguments
         mock_args = MagicMock()
         mock_args.resources = 'all'
         mock_args.skip_target_validation = False
+        mock_args.force_revalidation = False
+        mock_args.rerun = None
+        mock_args.profile = False
         mock_arg_parser.return_value.parse_args.return_value = mock_args
-
-        # Mock config files
-        mock_cfg = MagicMock()
-        mock_cfg.get.return_value = 'OPDK'
-        mock_backend_cfg = MagicMock()
-        mock_parse_config.side_effect = [mock_cfg, mock_backend_cfg]
-
-        # Mock pre_validation_checks to return True
+        mock_parse_config.side_effect = lambda file: (
+            self.cfg if file == 'input.properties' else self.backend_cfg)
         mock_pre_validation_checks.return_value = True
-
-        # Mock parse_json to return empty dicts initially
-        mock_parse_json.side_effect = [{}, {}]
-
-        # Mock export_artifacts to return some data
-        mock_export_artifacts.return_value = {'export': True}
-
-        # Mock validate_artifacts to return some data
-        mock_validate_artifacts.return_value = {'report': True}
-
-        # Mock get_topology to return some data
-        mock_get_topology.return_value = {}
+        mock_export_artifacts.return_value = {'orgConfig': {},
+                                              'envConfig': {}}
+        mock_map_proxy_dependencies.return_value = {'api': {}}
+        mock_shard_environments.return_value = {'dev': {}}
+        mock_validate_artifacts.return_value = {'apis': []}
+        mock_get_topology.return_value = {'pod_component_mapping': {}}
 
         # Call the main function
         main()
@@ -65,11 +84,48 @@ class TestMain(unittest.TestCase):
         # Assert that the core functions were called
         mock_pre_validation_checks.assert_called_once()
         mock_export_artifacts.assert_called_once()
+        mock_map_proxy_dependencies.assert_called_once()
+        mock_shard_environments.assert_called_once()
         mock_validate_artifacts.assert_called_once()
         mock_visualize_artifacts.assert_called_once()
         mock_get_topology.assert_called_once()
+        mock_qualification_report.assert_called_once_with(
+            self.cfg, self.backend_cfg,
+            {'orgConfig': {}, 'envConfig': {},
+             'proxy_dependency_map': {'api': {}},
+             'sharding_output': {'dev': {}},
+             'validation_report': {'apis': []}},
+            {'pod_component_mapping': {}})
+
+        # Only the stages after the changed settings run again
+        for file in ('visualization.html', 'qualification_report.xlsx'):
+            with open(os.path.join(self.tmp_dir.name, file), 'w',
+                      encoding='utf-8'):
+                pass
+        self.backend_cfg.read_dict({'visualize': {
+            'VISUALIZATION_THRESHOLD': '10'}})
+        mock_args.rerun = 'topology'
+        main()
+        mock_export_artifacts.assert_called_once()
+        mock_validate_artifacts.assert_called_once()
+        self.assertEqual(mock_visualize_artifacts.call_count, 2)
+        self.assertEqual(mock_get_topology.call_count, 2)
         mock_qualification_report.assert_called_once()
 
+    def test_lazy_imports(self):
+        """
+        Test that importing main does not import the dependencies only
+        needed by some stages.
+        """
+        heavy_modules = ['networkx', 'pyvis', 'diagrams', 'xlsxwriter',
+                         'google.cloud.resourcemanager_v3']
+        result = subprocess.run(
+            [sys.executable, '-c',
+             'import sys, main; '
+             f'print([m for m in {heavy_modules} if m in sys.modules])'],
+            capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '[]')
+
 
 if __name__ == '__main__':
     unittest.main()
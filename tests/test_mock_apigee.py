@@ -0,0 +1,90 @@
+"""
+Tests for the mock_apigee module.
+"""
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest.mock import patch
+
+from classic import ApigeeClassic
+from mock_apigee import MockApigeeServer, SyntheticOrg
+from nextgen import ApigeeNewGen
+
+
+class TestMockApigee(unittest.TestCase):
+    """
+    Test cases for the MockApigeeServer class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.org = SyntheticOrg(proxies=25, developers=7, apps=23,
+                                apiproducts=4, seed=1)
+
+    @patch.dict(os.environ, {'PAGE_SIZE': '10'})
+    def test_classic_pagination(self):
+        """
+        Test that paginated lists are served completely, without
+        duplicates.
+        """
+        with MockApigeeServer(self.org) as server:
+            classic = ApigeeClassic(server.url, 'mock-org', 'token',
+                                    'basic', False)
+            apis = classic.list_org_objects('apis')
+            apps = classic.list_org_objects_expand('apps')
+            stats = server.stats()
+        self.assertEqual(apis, self.org.apis['apis'])
+        self.assertEqual(sorted(apps), sorted(self.org.apps))
+        self.assertEqual(stats['routes']['GET /organizations/{org}/apis'], 4)
+        self.assertEqual(stats['routes']['GET /organizations/{org}/apps'], 4)
+
+    def test_x_page_token(self):
+        """
+        Test that apps are paginated with pageToken for Apigee X.
+        """
+        with MockApigeeServer(self.org, flavor='x') as server:
+            newgen = ApigeeNewGen(server.url, 'mock-org', 'token',
+                                  None, False)
+            apps = newgen.list_org_objects('apps')
+            apis = newgen.list_org_objects('apis')
+        self.assertEqual(apps, sorted(self.org.apps))
+        self.assertEqual(apis, self.org.apis['apis'])
+
+    def test_bundle_download(self):
+        """
+        Test that the latest revision bundle of a proxy is downloaded.
+        """
+        with MockApigeeServer(self.org) as server, \
+                tempfile.TemporaryDirectory(dir='.') as export_dir:
+            export_dir = os.path.relpath(export_dir)
+            classic = ApigeeClassic(server.url, 'mock-org', 'token',
+                                    'basic', False)
+            classic.fetch_proxy(('apis', 'proxy-00003', export_dir))
+            with zipfile.ZipFile(
+                    os.path.join(export_dir, 'proxy-00003.zip')) as bundle:
+                names = bundle.namelist()
+                root = bundle.read('apiproxy/proxy-00003.xml').decode()
+        self.assertIn('apiproxy/proxies/default.xml', names)
+        self.assertIn('revision="2"', root)
+        self.assertEqual(self.org.bundle('apis', 'proxy-00003', '2'),
+                         self.org.bundle('apis', 'proxy-00003', '2'))
+
+    def test_injected_errors(self):
+        """
+        Test that injected errors are returned to the client and counted.
+        """
+        with MockApigeeServer(self.org, error_rate=1.0) as server:
+            classic = ApigeeClassic(server.url, 'mock-org', 'token',
+                                    'basic', False)
+            org = classic.get_org()
+            stats = server.stats()
+        self.assertEqual(org['code'], 'mock.http.503')
+        self.assertEqual(stats['requests'], 1)
+        self.assertEqual(stats['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
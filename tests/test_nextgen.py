@@ -21,8 +21,8 @@ class TestApigeeNewGen(unittest.TestCase):
                                            self.ssl_verify)
         self.nextgen_client.client = MagicMock()
 
-    @patch('nextgen.Credentials')
-    @patch('nextgen.resourcemanager_v3.ProjectsClient')
+    @patch('google.oauth2.credentials.Credentials')
+    @patch('google.cloud.resourcemanager_v3.ProjectsClient')
     def test_validate_permissions(self, mock_projects_client,
                                   mock_credentials):
         """Test validate permissions."""
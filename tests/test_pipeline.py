@@ -0,0 +1,152 @@
+"""
+Tests for the pipeline module.
+"""
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock
+
+from pipeline import Pipeline, Stage
+
+
+class TestPipeline(unittest.TestCase):
+    """
+    Test cases for the pipeline module.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()  # noqa pylint: disable=R1732
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cache_dir = os.path.join(self.tmp_dir.name, 'pipeline')
+        self.source = MagicMock(return_value={'apis': ['a', 'b']})
+        self.count = MagicMock(
+            side_effect=lambda source: len(source['apis']))
+        self.report = MagicMock(return_value=None)
+
+    def stages(self, limit=10, files=()):
+        """Returns a source, count and report pipeline."""
+        return [
+            Stage('source', self.source, params={'limit': limit},
+                  files=files),
+            Stage('count', self.count, inputs=['source']),
+            Stage('report', self.report, inputs=['count']),
+        ]
+
+    def test_run(self):
+        """
+        Test that stages get the outputs of their input stages.
+        """
+        pipeline = Pipeline(self.stages(), self.cache_dir).run()
+        self.count.assert_called_once_with(source={'apis': ['a', 'b']})
+        self.report.assert_called_once_with(count=2)
+        self.assertEqual(pipeline.ran, ['source', 'count', 'report'])
+        self.assertEqual(pipeline.result('count'), 2)
+
+    def test_cached(self):
+        """
+        Test that a second run reuses the cached outputs.
+        """
+        Pipeline(self.stages(), self.cache_dir).run()
+        pipeline = Pipeline(self.stages(), self.cache_dir).run()
+        self.assertEqual(pipeline.ran, [])
+        self.assertEqual(pipeline.cached, ['source', 'count', 'report'])
+        self.assertEqual(pipeline.result('source'), {'apis': ['a', 'b']})
+        self.source.assert_called_once()
+
+    def test_stale(self):
+        """
+        Test that the stages after a changed stage run again.
+        """
+        Pipeline(self.stages(), self.cache_dir).run()
+        self.source.return_value = {'apis': ['a']}
+        pipeline = Pipeline(self.stages(limit=5), self.cache_dir).run()
+        self.assertEqual(pipeline.ran, ['source', 'count', 'report'])
+        self.report.assert_called_with(count=1)
+
+    def test_same_output(self):
+        """
+        Test that a stage whose output did not change does not make
+        the next stages stale.
+        """
+        Pipeline(self.stages(), self.cache_dir).run()
+        self.source.return_value = {'apis': ['c', 'd']}
+        pipeline = Pipeline(self.stages(limit=5), self.cache_dir).run()
+        self.assertEqual(pipeline.ran, ['source', 'count'])
+        self.assertEqual(pipeline.cached, ['report'])
+
+    def test_rerun(self):
+        """
+        Test that stages can be run again on request.
+        """
+        Pipeline(self.stages(), self.cache_dir).run()
+        pipeline = Pipeline(self.stages(), self.cache_dir).run(['count'])
+        self.assertEqual(pipeline.ran, ['count'])
+        pipeline = Pipeline(self.stages(), self.cache_dir).run(['all'])
+        self.assertEqual(pipeline.ran, ['source', 'count', 'report'])
+
+    def test_files(self):
+        """
+        Test that stages run again when the files they read change,
+        or the files they write are missing.
+        """
+        source_dir = os.path.join(self.tmp_dir.name, 'source')
+        os.makedirs(source_dir)
+        source_file = os.path.join(source_dir, 'source.txt')
+        output_file = os.path.join(self.tmp_dir.name, 'report.txt')
+        for file in (source_file, output_file):
+            with open(file, 'w', encoding='utf-8') as fl:
+                fl.write('a')
+        stages = self.stages(files=[source_dir])
+        stages[2].outputs = [output_file]
+        Pipeline(stages, self.cache_dir).run()
+        with open(source_file, 'w', encoding='utf-8') as fl:
+            fl.write('ab')
+        pipeline = Pipeline(stages, self.cache_dir).run()
+        self.assertEqual(pipeline.ran, ['source'])
+        os.remove(output_file)
+        pipeline = Pipeline(stages, self.cache_dir).run()
+        self.assertEqual(pipeline.ran, ['report'])
+
+    def test_concurrent(self):
+        """
+        Test that independent stages run at the same time.
+        """
+        barrier = threading.Barrier(2, timeout=5)
+        stages = [
+            Stage('source', lambda: 1),
+            Stage('left', lambda source: barrier.wait(), inputs=['source']),
+            Stage('right', lambda source: barrier.wait(),
+                  inputs=['source']),
+        ]
+        pipeline = Pipeline(stages, self.cache_dir, workers=2).run()
+        self.assertEqual(sorted(pipeline.ran), ['left', 'right', 'source'])
+
+    def test_failure(self):
+        """
+        Test that a failing stage stops the pipeline, and is run
+        again by the next run.
+        """
+        self.count.side_effect = ValueError('failed')
+        with self.assertRaises(ValueError):
+            Pipeline(self.stages(), self.cache_dir).run()
+        self.report.assert_not_called()
+        self.count.side_effect = None
+        self.count.return_value = 2
+        pipeline = Pipeline(self.stages(), self.cache_dir).run()
+        self.assertEqual(pipeline.ran, ['count', 'report'])
+
+    def test_unknown_input(self):
+        """
+        Test that stages can only take outputs of previous stages.
+        """
+        with self.assertRaises(ValueError):
+            Pipeline([Stage('count', self.count, inputs=['source'])],
+                     self.cache_dir)
+
+
+if __name__ == '__main__':
+    unittest.main()
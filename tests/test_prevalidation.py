@@ -0,0 +1,56 @@
+"""
+Tests for the prevalidation module.
+"""
+import unittest
+from unittest.mock import patch
+from prevalidation import PreValidator
+
+
+class TestPreValidator(unittest.TestCase):
+    """
+    Test cases for the PreValidator class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.pre_validator = PreValidator({
+            "api1": {"qualification": {
+                "policies": {"OAuth-1": "OAuthV1"}}},
+            "api2": {"qualification": {"policies": {}}},
+        })
+
+    def test_validate(self):
+        """
+        Test the local rules and hit counts.
+        """
+        violations = self.pre_validator.validate("apis", "api1")
+        self.assertEqual([v["type"] for v in violations],
+                         ["UnsupportedPolicy"])
+        self.assertEqual(violations[0]["subject"], "api1/policies/OAuth-1")
+        self.assertEqual(self.pre_validator.validate("apis", "api2"), [])
+        self.assertEqual(self.pre_validator.validate("apis", "api3"), [])
+        self.assertEqual(self.pre_validator.validate("sharedflows", "api1"),
+                         [])
+        self.assertEqual(self.pre_validator.rule_hits, {
+            "unsupported_policies": 1})
+        self.assertEqual(self.pre_validator.failed, {
+            "api1": ["unsupported_policies"]})
+
+    @patch('prevalidation.write_json')
+    def test_write_summary(self, mock_write_json):
+        """
+        Test the rule hit summary.
+        """
+        self.pre_validator.validate("apis", "api1")
+        self.pre_validator.write_summary("summary.json")
+        mock_write_json.assert_called_once_with("summary.json", {
+            "rule_hits": {"unsupported_policies": 1},
+            "skipped_remote_validation": {
+                "api1": ["unsupported_policies"]},
+        })
+
+
+if __name__ == '__main__':
+    unittest.main()
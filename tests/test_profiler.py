@@ -0,0 +1,63 @@
+"""
+Tests for the profiler module.
+"""
+import os
+import pstats
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from instrumentation import stage
+from profiler import PROFILE_DIR_ENV, profiled
+from utils import run_parallel
+
+
+def busy_task(count):
+    """Spends some time in a worker process."""
+    return sum(range(count))
+
+
+@stage("busy")
+def busy_stage():
+    """Runs busy tasks in worker processes."""
+    return run_parallel(busy_task, [1000, 2000], workers=2)
+
+
+class TestProfiler(unittest.TestCase):
+    """
+    Test cases for the profiler module.
+    """
+
+    def test_disabled(self):
+        """
+        Test that nothing is written when profiling is off.
+        """
+        with tempfile.TemporaryDirectory() as profile_dir, \
+                patch.dict(os.environ, {PROFILE_DIR_ENV: ''}):
+            with profiled('export'):
+                busy_task(10)
+            self.assertEqual(os.listdir(profile_dir), [])
+
+    def test_stage_with_workers(self):
+        """
+        Test that a stage profile includes its worker processes.
+        """
+        with tempfile.TemporaryDirectory() as profile_dir, \
+                patch.dict(os.environ, {PROFILE_DIR_ENV: profile_dir}):
+            self.assertEqual(sorted(busy_stage()), [499500, 1999000])
+            self.assertEqual(sorted(os.listdir(profile_dir)),
+                             ['busy.prof', 'busy.txt', 'busy.workers.prof'])
+            functions = {
+                function for _, _, function in pstats.Stats(
+                    os.path.join(profile_dir, 'busy.prof')).stats}
+            workers = pstats.Stats(
+                os.path.join(profile_dir, 'busy.workers.prof'))
+        self.assertIn('busy_stage', functions)
+        self.assertIn('busy_task', functions)
+        self.assertEqual(
+            sum(calls[0] for (_, _, function), calls in
+                workers.stats.items() if function == 'busy_task'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
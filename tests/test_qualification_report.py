@@ -1,10 +1,19 @@
+# pylint: disable=too-many-lines
 """
 Tests for the qualification_report module.
 """
+import os
+import re
+import tempfile
 import unittest
+import zipfile
 from unittest.mock import Mock, patch
 
-from qualification_report import QualificationReport
+from xlsxwriter.workbook import Workbook
+
+from qualification_report import (
+    QualificationReport, build_report_index, report_index_jobs,
+    write_report_csv, REPORT_SHEETS)
 
 
 # pylint: disable=too-many-instance-attributes,too-many-public-methods
@@ -18,7 +27,7 @@ class TestQualificationReport(unittest.TestCase):
         Set up the test case.
         """
         self.mock_workbook = Mock()
-        self.patcher = patch('qualification_report.xlsxwriter.Workbook',
+        self.patcher = patch('xlsxwriter.Workbook',
                              return_value=self.mock_workbook)
         self.mock_workbook_class = self.patcher.start()
 
@@ -120,7 +129,8 @@ class TestQualificationReport(unittest.TestCase):
             self.backend_cfg,
             self.org_name
         )
-        self.mock_workbook_class.assert_called_once_with('test.xlsx')
+        self.mock_workbook_class.assert_called_once_with(
+            'test.xlsx', {'constant_memory': False})
         self.assertEqual(report.workbook, self.mock_workbook)
         self.assertEqual(report.export_data, self.export_data)
         self.assertEqual(report.topology_mapping, self.topology_mapping)
@@ -128,6 +138,164 @@ class TestQualificationReport(unittest.TestCase):
         self.assertEqual(report.cfg, self.cfg)
         self.assertEqual(report.backend_cfg, self.backend_cfg)
 
+    def test_build_report_index(self):
+        """
+        Test that build_report_index builds the rows of every sheet.
+        """
+        self.export_data['proxy_dependency_map'] = {
+            'proxy1': {
+                'is_split': True,
+                'split_output_names': ['p1', 'p2'],
+                'qualification': {
+                    'policies': {'policy1': 'type1'},
+                    'JsonPathEnabled': {'policy2': True},
+                    'base_paths': ['/p1']
+                }
+            },
+            'p1': {
+                'unifier_created': True,
+                'qualification': {'policies': {'policy1': 'type1'}}
+            }
+        }
+        self.export_data['envConfig'] = {
+            'env1': {
+                'apis': ['api1'],
+                'sharedflows': [],
+                'vhosts': {'vh1': {'name': 'vh1',
+                                   'useBuiltInFreeTrialCert': True}},
+                'kvms': {'kvm1': {'encrypted': True}, 'kvm2': {}}
+            }
+        }
+        index = build_report_index(
+            self.export_data, self.topology_mapping, self.org_name)
+        self.assertEqual(set(index), set(REPORT_SHEETS))
+        self.assertEqual(index['sharded_proxies'],
+                         [['test_org', 'proxy1', 'p1\np2']])
+        self.assertEqual(index['unsupported_policies'],
+                         [['test_org', 'proxy1', 'policy1', 'type1']])
+        self.assertEqual(index['json_path_enabled'],
+                         [['test_org', 'proxy1', 'policy2', True]])
+        self.assertEqual(index['api_with_multiple_basepaths'],
+                         [['test_org', 'proxy1', '/p1']])
+        self.assertEqual(index['proxies_per_env'],
+                         [['test_org', 'env1', 1, 0, 1]])
+        self.assertEqual(index['northbound_mtls'],
+                         [['test_org', 'env1', 'vh1', 'False']])
+        self.assertEqual(index['cname_anomaly'],
+                         [['test_org', 'env1', 'vh1']])
+        self.assertEqual(index['env_limits'],
+                         [['test_org', 'env1', 0, 0, 0, 2,
+                           (1, 'danger'), 1, 1, 0]])
+        self.assertEqual(index['org_resourcefiles'],
+                         [['test_org', 'file1'], ['test_org', 'file2']])
+        self.assertEqual(index['validation_report'], [])
+
+    def test_report_index_jobs(self):
+        """
+        Test that the proxy dependency map is split into ordered chunks.
+        """
+        self.export_data['proxy_dependency_map'] = {
+            f'proxy{i}': {} for i in range(5)}
+        jobs = report_index_jobs(
+            self.export_data, self.topology_mapping, self.org_name,
+            chunks=2)
+        self.assertEqual(len(jobs), 7)
+        self.assertEqual(list(jobs[0][1]), ['proxy0', 'proxy1', 'proxy2'])
+        self.assertEqual(list(jobs[1][1]), ['proxy3', 'proxy4'])
+
+    def test_build_report_index_workers(self):
+        """
+        Test that rows built in worker processes keep the export order.
+        """
+        self.export_data['proxy_dependency_map'] = {
+            f'proxy{i}': {'qualification': {'policies': {'p': 'type'}}}
+            for i in range(10)
+        }
+        self.export_data['orgConfig']['companies'] = ['company1']
+        sequential = build_report_index(
+            self.export_data, self.topology_mapping, self.org_name)
+        parallel = build_report_index(
+            self.export_data, self.topology_mapping, self.org_name,
+            workers=3)
+        self.assertEqual(parallel, sequential)
+        self.assertEqual(
+            [row[1] for row in parallel['unsupported_policies']],
+            [f'proxy{i}' for i in range(10)])
+
+    def test_write_report_csv(self):
+        """
+        Test that every sheet is written as a CSV file without formats.
+        """
+        index = {sheet: [] for sheet in REPORT_SHEETS}
+        index['api_limits'] = [['test_org', 'api1', 300]]
+        index['aliases_with_private_keys'] = [
+            ['test_org', 'env1', 'ks1', 'alias1', ('key1', 'danger')],
+            ['test_org', 'env1', 'ks1', 'alias2', None]]
+        with tempfile.TemporaryDirectory() as temp_dir:
+            write_report_csv(temp_dir, index)
+            self.assertEqual(
+                sorted(os.listdir(temp_dir)),
+                sorted(f'{sheet}.csv' for sheet in REPORT_SHEETS))
+            with open(os.path.join(temp_dir, 'aliases_with_private_keys.csv'),  # noqa pylint: disable=C0301
+                      encoding='utf-8') as csv_file:
+                lines = csv_file.read().splitlines()
+            with open(os.path.join(temp_dir, 'org_resourcefiles.csv'),
+                      encoding='utf-8') as csv_file:
+                empty_lines = csv_file.read().splitlines()
+        self.assertEqual(lines[1:], ['test_org,env1,ks1,alias1,key1',
+                                     'test_org,env1,ks1,alias2,'])
+        self.assertEqual(len(empty_lines), 1)
+
+    @patch('qualification_report.company_and_developers_mapping')
+    def test_write_sheet_constant_memory(self, mock_mapping):
+        """
+        Test that sheet rows and the info box are written in row order
+        in constant_memory mode.
+        """
+        mapping = {
+            "headers": ["Org", "Company"],
+            "info_block": {
+                "text": "<b>Info\ntext",
+                "col_merge": 2,
+                "text_line_no_for_col_count": 1,
+                "start_row": 2,
+                "end_row": 4,
+                "link": [{"link": "https://example.com",
+                          "link_text": "Example"}]
+            }
+        }
+        mock_mapping.__getitem__.side_effect = mapping.__getitem__
+        mock_mapping.__contains__.side_effect = mapping.__contains__
+        self.export_data['orgConfig'] = {
+            'companies': [f'company{i}' for i in range(6)]
+        }
+        with tempfile.TemporaryDirectory() as temp_dir, \
+                patch('xlsxwriter.Workbook', Workbook):
+            workbook_path = os.path.join(temp_dir, 'test.xlsx')
+            report = QualificationReport(
+                workbook_path,
+                self.export_data,
+                self.topology_mapping,
+                self.cfg,
+                self.backend_cfg,
+                self.org_name,
+                constant_memory=True
+            )
+            report.report_company_and_developer()
+            report.close()
+            with zipfile.ZipFile(workbook_path) as workbook:
+                sheet_xml = workbook.read(
+                    'xl/worksheets/sheet1.xml').decode()
+
+        self.assertIn('<mergeCell ref="C2:D4"/>', sheet_xml)
+        self.assertIn('<c r="D4" s=', sheet_xml)
+        rows = re.findall(r'<row r="(\d+)"', sheet_xml)
+        self.assertEqual(rows, [str(row) for row in range(1, 8)])
+        for i in range(6):
+            self.assertIn(f'<t>company{i}</t>', sheet_xml)
+        self.assertIn('Info', sheet_xml)
+        self.assertIn('Reference Link:', sheet_xml)
+
     @patch('qualification_report.proxies_per_env_mapping')
     def test_report_proxies_per_env(self, mock_mapping):
         """
@@ -335,9 +503,13 @@ class TestQualificationReport(unittest.TestCase):
         self.mock_workbook.add_worksheet.assert_called_once_with(
             name='Apps Without ApiProducts')
         mock_sheet.write.assert_any_call(1, 0, 'test_org')
-        mock_sheet.write.assert_any_call(1, 1, 'App 2')
-        mock_sheet.write.assert_any_call(1, 2, 'app2')
+        mock_sheet.write.assert_any_call(1, 1, 'App 1')
+        mock_sheet.write.assert_any_call(1, 2, 'app1')
         mock_sheet.write.assert_any_call(1, 3, 'No apiProducts associated')
+        mock_sheet.write.assert_any_call(2, 0, 'test_org')
+        mock_sheet.write.assert_any_call(2, 1, 'App 2')
+        mock_sheet.write.assert_any_call(2, 2, 'app2')
+        mock_sheet.write.assert_any_call(2, 3, 'No apiProducts associated')
 
     @patch('qualification_report.json_path_enabled_mapping')
     def test_report_json_path_enabled(self, mock_mapping):
@@ -481,9 +653,9 @@ class TestQualificationReport(unittest.TestCase):
         self.export_data['orgConfig'] = {
             'developers': ['dev1'],
             'kvms': {'kvm1': {'encrypted': True}},
-            'apps': ['app1'],
+            'apps': {'app1': {'name': 'App 1', 'credentials': []}},
             'apiProducts': ['prod1'],
-            'apis': ['api1']
+            'apis': {'api1': ['1']}
         }
         self.backend_cfg.get.side_effect = ['0', '0', '0']
         report = QualificationReport(
@@ -521,7 +693,7 @@ class TestQualificationReport(unittest.TestCase):
                 'caches': ['cache1'],
                 'keystores': {'ks1': {'aliases': ['alias1']}},
                 'kvms': {'kvm1': {'encrypted': True}},
-                'vhosts': ['vh1'],
+                'vhosts': {'vh1': {}},
                 'references': ['ref1']
             }
         }
@@ -856,23 +1028,6 @@ class TestQualificationReport(unittest.TestCase):
         mock_sheet.write_formula.assert_any_call(
             'B3', "'Sheet 1'!A1", cell_format=report.summary_format)
 
-    def test_reverse_sheets(self):
-        """
-        Test the reverse_sheets method.
-        """
-        report = QualificationReport(
-            'test.xlsx',
-            self.export_data,
-            self.topology_mapping,
-            self.cfg,
-            self.backend_cfg,
-            self.org_name
-        )
-        mock_worksheets = Mock()
-        self.mock_workbook.worksheets.return_value = mock_worksheets
-        report.reverse_sheets()
-        mock_worksheets.reverse.assert_called_once()
-
     def test_close(self):
         """
         Test the close method.
@@ -0,0 +1,44 @@
+"""
+Tests for the rate_limiter module.
+"""
+import unittest
+from unittest.mock import patch
+from rate_limiter import TokenBucket
+
+
+class TestTokenBucket(unittest.TestCase):
+    """
+    Test cases for the TokenBucket class.
+    """
+
+    def test_invalid_rate(self):
+        """
+        Test that a non-positive rate is rejected.
+        """
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+    @patch('rate_limiter.time.sleep')
+    @patch('rate_limiter.time.monotonic')
+    def test_acquire_burst_then_wait(self, mock_monotonic, mock_sleep):
+        """
+        Test that the burst is served immediately and then throttled.
+        """
+        clock = [100.0]
+        mock_monotonic.side_effect = lambda: clock[0]
+
+        def advance(seconds):
+            clock[0] += seconds
+        mock_sleep.side_effect = advance
+
+        bucket = TokenBucket(rate=2, capacity=2)
+        bucket.acquire()
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+        bucket.acquire()
+        mock_sleep.assert_called_once_with(0.5)
+        self.assertEqual(clock[0], 100.5)
+
+
+if __name__ == '__main__':
+    unittest.main()
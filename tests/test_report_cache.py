@@ -0,0 +1,66 @@
+"""
+Tests for the report_cache module.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from report_cache import ReportFingerprints
+
+
+class TestReportFingerprints(unittest.TestCase):
+    """
+    Test cases for the ReportFingerprints class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.fingerprint_file = os.path.join(
+            self.test_dir, "fingerprints.json")
+        self.report = os.path.join(self.test_dir, "report.csv")
+
+    def tearDown(self):
+        """
+        Tear down the test case.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_fingerprint_depends_on_inputs(self):
+        """
+        Test that the fingerprint changes with the inputs.
+        """
+        rows = [["org", "proxy1", ("/a\\n/b", "yellow")]]
+        fingerprint = ReportFingerprints.fingerprint(rows, {"limit": "5"})
+        self.assertEqual(
+            fingerprint, ReportFingerprints.fingerprint(rows, {"limit": "5"}))
+        self.assertNotEqual(
+            fingerprint, ReportFingerprints.fingerprint(rows, {"limit": "6"}))
+        rows.append(["org", "proxy2", None])
+        self.assertNotEqual(
+            fingerprint, ReportFingerprints.fingerprint(rows, {"limit": "5"}))
+
+    def test_is_current_persist(self):
+        """
+        Test that written files are current while their inputs match.
+        """
+        fingerprints = ReportFingerprints(self.fingerprint_file)
+        self.assertFalse(fingerprints.is_current(self.report, "fp1"))
+        with open(self.report, "w", encoding="utf-8") as f:
+            f.write("header\n")
+        fingerprints.update(self.report, "fp1")
+        fingerprints.save()
+
+        fingerprints = ReportFingerprints(self.fingerprint_file)
+        self.assertTrue(fingerprints.is_current(self.report, "fp1"))
+        self.assertFalse(fingerprints.is_current(self.report, "fp2"))
+        self.assertEqual(fingerprints.skipped, 1)
+
+        os.remove(self.report)
+        self.assertFalse(fingerprints.is_current(self.report, "fp1"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+"""
+Tests for the sharding module.
+"""
+import os
+import tempfile
+import unittest
+import zipfile
+from configparser import ConfigParser
+from unittest.mock import patch
+
+from sharding import unzip_all_bundles
+
+
+class TestSharding(unittest.TestCase):
+    """
+    Test cases for the sharding module.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.tmp_dir = tempfile.TemporaryDirectory()  # noqa pylint: disable=R1732
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.input_cfg = ConfigParser()
+        self.input_cfg.read_dict({'inputs': {
+            'TARGET_DIR': os.path.relpath(self.tmp_dir.name)}})
+        self.backend_cfg = ConfigParser()
+        self.backend_cfg.read_dict({
+            'export': {'EXPORT_DIR': 'export'},
+            'unifier': {'source_unzipped_apis': '/source_unzipped_apis'}})
+
+    @patch('sharding.utils.parse_config')
+    def test_unzip_all_bundles(self, mock_parse_config):
+        """
+        Test that bundles are unzipped without changing the working
+        directory.
+        """
+        mock_parse_config.return_value = self.backend_cfg
+        apis_dir = os.path.join(self.tmp_dir.name, 'export', 'apis')
+        os.makedirs(apis_dir)
+        with zipfile.ZipFile(os.path.join(apis_dir, 'orders.zip'),
+                             'w') as bundle:
+            bundle.writestr('apiproxy/orders.xml', '<APIProxy/>')
+        current_dir = os.getcwd()
+        with patch('sharding.os.chdir') as mock_chdir:
+            unzip_all_bundles(self.input_cfg)
+        mock_chdir.assert_not_called()
+        self.assertEqual(os.getcwd(), current_dir)
+        self.assertTrue(os.path.isfile(os.path.join(
+            self.tmp_dir.name, 'export', 'source_unzipped_apis', 'orders',
+            'apiproxy', 'orders.xml')))
+
+
+if __name__ == '__main__':
+    unittest.main()
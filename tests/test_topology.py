@@ -92,9 +92,9 @@ class TestApigeeTopology(unittest.TestCase):
         self.assertEqual(result['test-region']['test-pod'][0]['internalIP'],
                          '10.1.1.1')
 
-    @patch('topology.Diagram')
-    @patch('topology.Cluster')
-    @patch('topology.Blank')
+    @patch('diagrams.Diagram')
+    @patch('diagrams.Cluster')
+    @patch('diagrams.generic.blank.Blank')
     @patch('topology.pod_mapping', {'test-pod': {'bgcolor': '#FFFFFF'}})
     def test_draw_topology_graph_diagram(self, mock_blank, mock_cluster,
                                          mock_diagram):
@@ -316,56 +316,179 @@ class TestUtils(unittest.TestCase):
             self.assertIn('test_dir/file1.txt', zipf.namelist())
             self.assertIn('test_dir/sub/file2.txt', zipf.namelist())
 
-    @patch('utils.copy_folder')
-    @patch('utils.get_proxy_entrypoint')
-    @patch('utils.parse_proxy_root')
-    @patch('utils.delete_file')
-    @patch('utils.filter_objects')
-    @patch('utils.clean_up_artifacts')
-    @patch('utils.write_xml_from_dict')
-    @patch('zipfile.ZipFile')
-    # noqa pylint: disable=too-many-arguments, too-many-locals, unused-argument, too-many-positional-arguments
-    def test_clone_proxies(self, mock_zipfile, mock_write_xml, mock_clean_up,
-                           mock_filter, mock_delete_file, mock_parse,
-                           mock_get_entrypoint, mock_copy):
+    def test_build_proxy_index(self):
+        """Test build proxy index."""
+        proxy_rel = {
+            "pe1": {"Policies": ["p1", "p2", "p1"], "BasePath": "/v1/a",
+                    "TargetEndpoints": ["t1"]},
+            "pe2": {"Policies": ["p2"], "BasePath": "/v1/b",
+                    "TargetEndpoints": ["t1", "t2"]},
+            "pe3": {"Policies": [], "BasePath": None,
+                    "TargetEndpoints": []},
+        }
+        proxy_index = utils.build_proxy_index(proxy_rel)
+        self.assertEqual(proxy_index["endpoints"]["pe1"]["Policies"],
+                         ["p1", "p2"])
+        self.assertEqual(proxy_index["endpoints"]["pe2"]["PathPrefix"], "v1")
+        self.assertEqual(proxy_index["policies"],
+                         {"p1": ["pe1"], "p2": ["pe1", "pe2"]})
+        self.assertEqual(proxy_index["paths"], {
+            "v1": [{"pe1": "v1"}, {"pe2": "v1"}],
+            "_null_": [{"pe3": None}],
+        })
+        self.assertEqual(utils.get_api_path_groups(proxy_rel),
+                         proxy_index["paths"])
+
+    def test_merge_proxy_endpoints(self):
+        """Test merge proxy endpoints only reads the endpoints merged."""
+        read = []
+
+        class ProxyEndpoints(dict):
+            """Records the endpoints read, and fails on a scan."""
+
+            def __getitem__(self, key):
+                read.append(key)
+                return super().__getitem__(key)
+
+            def __iter__(self):
+                raise AssertionError("scanned every proxy endpoint")
+
+            def items(self):
+                raise AssertionError("scanned every proxy endpoint")
+
+        def proxy_endpoint(name, base_path):
+            return {"ProxyEndpoint": {
+                "@name": name,
+                "Description": None,
+                "FaultRules": None,
+                "Flows": None,
+                "HTTPProxyConnection": {"BasePath": base_path,
+                                        "Properties": {},
+                                        "VirtualHost": "default"},
+                "RouteRule": {"@name": "default"},
+                "PreFlow": {"Request": None, "Response": None},
+                "PostFlow": {"Request": None, "Response": None},
+            }}
+        api_dict = {"ProxyEndpoints": ProxyEndpoints({
+            "pe1": proxy_endpoint("pe1", "/v1/a"),
+            "pe2": proxy_endpoint("pe2", "/v1/b"),
+            "pe3": proxy_endpoint("pe3", "/v2/a"),
+        })}
+        merged_pe = utils.merge_proxy_endpoints(api_dict, "v1",
+                                                ["pe1", "pe2", "pe4"])
+        self.assertEqual(read, ["pe1", "pe2"])
+        self.assertEqual(merged_pe["ProxyEndpoint"]["@name"], "pe1-pe2")
+        self.assertEqual(
+            merged_pe["ProxyEndpoint"]["HTTPProxyConnection"]["BasePath"],
+            "/v1")
+
+    def _write_source_proxy(self):
+        """Writes a small source proxy bundle directory."""
+        source_dir = os.path.join(self.test_dir, "src", "apiproxy")
+        files = {
+            "test_proxy.xml": (
+                "<APIProxy name=\"test_proxy\">"
+                "<Policies><Policy>policy1</Policy>"
+                "<Policy>policy2</Policy></Policies>"
+                "<ProxyEndpoints><ProxyEndpoint>proxy1</ProxyEndpoint>"
+                "<ProxyEndpoint>proxy2</ProxyEndpoint></ProxyEndpoints>"
+                "<TargetEndpoints><TargetEndpoint>target1</TargetEndpoint>"
+                "<TargetEndpoint>target2</TargetEndpoint></TargetEndpoints>"
+                "</APIProxy>"),
+            "policies/policy1.xml": "<AssignMessage name=\"policy1\"/>",
+            "policies/policy2.xml": "<AssignMessage name=\"policy2\"/>",
+            "targets/target1.xml": "<TargetEndpoint name=\"target1\"/>",
+            "targets/target2.xml": "<TargetEndpoint name=\"target2\"/>",
+            "proxies/proxy1.xml": "<ProxyEndpoint name=\"proxy1\"/>",
+            "proxies/proxy2.xml": "<ProxyEndpoint name=\"proxy2\"/>",
+            "resources/jsc/test.js": "var a = 1;",
+            "manifests/manifest.xml": "<Manifest/>",
+        }
+        for name, content in files.items():
+            path = os.path.join(source_dir, name)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(content)
+        return source_dir
+
+    def test_clone_proxies(self):
         """Test clone proxies."""
-        source_dir = "source"
-        target_dir = "target"
+        source_dir = self._write_source_proxy()
+        proxy_bundle_directory = os.path.join(self.test_dir, "bundles")
+        os.makedirs(proxy_bundle_directory)
         objects = {
-            "Name": "test_proxy",
+            "Name": "test_proxy_0",
             "Policies": ["policy1"],
             "TargetEndpoints": ["target1"],
-            "ProxyEndpoints": ["proxy1"]
+            "ProxyEndpoints": ["proxy1-proxy2"]
+        }
+        merged_pes = {
+            "proxy1-proxy2": {"ProxyEndpoint": {"@name": "proxy1-proxy2"}}
         }
-        merged_pes = {"proxy1": {"ProxyEndpoint": {}}}
-        proxy_bundle_directory = "bundles"
 
-        mock_get_entrypoint.return_value = "source/apiproxy/test_proxy.xml"
-        mock_parse.return_value = {
+        utils.clone_proxies(
+                source_dir, objects, merged_pes,
+                proxy_bundle_directory
+                )
+        with zipfile.ZipFile(
+                os.path.join(proxy_bundle_directory,
+                             "test_proxy_0.zip")) as zipf:
+            self.assertEqual(sorted(zipf.namelist()), [
+                "apiproxy/policies/policy1.xml",
+                "apiproxy/proxies/proxy1-proxy2.xml",
+                "apiproxy/resources/jsc/test.js",
+                "apiproxy/targets/target1.xml",
+                "apiproxy/test_proxy_0.xml",
+            ])
+            root = zipf.read("apiproxy/test_proxy_0.xml").decode()
+            self.assertIn('<APIProxy name="test_proxy_0">', root)
+            self.assertNotIn("policy2", root)
+            self.assertIn("proxy1-proxy2",
+                          zipf.read("apiproxy/proxies/proxy1-proxy2.xml")
+                          .decode())
+        # Nothing besides the bundle is written
+        self.assertEqual(os.listdir(proxy_bundle_directory),
+                         ["test_proxy_0.zip"])
+        self.assertEqual(sorted(os.listdir(self.test_dir)),
+                         ["bundles", "src"])
+
+    @patch('utils.parse_proxy_root')
+    def test_clone_proxies_shared_root(self, mock_parse):
+        """Test clone proxies with an already parsed root."""
+        source_dir = self._write_source_proxy()
+        proxy_bundle_directory = os.path.join(self.test_dir, "bundles")
+        os.makedirs(proxy_bundle_directory)
+        objects = {
+            "Name": "test_proxy_0",
+            "Policies": ["policy1"],
+            "TargetEndpoints": ["target1"],
+            "ProxyEndpoints": ["proxy1"]
+        }
+        proxy_root = {
             "APIProxy": {
-                "@name": "old_name",
+                "@name": "test_proxy",
                 "Policies": {"Policy": ["policy1", "policy2"]},
                 "TargetEndpoints": {"TargetEndpoint": ["target1", "target2"]},
                 "ProxyEndpoints": {"ProxyEndpoint": ["proxy1", "proxy2"]}
             }
         }
-        mock_filter.side_effect = [
-            {"Policy": ["policy1"]},
-            {"TargetEndpoint": ["target1"]}
-        ]
 
         utils.clone_proxies(
-                source_dir, target_dir, objects, merged_pes,
-                proxy_bundle_directory
+                source_dir, objects,
+                {"proxy1": {"ProxyEndpoint": {"@name": "proxy1"}}},
+                proxy_bundle_directory, proxy_root
                 )
-        mock_copy.assert_called_with(source_dir, f"{target_dir}/apiproxy")
-        mock_write_xml.assert_called()
-        self.assertEqual(mock_clean_up.call_count, 3)
-        self.assertEqual(mock_filter.call_count, 2)
-        (mock_zipfile.assert_called_with(
-            f"{proxy_bundle_directory}/test_proxy.zip",
-            'w',
-            zipfile.ZIP_DEFLATED))
+        mock_parse.assert_not_called()
+        # The shared root must be left untouched for other splits
+        self.assertEqual(proxy_root["APIProxy"]["@name"], "test_proxy")
+        self.assertEqual(proxy_root["APIProxy"]["Policies"],
+                         {"Policy": ["policy1", "policy2"]})
+        proxy_dict = utils.read_proxy_bundle(
+            os.path.join(proxy_bundle_directory, "test_proxy_0.zip"))
+        self.assertEqual(proxy_dict["proxyName"], "test_proxy_0")
+        self.assertEqual(list(proxy_dict["Policies"]), ["policy1"])
+        self.assertEqual(list(proxy_dict["TargetEndpoints"]), ["target1"])
+        self.assertEqual(list(proxy_dict["ProxyEndpoints"]), ["proxy1"])
 
 
 if __name__ == "__main__":
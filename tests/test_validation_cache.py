@@ -0,0 +1,85 @@
+"""
+Tests for the validation_cache module.
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from validation_cache import ValidationCache
+
+
+class TestValidationCache(unittest.TestCase):
+    """
+    Test cases for the ValidationCache class.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.test_dir = tempfile.mkdtemp()
+        self.cache_file = os.path.join(self.test_dir, "cache.json")
+        self.bundle = os.path.join(self.test_dir, "api1.zip")
+        with open(self.bundle, "wb") as f:
+            f.write(b"bundle-bytes")
+
+    def tearDown(self):
+        """
+        Tear down the test case.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_key_depends_on_content(self):
+        """
+        Test that the key changes with the bundle content.
+        """
+        key = ValidationCache.key("org", "apis", self.bundle)
+        self.assertTrue(key.startswith("org:apis:"))
+        with open(self.bundle, "wb") as f:
+            f.write(b"changed-bytes")
+        self.assertNotEqual(
+            key, ValidationCache.key("org", "apis", self.bundle))
+
+    def test_put_get_persist(self):
+        """
+        Test that cacheable results are persisted and reused.
+        """
+        cache = ValidationCache(self.cache_file)
+        key = ValidationCache.key("org", "apis", self.bundle)
+        cache.put(key, {"name": "api1", "importable": True})
+        cache.put("transient", {"importable": False,
+                                "error": {"code": 429}})
+        cache.put("invalid", {"importable": False,
+                              "error": {"code": 400}})
+        cache.save()
+
+        cache = ValidationCache(self.cache_file)
+        self.assertEqual(cache.get(key), {"name": "api1", "importable": True})
+        self.assertIsNone(cache.get("transient"))
+        self.assertIsNotNone(cache.get("invalid"))
+        self.assertEqual(cache.hits, 2)
+
+        forced = ValidationCache(self.cache_file, force_revalidation=True)
+        self.assertIsNone(forced.get(key))
+
+    @patch('validation_cache.time.time')
+    def test_eviction(self, mock_time):
+        """
+        Test age and size based eviction.
+        """
+        mock_time.return_value = 1000.0
+        cache = ValidationCache(self.cache_file, max_entries=2,
+                                max_age_days=1)
+        for i in range(3):
+            mock_time.return_value = 1000.0 + i
+            cache.put(f"k{i}", {"importable": True})
+        cache.save()
+        self.assertEqual(sorted(cache.entries), ["k1", "k2"])
+
+        mock_time.return_value = 1000.0 + 2 * 86400
+        self.assertIsNone(cache.get("k2"))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,9 +1,15 @@
 """
 Tests for the validator module.
 """
+import concurrent.futures
+import os
+import shutil
+import tempfile
 import unittest
+import zipfile
 from unittest.mock import MagicMock, patch
-from validator import ApigeeValidator
+from defusedxml.ElementTree import fromstring
+from validator import ApigeeValidator, find_xml_mismatch
 
 
 class TestApigeeValidator(unittest.TestCase):
@@ -67,6 +73,211 @@ class TestApigeeValidator(unittest.TestCase):
         self.assertEqual(validation['apis'][0]['name'], 'api1')
         self.assertFalse(validation['apis'][0]['importable'])
 
+    @patch('validator.list_dir')
+    def test_validate_proxy_bundles_concurrent(self, mock_list_dir):
+        """
+        Test concurrent validate_proxy_bundles keeps the input order.
+        """
+        validator = ApigeeValidator(
+            baseurl="https://mock.baseurl",
+            project_id="mock_project",
+            token="mock_token",
+            env_type="hybrid",
+            target_export_data={},
+            target_compare=False,
+            validation_workers=4,
+            validation_rate_per_minute=60000
+        )
+        validator.xorhybrid = self.mock_apigee_new_gen
+        self.mock_apigee_new_gen.create_api.side_effect = (
+            lambda api_type, api_name, path, action: {"name": api_name})
+        export_objects = [f"api{i}" for i in range(10)]
+        mock_list_dir.return_value = [
+            f"{name}.zip" for name in export_objects if name != "api3"]
+        validation = validator.validate_proxy_bundles(
+            export_objects, '/tmp', '/tmp', 'apis')
+        self.assertEqual(
+            [each["name"] for each in validation['apis']], export_objects)
+        self.assertFalse(validation['apis'][3]['importable'])
+        self.assertTrue(validation['apis'][4]['importable'])
+        self.assertEqual(self.mock_apigee_new_gen.create_api.call_count, 9)
+
+    @patch('validator.list_dir')
+    def test_validate_proxy_bundles_pre_validation(self, mock_list_dir):
+        """
+        Test that bundles failing local rules are not uploaded.
+        """
+        pre_validator = MagicMock()
+        pre_validator.validate.side_effect = (
+            lambda api_type, api_name:
+            [{"type": "UnsupportedPolicy"}] if api_name == "api1" else [])
+        self.validator.pre_validator = pre_validator
+        self.mock_apigee_new_gen.create_api.return_value = {"name": "api2"}
+        mock_list_dir.return_value = ["api1.zip", "api2.zip"]
+        validation = self.validator.validate_proxy_bundles(
+            ["api1", "api2"], '/tmp', '/tmp', 'apis')
+        self.assertEqual(validation['apis'][0], {
+            "name": "api1", "importable": False,
+            "reason": [{"violations": [{"type": "UnsupportedPolicy"}]}],
+            "imported": "UNKNOWN"})
+        self.assertTrue(validation['apis'][1]['importable'])
+        self.mock_apigee_new_gen.create_api.assert_called_once()
+
+    @patch('validator.list_dir')
+    def test_validate_proxy_bundles_pending_target_export(self, mock_list_dir):
+        """
+        Test that validation starts before the target export finishes.
+        """
+        target_export = concurrent.futures.Future()
+        validator = ApigeeValidator(
+            baseurl="https://mock.baseurl",
+            project_id="mock_project",
+            token="mock_token",
+            env_type="hybrid",
+            target_export_data=target_export,
+            target_compare=True
+        )
+        validator.xorhybrid = self.mock_apigee_new_gen
+        export_done = []
+
+        def create_api(_api_type, api_name, _path, _action):
+            export_done.append(target_export.done())
+            target_export.set_result(
+                {"orgConfig": {"apis": {"api1": {}}}})
+            return {"name": api_name}
+        self.mock_apigee_new_gen.create_api.side_effect = create_api
+        mock_list_dir.return_value = ["api1.zip"]
+        with patch('validator.compare_proxy_bundles',
+                   return_value=["diff"]) as mock_compare:
+            validation = validator.validate_proxy_bundles(
+                ["api1"], '/src', '/target', 'apis')
+        self.assertEqual(export_done, [False])
+        self.assertTrue(validation['apis'][0]['imported'])
+        self.assertEqual(validation['apis'][0]['reason'][0]['violations'],
+                         ["diff"])
+        mock_compare.assert_called_once_with(
+            '/src/apis/api1.zip', '/target/apis/api1.zip')
+
+    def test_validate_proxy_cached(self):
+        """
+        Test that cached validation results skip the upload.
+        """
+        validation_cache = MagicMock()
+        validation_cache.get.side_effect = [None, {"importable": True}]
+        self.validator.validation_cache = validation_cache
+        self.mock_apigee_new_gen.create_api.return_value = {"name": "api1"}
+        first = self.validator.validate_proxy_cached(
+            '/tmp', 'apis', 'api1.zip')
+        second = self.validator.validate_proxy_cached(
+            '/tmp', 'apis', 'api1.zip')
+        self.assertTrue(first["importable"])
+        self.assertEqual(second, {"importable": True, "name": "api1"})
+        self.mock_apigee_new_gen.create_api.assert_called_once()
+        validation_cache.put.assert_called_once()
+
+    def _write_bundle(self, directory, name, files):
+        """
+        Write a proxy bundle zip with the given members.
+        """
+        path = os.path.join(directory, name)
+        with zipfile.ZipFile(path, "w") as zipf:
+            for member, content in files.items():
+                zipf.writestr(member, content)
+        return path
+
+    def test_compare_proxy(self):
+        """
+        Test compare_proxy short-circuits and reports differences.
+        """
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        source = self._write_bundle(test_dir, "source.zip", {
+            "apiproxy/api1.xml": "<APIProxy name='api1'/>",
+            "apiproxy/policies/AM-1.xml": "<AssignMessage name='AM-1'/>",
+            "apiproxy/policies/AM-2.xml": "<AssignMessage><Set>a</Set>"
+                                          "</AssignMessage>",
+            "apiproxy/policies/AM-3.xml": "<AssignMessage/>",
+            "apiproxy/targets/default.xml": "<TargetEndpoint a='1' b='2'>"
+                                            "<URL>http://a</URL>"
+                                            "</TargetEndpoint>",
+            "apiproxy/manifests/manifest.xml": "<Manifest/>",
+        })
+        target = self._write_bundle(test_dir, "target.zip", {
+            "apiproxy/api1.xml": "<APIProxy name='api1'/>",
+            "apiproxy/policies/AM-1.xml": "<AssignMessage name='AM-1'/>",
+            "apiproxy/policies/AM-2.xml": "<AssignMessage><Set>b</Set>"
+                                          "</AssignMessage>",
+            "apiproxy/targets/default.xml": "<TargetEndpoint b='2' a='1'>\n"
+                                            "  <URL>http://a</URL>\n"
+                                            "</TargetEndpoint>",
+        })
+        self.assertEqual(self.validator.compare_proxy(source, target), [
+            "Mismatch in file: apiproxy/policies/AM-2.xml "
+            "at /AssignMessage/Set[1]",
+            "File missing in target: apiproxy/policies/AM-3.xml",
+        ])
+        with patch('validator.ET.fromstring') as mock_fromstring:
+            self.assertEqual(self.validator.compare_proxy(source, source), [])
+            mock_fromstring.assert_not_called()
+        self.assertEqual(
+            self.validator.compare_proxy(source, f"{test_dir}/missing.zip"),
+            [f"Error processing proxy bundles: [Errno 2] No such file or "
+             f"directory: '{test_dir}/missing.zip'"])
+
+    def test_compare_xml_elements(self):
+        """
+        Test canonical XML comparison and mismatch localization.
+        """
+        source = fromstring(
+            "<Flow a='1' b='2'><Step><Name>A</Name></Step>"
+            "<Step><Name>B</Name></Step></Flow>")
+        same = fromstring(
+            "<Flow b='2' a='1'>\n <Step><Name> A </Name></Step>\n"
+            " <Step><Name>B</Name></Step>\n</Flow>")
+        changed = fromstring(
+            "<Flow a='1' b='2'><Step><Name>A</Name></Step>"
+            "<Step><Name>C</Name></Step></Flow>")
+        self.assertTrue(self.validator.compare_xml_elements(source, same))
+        self.assertFalse(self.validator.compare_xml_elements(source, changed))
+        self.assertEqual(find_xml_mismatch(source, changed),
+                         "/Flow/Step[2]/Name[1]")
+        self.assertEqual(find_xml_mismatch(source, fromstring("<Other/>")),
+                         "/Flow")
+
+    def test_compare_xml_elements_deep(self):
+        """
+        Test that deeply nested documents do not hit the recursion limit.
+        """
+        depth = 5000
+        xml1 = "<a>" * depth + "x" + "</a>" * depth
+        xml2 = "<a>" * depth + "y" + "</a>" * depth
+        self.assertTrue(self.validator.compare_xml_elements(
+            fromstring(xml1), fromstring(xml1)))
+        self.assertFalse(self.validator.compare_xml_elements(
+            fromstring(xml1), fromstring(xml2)))
+
+    def test_compare_proxies_parallel(self):
+        """
+        Test that parallel comparisons keep the job order.
+        """
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir)
+        source = self._write_bundle(test_dir, "source.zip", {
+            "apiproxy/policies/AM-1.xml": "<AssignMessage>a</AssignMessage>"
+        })
+        target = self._write_bundle(test_dir, "target.zip", {
+            "apiproxy/policies/AM-1.xml": "<AssignMessage>b</AssignMessage>"
+        })
+        self.validator.compare_workers = 2
+        self.assertEqual(
+            self.validator.compare_proxies([
+                ({}, source, source), ({}, source, target),
+                ({}, target, target)]),
+            [[],
+             ["Mismatch in file: apiproxy/policies/AM-1.xml "
+              "at /AssignMessage"],
+             []])
+
     def test_validate_env_flowhooks(self):
         """
         Test the validate_env_flowhooks method.
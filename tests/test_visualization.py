@@ -0,0 +1,120 @@
+"""
+Tests for the visualization module.
+"""
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from visualization import (
+    ArtifactGraph, build_artifact_graph, CATEGORY, CLUSTER, FAILED,
+    FAILED_CLUSTER, ORG, RESOURCE,
+)
+
+
+class TestArtifactGraph(unittest.TestCase):
+    """
+    Test cases for the artifact graph.
+    """
+
+    def setUp(self):
+        """
+        Set up the test case.
+        """
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        """
+        Tear down the test case.
+        """
+        shutil.rmtree(self.test_dir)
+
+    def test_add_resources_aggregates(self):
+        """
+        Test that resources beyond the threshold are clustered.
+        """
+        graph = ArtifactGraph(threshold=3)
+        root = graph.add_node("ORG | org", kind=ORG)
+        resources = [(f"api{i}", RESOURCE, "") for i in range(10)]
+        resources[4] = ("api4", FAILED, "<b>Reason</b> : 1. bad ")
+        graph.add_resources(root, "apis", resources)
+
+        top = [node for node in graph.nodes if node[1] == root]
+        self.assertEqual(
+            [(node[0], node[2]) for node in top],
+            [("apis 1-9 of 10", FAILED_CLUSTER),
+             ("apis 10-10 of 10", CLUSTER)])
+        self.assertEqual(top[0][3], "Total - 9 apis, 1 not importable")
+        self.assertEqual(
+            [node[0] for node in graph.nodes
+             if node[1] == graph.nodes.index(top[0])],
+            ["apis 1-3 of 10", "apis 4-6 of 10", "apis 7-9 of 10"])
+        leaves = [node[0] for node in graph.nodes
+                  if node[2] in (RESOURCE, FAILED)]
+        self.assertEqual(leaves, [f"api{i}" for i in range(10)])
+        children = {}
+        for node in graph.nodes:
+            children[node[1]] = children.get(node[1], 0) + 1
+        self.assertLessEqual(max(children.values()), 3)
+
+    def test_build_artifact_graph(self):
+        """
+        Test the graph built from an export and validation results.
+        """
+        export_data = {
+            'orgConfig': {'apis': {'api1': {}, 'api2': {}}},
+            'envConfig': {'dev': {'targetServers': {'ts1': {}}}},
+        }
+        final_report = {
+            'apis': {'api1': True,
+                     'api2': [{'violations': [
+                         {'description': 'bad <img src=x onerror=f()>'}]}]},
+            'dev | targetServers': {
+                'ts1': [{'error_msg': {'message': 'no <b>host</b>'}}]},
+        }
+        graph = build_artifact_graph('org', export_data, final_report)
+        nodes = {node[0]: node for node in graph.nodes}
+        self.assertEqual(nodes['ORG | APIS'][2], CATEGORY)
+        self.assertEqual(nodes['api1'][2], RESOURCE)
+        self.assertEqual(nodes['api2'][2], FAILED)
+        self.assertEqual(
+            nodes['api2'][3],
+            '<b>Reason</b> : 1. bad &lt;img src=x onerror=f()&gt; ')
+        self.assertEqual(nodes['ts1'][3],
+                         '<b>Reason</b> : no &lt;b&gt;host&lt;/b&gt;')
+        self.assertIn('/environments/dev/target-servers',
+                      nodes['dev | TARGETSERVERS'][3])
+
+    def test_write_json_html(self):
+        """
+        Test that the graph is written as JSON and standalone HTML.
+        """
+        graph = ArtifactGraph()
+        root = graph.add_node("ORG | org", title='<a href=x>org</a>')
+        graph.add_node("api1", root)
+        json_file = os.path.join(self.test_dir, "graph.json")
+        html_file = os.path.join(self.test_dir, "graph.html")
+        graph.write_json(json_file)
+        graph.write_html(html_file, "Organization - org")
+
+        with open(json_file, encoding="utf-8") as f:
+            self.assertEqual(json.load(f)["nodes"], graph.nodes)
+        with open(html_file, encoding="utf-8") as f:
+            html = f.read()
+        self.assertIn("vis.Network", html)
+        self.assertIn('<a href=x>org<\\/a>', html)
+
+    @patch('visualization.importlib.util.find_spec')
+    def test_write_html_without_pyvis(self, mock_find_spec):
+        """
+        Test that a clear error is raised when pyvis is missing.
+        """
+        mock_find_spec.return_value = None
+        with self.assertRaisesRegex(FileNotFoundError, 'pyvis is required'):
+            ArtifactGraph().write_html(
+                os.path.join(self.test_dir, "graph.html"), "org")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -22,8 +22,6 @@ It then processes this information to create data center mappings and
 generates visual representations of the topology using diagrams.
 """
 import os
-from diagrams import Diagram, Cluster  # noqa pylint: disable=E0401
-from diagrams.generic.blank import Blank  # noqa pylint: disable=E0401
 from classic import ApigeeClassic
 from topology_mapping.pod import pod_mapping
 from utils import write_json, parse_config
@@ -147,6 +145,9 @@ class ApigeeTopology():  # noqa pylint: disable=R0902
         Args:
             data_center (dict): The data center mapping.
         """
+        # diagrams is slow to import, and only needed here.
+        from diagrams import Diagram, Cluster  # noqa pylint: disable=C0415,E0401
+        from diagrams.generic.blank import Blank  # noqa pylint: disable=C0415,E0401
 
         logger.info('Draw network topology mapping graph diagram')
         main_graph_attr = {
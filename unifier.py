@@ -23,6 +23,7 @@ proxy artifacts, analyzes their dependencies,
 and generates modified proxy bundles.
 """
 
+import concurrent.futures
 import utils  # pylint: disable=import-error
 from base_logger import logger
 
@@ -50,10 +51,10 @@ def proxy_unifier(proxy_dir_name):  # noqa pylint: disable=R0914
 
         cfg = utils.parse_config('backend.properties')
         proxy_dir = f"./{inputs_cfg.get('inputs', 'TARGET_DIR')}/{cfg.get('export','EXPORT_DIR')}{cfg['unifier']['source_unzipped_apis']}"  # noqa pylint: disable=C0301
-        proxy_dest_dir = f"./{inputs_cfg.get('inputs', 'TARGET_DIR')}/{cfg.get('export','EXPORT_DIR')}/{cfg['unifier']['unifier_output_dir']}"  # noqa pylint: disable=C0301
         proxy_bundle_directory = f"./{inputs_cfg.get('inputs', 'TARGET_DIR')}/{cfg.get('export','EXPORT_DIR')}/{cfg['unifier']['unifier_zipped_bundles']}"  # noqa pylint: disable=C0301
 
         export_debug_file = cfg.getboolean('unifier', 'debug')
+        split_workers = cfg.getint('unifier', 'split_workers', fallback=4)
 
         utils.create_dir(proxy_bundle_directory)
         proxy_endpoint_count = utils.get_proxy_endpoint_count(cfg)
@@ -62,10 +63,12 @@ def proxy_unifier(proxy_dir_name):  # noqa pylint: disable=R0914
         processed_dict = {}
         each_dir = proxy_dir_name
 
+        # Root XML is parsed once and shared (read-only) by every split
+        proxy_root = utils.parse_proxy_root(
+            f"{proxy_dir}/{each_dir}/apiproxy")
         each_proxy_dict = utils.read_proxy_artifacts(
             f"{proxy_dir}/{each_dir}/apiproxy",
-            utils.parse_proxy_root(
-                f"{proxy_dir}/{each_dir}/apiproxy")
+            proxy_root
         )
 
         if len(each_proxy_dict) > 0:
@@ -76,9 +79,16 @@ def proxy_unifier(proxy_dir_name):  # noqa pylint: disable=R0914
 
         processing_final_dict = final_dict.copy()
 
+        # Lookups over endpoints, policies and paths, computed once per
+        # proxy so grouping and merging do not re-walk the proxy tree
+        proxy_index = {
+            each_api: utils.build_proxy_index(each_api_info)
+            for each_api, each_api_info in processed_dict.items()
+        }
+
         path_group_map = {}
-        for each_api, each_api_info in processed_dict.items():
-            path_group_map[each_api] = utils.get_api_path_groups(each_api_info)  # noqa
+        for each_api, each_api_index in proxy_index.items():
+            path_group_map[each_api] = each_api_index['paths']
 
         grouped_apis = {}
         for each_api, base_path_info in path_group_map.items():
@@ -92,10 +102,19 @@ def proxy_unifier(proxy_dir_name):  # noqa pylint: disable=R0914
         merged_pes = {}
         merged_objects = {}
         for each_api, grouped_api in bundled_group.items():
+            endpoint_index = proxy_index[each_api]['endpoints']
+            policy_index = proxy_index[each_api]['policies']
             for index, each_group in enumerate(grouped_api):
+                group_pes = [pe for pes in each_group.values() for pe in pes]
+                group_pe_set = set(group_pes)
                 merged_objects[f"{each_api}_{index}"] = {
-                    'Policies': [],
-                    'TargetEndpoints': [],
+                    'Name': f"{final_dict[each_api]['proxyName']}_{index}",
+                    'Policies': [
+                        policy for policy, policy_pes in policy_index.items()
+                        if not group_pe_set.isdisjoint(policy_pes)],
+                    'TargetEndpoints': list(dict.fromkeys(
+                        item for pe in group_pes
+                        for item in endpoint_index[pe]['TargetEndpoints'])),
                     'ProxyEndpoints': []
                 }
                 for each_path, pes in each_group.items():
@@ -105,29 +124,31 @@ def proxy_unifier(proxy_dir_name):  # noqa pylint: disable=R0914
                         each_path,
                         pes
                     )
-                    merged_objects[f"{each_api}_{index}"]['Name'] = f"{final_dict[each_api]['proxyName']}_{index}"  # noqa pylint: disable=C0301
-                    merged_objects[f"{each_api}_{index}"]['Policies'].extend(  # noqa
-                        [item for pe in pes for item in processed_dict[each_api][pe]['Policies']])   # noqa pylint: disable=C0301
-                    merged_objects[f"{each_api}_{index}"]['TargetEndpoints'].extend(  # noqa
-                        [item for pe in pes for item in processed_dict[each_api][pe]['TargetEndpoints']])  # noqa pylint: disable=C0301
-                    merged_objects[f"{each_api}_{index}"]['Policies'] = list(set(merged_objects[f"{each_api}_{index}"]['Policies']))  # noqa pylint: disable=C0301
-                    merged_objects[f"{each_api}_{index}"]['TargetEndpoints'] = list(set(merged_objects[f"{each_api}_{index}"]['TargetEndpoints']))  # noqa pylint: disable=C0301
                     merged_objects[f"{each_api}_{index}"]['ProxyEndpoints'].append(each_pe)  # noqa
 
-        for each_api, grouped_api in bundled_group.items():
-            for index, each_group in enumerate(grouped_api):
-
-                utils.clone_proxies(
-                    f"{proxy_dir}/{each_api}/apiproxy",
-                    f"{proxy_dest_dir}/{each_api}_{index}",
-                    merged_objects[f"{each_api}_{index}"],
-                    merged_pes,
-                    proxy_bundle_directory
-                )
+        split_jobs = [
+            (
+                f"{proxy_dir}/{each_api}/apiproxy",
+                merged_objects[f"{each_api}_{index}"],
+            )
+            for each_api, grouped_api in bundled_group.items()
+            for index, _ in enumerate(grouped_api)
+        ]
+        # Each split writes its own bundle, so the groups are produced
+        # concurrently. Threads are used because the unifier already
+        # runs inside a run_parallel worker process.
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=split_workers) as executor:
+            list(executor.map(
+                lambda job: utils.clone_proxies(
+                    job[0], job[1], merged_pes,
+                    proxy_bundle_directory, proxy_root),
+                split_jobs))
 
         files = {
             'final_dict': final_dict,
             'processed_dict': processed_dict,
+            'proxy_index': proxy_index,
             'path_group_map': path_group_map,
             'grouped_apis': grouped_apis,
             'bundled_group': bundled_group,
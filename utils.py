@@ -26,6 +26,7 @@ and handling parallel execution.
 import os
 import sys
 import csv
+import copy
 import json
 import shutil
 import hashlib
@@ -36,6 +37,8 @@ import zipfile
 import requests  # pylint: disable=E0401
 import xmltodict  # pylint: disable=E0401
 from base_logger import logger, EXEC_INFO
+from http_metrics import retry_attempt
+from instrumentation import call_with_metrics, merge_worker_metrics, timed
 
 
 def parse_config(config_file):
@@ -374,7 +377,8 @@ def retry(retries=3, delay=1, backoff=2):  # noqa pylint: disable=W0613
             delay = 1
             for attempt in range(retries + 1):
                 try:
-                    return func(*args, **kwargs)
+                    with retry_attempt(attempt):
+                        return func(*args, **kwargs)
                 except Exception as e: # noqa pylint: disable=W1203,W0718
                     if attempt == retries:
                         raise e
@@ -385,7 +389,7 @@ def retry(retries=3, delay=1, backoff=2):  # noqa pylint: disable=W0613
     return decorator
 
 
-def run_parallel(func, args, workers=10,
+def run_parallel(func, args, workers=10,  # noqa pylint: disable=R0914
                  max_retries=3, retry_delay=1):
     """Runs a function in parallel with \
     multiple arguments.
@@ -400,9 +404,11 @@ def run_parallel(func, args, workers=10,
     Returns:
         List of results.
     """
-    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:  # noqa
+    name = f"run_parallel.{getattr(func, '__name__', 'task')}"
+    with timed(name) as call, \
+            concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:  # noqa
         # Initial futures (future: (arg, retry_count))
-        future_to_arg_retry = {executor.submit(func, arg): (arg, 0) for arg in args}  # noqa
+        future_to_arg_retry = {executor.submit(call_with_metrics, func, arg): (arg, 0) for arg in args}  # noqa pylint: disable=C0301
 
         data = []
         while future_to_arg_retry:
@@ -410,8 +416,11 @@ def run_parallel(func, args, workers=10,
             for future in done:
                 arg, retry_count = future_to_arg_retry.pop(future)
                 try:
-                    data.append(future.result())
+                    result, worker_metrics = future.result()
+                    merge_worker_metrics(worker_metrics)
+                    data.append(result)
                 except Exception as exc:   # noqa pylint: disable=W1203,W0718
+                    call["errors"] += 1
                     if retry_count < max_retries:
                         retry_count += 1
                         logger.warning(  # noqa pylint: disable=W1203
@@ -419,7 +428,7 @@ def run_parallel(func, args, workers=10,
                             exc_info=True,
                         )
                         sleep(retry_delay)
-                        future_to_arg_retry[executor.submit(func, arg)] = (arg, retry_count)   # noqa pylint: disable=C0301
+                        future_to_arg_retry[executor.submit(call_with_metrics, func, arg, retry_count)] = (arg, retry_count)   # noqa pylint: disable=C0301
                     else:
                         data.append("Exception")
                         logger.error(  # noqa pylint: disable=W1203
@@ -473,8 +482,10 @@ def parse_xml(file):
         Parsed XML data as a dictionary.
     """
     try:
-        with open(file) as fl:  # noqa pylint: disable=W1514
-            doc = xmltodict.parse(fl.read())
+        with timed("parse_xml") as call, open(file) as fl:  # noqa pylint: disable=W1514
+            content = fl.read()
+            call["bytes"] = len(content)
+            doc = xmltodict.parse(content)
         return doc
     except FileNotFoundError:
         logger.error(f"File \"{file}\" not found", exc_info=EXEC_INFO)  # noqa pylint: disable=W1203
@@ -570,7 +581,7 @@ def parse_proxy_root_sharding(dir_name):
     return doc
 
 
-def read_proxy_artifacts(dir_name, entrypoint):
+def read_proxy_artifacts(dir_name, entrypoint, reader=parse_xml):
     """Reads Apigee proxy artifacts \
     from a directory.
 
@@ -579,6 +590,8 @@ def read_proxy_artifacts(dir_name, entrypoint):
         the proxy files.
         entrypoint: The entrypoint \
         configuration.
+        reader: Callable parsing an artifact \
+        path into a dictionary.
 
     Returns:
         A dictionary containing the \
@@ -603,7 +616,7 @@ def read_proxy_artifacts(dir_name, entrypoint):
             proxy_endpoints = ([proxy_endpoints] if isinstance(
                 proxy_endpoints, str) else proxy_endpoints)
             for each_pe in proxy_endpoints:
-                proxy_dict['ProxyEndpoints'][each_pe] = parse_xml(
+                proxy_dict['ProxyEndpoints'][each_pe] = reader(
                     os.path.join(dir_name, 'proxies', f"{each_pe}.xml"))
 
             if api_proxy.get('Basepaths', None) is not None:
@@ -617,7 +630,7 @@ def read_proxy_artifacts(dir_name, entrypoint):
                 api_proxy['Policies']['Policy'], str) else policies)
 
             for each_policy in policies:
-                proxy_dict['Policies'][each_policy] = parse_xml(
+                proxy_dict['Policies'][each_policy] = reader(
                     os.path.join(dir_name, 'policies', f"{each_policy}.xml"))
 
         if api_proxy.get('TargetEndpoints') is not None:
@@ -626,13 +639,46 @@ def read_proxy_artifacts(dir_name, entrypoint):
             target_endpoints = ([target_endpoints] if isinstance(
                 target_endpoints, str) else target_endpoints)
             for each_te in target_endpoints:
-                proxy_dict['TargetEndpoints'][each_te] = parse_xml(
+                proxy_dict['TargetEndpoints'][each_te] = reader(
                     os.path.join(dir_name, 'targets', f"{each_te}.xml"))
     except Exception as error: # noqa pylint: disable=W1203,W0718
         logger.error(f"Error: raised error in read_proxy_artifacts {error}")  # noqa pylint: disable=W1203
     return proxy_dict
 
 
+def read_proxy_bundle(zip_path):
+    """Reads Apigee proxy artifacts \
+    from a proxy bundle zip.
+
+    Args:
+        zip_path: Path to the \
+        proxy bundle zip.
+
+    Returns:
+        A dictionary containing the \
+        parsed proxy artifacts.
+    """
+    with zipfile.ZipFile(zip_path) as zipf:
+        members = set(zipf.namelist())
+        root_files = [member for member in members
+                      if member.startswith('apiproxy/') and
+                      member.count('/') == 1 and member.endswith('.xml')]
+        if len(root_files) != 1:
+            logger.error(  # noqa pylint: disable=W1203
+                f"ERROR: Bundle \"{zip_path}\" does not contain a single root xml")  # noqa
+            return {}
+
+        def read_member(file):
+            member = file.replace(os.sep, '/')
+            if member not in members:
+                logger.error(f"File \"{member}\" not found in \"{zip_path}\"")  # noqa pylint: disable=W1203
+                return {}
+            return xmltodict.parse(zipf.read(member))
+
+        return read_proxy_artifacts(
+            'apiproxy', read_member(root_files[0]), read_member)
+
+
 def get_target_endpoints(proxy_endpoint_data):
     """Retrieves target endpoints from \
     proxy endpoint data.
@@ -828,6 +874,59 @@ def get_proxy_objects_relationships(proxy_dict):
     return proxy_object_map
 
 
+def get_base_path_prefix(base_path):
+    """Gets the first segment of a base path.
+
+    Args:
+        base_path: The proxy endpoint \
+        base path.
+
+    Returns:
+        The first non-empty path segment, or \
+        None if there is no base path.
+    """
+    if base_path is None:
+        return None
+    return [i for i in base_path.split('/') if i != ""][0]
+
+
+def build_proxy_index(proxy_rel):
+    """Builds lookup tables over the relationships \
+    of a proxy.
+
+    Args:
+        proxy_rel: Dictionary returned by \
+        get_proxy_objects_relationships.
+
+    Returns:
+        Dictionary with the keys:
+            endpoints: proxy endpoint to its \
+            de-duplicated policies,
+                target endpoints, base path and \
+                base path prefix.
+            policies: policy to the proxy \
+            endpoints using it.
+            paths: base path prefix (or _null_) \
+            to a list of
+                {proxy endpoint: prefix} entries.
+    """
+    proxy_index = {'endpoints': {}, 'policies': {}, 'paths': {}}
+    for pe, pe_info in proxy_rel.items():
+        prefix = get_base_path_prefix(pe_info['BasePath'])
+        proxy_index['endpoints'][pe] = {
+            'Policies': list(dict.fromkeys(pe_info['Policies'])),
+            'TargetEndpoints': list(dict.fromkeys(
+                pe_info['TargetEndpoints'])),
+            'BasePath': pe_info['BasePath'],
+            'PathPrefix': prefix,
+        }
+        for each_policy in proxy_index['endpoints'][pe]['Policies']:
+            proxy_index['policies'].setdefault(each_policy, []).append(pe)
+        proxy_index['paths'].setdefault(
+            '_null_' if prefix is None else prefix, []).append({pe: prefix})
+    return proxy_index
+
+
 def get_api_path_groups(each_api_info):
     """Groups API paths based on their \
     base path.
@@ -842,21 +941,7 @@ def get_api_path_groups(each_api_info):
         lists of
         proxy endpoints.
     """
-    api_path_group_map = {}
-    for pe, pe_info in each_api_info.items():
-        if pe_info['BasePath'] is None:
-            if '_null_' in api_path_group_map:
-                api_path_group_map['_null_'].append({pe: None})
-            else:
-                api_path_group_map['_null_'] = [{pe: None}]
-        else:
-            base_path_split = [i for i in pe_info['BasePath'].split('/') if i != ""]  # noqa
-            if base_path_split[0] in api_path_group_map:
-                api_path_group_map[base_path_split[0]].append(
-                    {pe: base_path_split[0]})
-            else:
-                api_path_group_map[base_path_split[0]] = [{pe: base_path_split[0]}]  # noqa
-    return api_path_group_map
+    return build_proxy_index(each_api_info)['paths']
 
 
 def group_paths_by_path(api_info, pe_count_limit):
@@ -904,12 +989,8 @@ def bundle_path(each_group_bundle):
     for each_group in each_group_bundle:
         subgroups = {}
         for each_pe in each_group:
-            path = list(each_pe.values())[0]
-            proxy_ep = list(each_pe.keys())[0]
-            if path in subgroups:
-                subgroups[path].append(proxy_ep)
-            else:
-                subgroups[path] = [proxy_ep]
+            proxy_ep, path = next(iter(each_pe.items()))
+            subgroups.setdefault(path, []).append(proxy_ep)
         outer_group.append(subgroups)
     return outer_group
 
@@ -1015,14 +1096,19 @@ def merge_proxy_endpoints(api_dict, basepath, pes):
         for the merged
             endpoint.
         pes (list): List of proxy \
-        endpoints to merge.
+        endpoints to merge, in the
+            order they are merged. Endpoints \
+            the proxy does not have
+            are skipped.
 
     Returns:
         dict: The merged proxy endpoint.
     """
     merged_pe = {'ProxyEndpoint': {}}
-    for each_pe, each_pe_info in api_dict['ProxyEndpoints'].items():
-        if each_pe in pes:
+    proxy_endpoints = api_dict['ProxyEndpoints']
+    for each_pe in dict.fromkeys(pes):
+        if each_pe in proxy_endpoints:
+            each_pe_info = proxy_endpoints[each_pe]
             original_basepath = each_pe_info['ProxyEndpoint']['HTTPProxyConnection']['BasePath']   # noqa pylint: disable=C0301
             # TODO : Build full Request path   # noqa pylint: disable=W0511
             condition = (original_basepath if original_basepath is None else f'(request.path Matches "{original_basepath}*")')   # noqa pylint: disable=C0301
@@ -1213,53 +1299,113 @@ def zipdir(path, ziph):
                                        os.path.join(path, '..')))
 
 
-def clone_proxies(source_dir, target_dir,
-                  objects, merged_pes, proxy_bundle_directory):
+def iter_split_bundle_members(source_dir, root_file,  # noqa pylint: disable=R0913,R0914,R0917
+                              objects, merged_pes, root):
+    """Yields the members of a split proxy \
+    bundle.
+
+    Only the artifacts retained by the split are \
+    yielded, read straight
+    from the source bundle. The root XML, \
+    manifests and original
+    proxy endpoints are skipped; the merged \
+    proxy endpoints and the
+    renamed root XML are yielded as rendered \
+    XML content instead.
+
+    Args:
+        source_dir (str): The source \
+        apiproxy directory.
+        root_file (str): Path of the \
+        source root XML.
+        objects (dict): Objects to include.
+        merged_pes (dict): Merged proxy \
+        endpoints.
+        root (dict): The modified root \
+        XML of the split.
+
+    Yields:
+        tuple: (arcname, file_path, content) \
+        where exactly one of
+            file_path or content is set.
+    """
+    bundle_root = os.path.basename(os.path.normpath(source_dir))
+    retained = {
+        'policies': set(objects['Policies']),
+        'targets': set(objects['TargetEndpoints']),
+    }
+    for dir_path, dirs, files in os.walk(source_dir):
+        rel_dir = os.path.relpath(dir_path, source_dir)
+        top_dir = rel_dir.split(os.sep)[0]
+        if top_dir in ('manifests', 'proxies'):
+            dirs[:] = []
+            continue
+        dirs.sort()
+        for file in sorted(files):
+            if rel_dir == '.' and file == os.path.basename(root_file):
+                continue
+            if (rel_dir in retained and
+                    file.split('.xml')[0] not in retained[rel_dir]):
+                continue
+            file_path = os.path.join(dir_path, file)
+            arcname = os.path.relpath(
+                file_path, os.path.join(source_dir, '..'))
+            yield arcname.replace(os.sep, '/'), file_path, None
+    for pe in objects['ProxyEndpoints']:
+        yield (f"{bundle_root}/proxies/{pe}.xml", None,
+               xmltodict.unparse(merged_pes[pe], pretty=True))
+    yield (f"{bundle_root}/{objects['Name']}.xml", None,
+           xmltodict.unparse(root, pretty=True))
+
+
+def clone_proxies(source_dir, objects,  # noqa pylint: disable=R0913,R0917
+                  merged_pes, proxy_bundle_directory,
+                  proxy_root=None):
     """Clones and modifies Apigee proxies.
 
+    The split bundle is written straight into \
+    its zip from the source
+    bundle, without copying the source tree \
+    to an intermediate directory.
+
     Args:
         source_dir (str): The source \
         directory.
-        target_dir (str): The target \
-        directory.
         objects (dict): Objects to include.
         merged_pes (dict): Merged proxy \
         endpoints.
         proxy_bundle_directory (str): \
         Directory to store
             proxy bundles.
+        proxy_root (dict, optional): Already \
+        parsed root XML of the source proxy.
+            It is copied before being modified, \
+            so it can be shared between splits.
 
     Returns:
         dict: The merged proxy endpoints.
     """
     try:
-        target_dir = f"{target_dir}/apiproxy"
-        delete_folder(target_dir)
-        copy_folder(source_dir, target_dir)
-        file = get_proxy_entrypoint(target_dir)
-        # root = parse_xml(file)
-        root = parse_proxy_root(target_dir)
-        delete_file(file)
+        file = get_proxy_entrypoint(source_dir)
+        if proxy_root is None:
+            root = parse_proxy_root(source_dir)
+        else:
+            root = copy.deepcopy(proxy_root)
         root['APIProxy']['@name'] = objects['Name']
         root['APIProxy']['Policies'] = filter_objects(
             root['APIProxy']['Policies'], 'Policy', objects['Policies'])
         root['APIProxy']['TargetEndpoints'] = filter_objects(
             root['APIProxy']['TargetEndpoints'], 'TargetEndpoint', objects['TargetEndpoints'])   # noqa pylint: disable=C0301
-        clean_up_artifacts(f"{target_dir}/policies", objects['Policies'])
-        clean_up_artifacts(f"{target_dir}/targets", objects['TargetEndpoints'])
-        for pe in objects['ProxyEndpoints']:
-            write_xml_from_dict(
-                f"{target_dir}/proxies/{pe}.xml", merged_pes[pe])
-        clean_up_artifacts(f"{target_dir}/proxies", objects['ProxyEndpoints'])
         root['APIProxy']['ProxyEndpoints'] = {'ProxyEndpoint': (
             objects['ProxyEndpoints'] if len(objects['ProxyEndpoints']) > 1 else objects['ProxyEndpoints'][0])}   # noqa pylint: disable=C0301
-        transformed_file = file.split('/')
-        transformed_file[-1] = f"{objects['Name']}.xml"
-        write_xml_from_dict("/".join(transformed_file), root)
-        delete_folder(f"{target_dir}/manifests")
 
         with zipfile.ZipFile(f"{proxy_bundle_directory}/{objects['Name']}.zip", 'w', zipfile.ZIP_DEFLATED) as zipf:   # noqa pylint: disable=C0301
-            zipdir(target_dir, zipf)
+            for arcname, file_path, content in iter_split_bundle_members(
+                    source_dir, file, objects, merged_pes, root):
+                if file_path is not None:
+                    zipf.write(file_path, arcname)
+                else:
+                    zipf.writestr(arcname, content)
 
     except Exception as error: # noqa pylint: disable=W1203,W0718
         logger.error(   # noqa pylint: disable=C0301,W1203
@@ -0,0 +1,161 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Caches proxy bundle validation results between runs.
+
+This module provides a persistent, file backed cache of target
+validation results keyed by target organization, api type and
+the sha256 of the proxy bundle, so that bundles which did not
+change since a previous assessment are not uploaded again.
+"""
+
+import copy
+import hashlib
+import os
+import threading
+import time
+from base_logger import logger
+from utils import parse_json, write_json
+
+SECONDS_PER_DAY = 86400
+
+
+class ValidationCache():
+    """A persistent cache of proxy bundle validation results.
+
+    Entries older than `max_age_days` are dropped, and at most
+    `max_entries` of the most recently used entries are kept
+    when the cache is saved.
+    """
+
+    def __init__(self, cache_file, max_entries=10000, max_age_days=30,
+                 force_revalidation=False):
+        """Initializes ValidationCache.
+
+        Args:
+            cache_file (str): Path of the JSON cache file.
+            max_entries (int): Maximum number of cached results.
+            max_age_days (int): Maximum age of a cached result.
+            force_revalidation (bool): Ignore cached results, while
+                still refreshing the cache with new ones.
+        """
+        self.cache_file = cache_file
+        self.max_entries = max_entries
+        self.max_age = max_age_days * SECONDS_PER_DAY
+        self.force_revalidation = force_revalidation
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.entries = {}
+        if os.path.exists(cache_file):
+            self.entries = parse_json(cache_file).get('entries', {})
+        self.evict()
+
+    @staticmethod
+    def key(org, api_type, bundle_path):
+        """Builds the cache key of a proxy bundle.
+
+        Args:
+            org (str): The target organization.
+            api_type (str): 'apis' or 'sharedflows'.
+            bundle_path (str): Path to the proxy bundle zip.
+
+        Returns:
+            str: The cache key.
+        """
+        digest = hashlib.sha256()
+        with open(bundle_path, 'rb') as fl:
+            for chunk in iter(lambda: fl.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return f"{org}:{api_type}:{digest.hexdigest()}"
+
+    @staticmethod
+    def is_cacheable(result):
+        """Checks if a validation result can be reused.
+
+        Only successful validations and bundle errors reported by
+        the target (HTTP 400) are deterministic for a given bundle;
+        quota, auth and server errors are retried on the next run.
+
+        Args:
+            result (dict): The validation result.
+
+        Returns:
+            bool: True if the result can be cached.
+        """
+        if result.get('importable'):
+            return True
+        error = result.get('error')
+        return isinstance(error, dict) and error.get('code') == 400
+
+    def get(self, key):
+        """Gets a cached validation result.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            dict: A copy of the cached result, or None.
+        """
+        if self.force_revalidation:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry['created'] > self.max_age:
+                del self.entries[key]
+                return None
+            entry['used'] = time.time()
+            self.hits += 1
+            return copy.deepcopy(entry['result'])
+
+    def put(self, key, result):
+        """Caches a validation result if it is deterministic.
+
+        Args:
+            key (str): The cache key.
+            result (dict): The validation result.
+        """
+        if not self.is_cacheable(result):
+            return
+        now = time.time()
+        with self.lock:
+            self.entries[key] = {
+                'created': now,
+                'used': now,
+                'result': copy.deepcopy(result),
+            }
+
+    def evict(self):
+        """Drops expired entries and the least recently used ones."""
+        now = time.time()
+        with self.lock:
+            entries = {
+                key: entry for key, entry in self.entries.items()
+                if now - entry['created'] <= self.max_age
+            }
+            if len(entries) > self.max_entries:
+                recent = sorted(entries, key=lambda k: entries[k]['used'],
+                                reverse=True)[:self.max_entries]
+                entries = {key: entries[key] for key in recent}
+            self.entries = entries
+
+    def save(self):
+        """Evicts stale entries and writes the cache file."""
+        self.evict()
+        logger.info(f"Validation cache hits: {self.hits}, entries: {len(self.entries)}")  # noqa pylint: disable=W1203
+        with self.lock:
+            write_json(self.cache_file, {'entries': self.entries})
@@ -26,17 +26,21 @@ hybrid environments.
 """
 
 import copy
+import json
+import hashlib
 import zipfile
+import concurrent.futures
 import defusedxml.ElementTree as ET  # pylint: disable=E0401
 
 from assessment_mapping.resourcefiles import resourcefiles_mapping
 from assessment_mapping.targetservers import targetservers_mapping
 from nextgen import ApigeeNewGen
+from rate_limiter import TokenBucket
 from utils import list_dir, retry
 from base_logger import logger
 
 
-class ApigeeValidator:
+class ApigeeValidator:  # noqa pylint: disable=R0902
     """Validates Apigee artifacts for Apigee X or hybrid.
 
     Provides methods to validate target servers, resource
@@ -53,26 +57,63 @@ class ApigeeValidator:
         target_export_data,
         target_compare,
         skip_target_validation=False,
-        ssl_verify=True
+        ssl_verify=True,
+        validation_workers=1,
+        validation_rate_per_minute=None,
+        validation_cache=None,
+        compare_workers=1,
+        pre_validator=None
     ):  # noqa pylint: disable=R0913,W0012,R0917
         """Initializes ApigeeValidator.
 
         Args:
             project_id (str): The Google Cloud project ID.
             token (str): The OAuth2 access token.
+            target_export_data (dict or Future): Target export
+                data, or a Future of a running target export.
             env_type (str): The Apigee environment type
                 ('hybrid' or 'x').
+            validation_workers (int): Maximum number of proxy
+                bundle validations in flight.
+            validation_rate_per_minute (int): Maximum number of
+                validation requests sent per minute. No limit
+                when not set.
+            validation_cache (ValidationCache): Cache of prior
+                validation results keyed by bundle content.
+            compare_workers (int): Number of processes used to
+                compare source and target proxy bundles.
+            pre_validator (PreValidator): Local rules run before
+                uploading a bundle for remote validation.
         """
         self.project_id = project_id
-        self.target_export_data = target_export_data
+        self._target_export_data = target_export_data
         self.target_compare = target_compare
         self.skip_target_validation = skip_target_validation
+        self.validation_workers = max(1, validation_workers)
+        self.rate_limiter = None
+        if validation_rate_per_minute:
+            self.rate_limiter = TokenBucket(
+                validation_rate_per_minute / 60, self.validation_workers)
+        self.validation_cache = validation_cache
+        self.compare_workers = max(1, compare_workers)
+        self.pre_validator = pre_validator
         if not self.skip_target_validation:
             self.xorhybrid = ApigeeNewGen(baseurl, project_id, token, env_type,
                                           ssl_verify)
         else:
             self.xorhybrid = None
 
+    @property
+    def target_export_data(self):
+        """dict: Target export data.
+
+        A Future can be given instead of the data while the target
+        export is still running; it is resolved on first access.
+        """
+        if isinstance(self._target_export_data, concurrent.futures.Future):
+            self._target_export_data = self._target_export_data.result()
+        return self._target_export_data
+
     def validate_org_resource(self, resource_type, resources):
         """Validates environment keyvaluemaps.
 
@@ -272,7 +313,7 @@ class ApigeeValidator:
             return True, []
         return False, errors
 
-    def validate_proxy_bundles(self, export_objects, export_dir, target_export_dir, api_type):  # noqa pylint: disable=C0301
+    def validate_proxy_bundles(self, export_objects, export_dir, target_export_dir, api_type):  # noqa pylint: disable=C0301,R0912,R0914
         """Validates proxy bundles.
 
         Args:
@@ -283,46 +324,150 @@ class ApigeeValidator:
             dict: Validation results for APIs and
                 sharedflows.
         """
-        objects = (
-            self.target_export_data.get("orgConfig", {}).get(api_type, {}).keys()  # noqa
-        )  # noqa pylint: disable=C0301
         validation = {api_type: []}
+        compare_jobs = []
         bundle_dir = f"{export_dir}/{api_type}"
         export_bundles = list_dir(bundle_dir)
-        for api_name in export_objects:
-            each_validation = {}
+        # Bundles are validated concurrently, bounded by the number of
+        # workers and the rate limiter, while results keep the order
+        # of export_objects.
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.validation_workers) as executor:
+            validation_futures = []
+            for api_name in export_objects:
+                proxy_bundle = f"{api_name}.zip"
+                if proxy_bundle not in export_bundles:
+                    validation_futures.append(None)
+                    continue
+                local_violations = self.pre_validate(api_type, api_name)
+                if local_violations:
+                    # Known to fail, no need to upload the bundle
+                    logger.info(f"Skipping remote validation of {api_type}: {api_name}, failed local rules",  # noqa pylint: disable=C0301,W1203
+                                extra={"object_type": api_type,
+                                       "object_name": api_name})
+                    local_validation = concurrent.futures.Future()
+                    local_validation.set_result({
+                        "name": api_name,
+                        "importable": False,
+                        "reason": [{"violations": local_violations}],
+                    })
+                    validation_futures.append(local_validation)
+                else:
+                    logger.info(f"Validating {api_type}: {api_name}",  # noqa pylint: disable=W1203
+                                extra={"object_type": api_type,
+                                       "object_name": api_name})
+                    validation_futures.append(executor.submit(
+                        self.validate_proxy_cached, bundle_dir, api_type,
+                        proxy_bundle))
+
+            for api_name, future in zip(export_objects, validation_futures):
+                each_validation = {}
+                if future is not None:
+                    each_validation = future.result()
+                else:
+                    each_validation["name"] = api_name
+                    each_validation["importable"] = False
+                    each_validation["reason"] = [
+                        {
+                            "violations": [
+                                "Proxy bundle parse issue OR No valid revisions found"  # noqa
+                            ]  # noqa pylint: disable=C0301
+                        }
+                    ]
+                validation[api_type].append(each_validation)
+
+        # Target data is only needed from here on, which lets a target
+        # export run while the bundles above are being validated.
+        objects = []
+        if self.target_compare:
+            objects = (
+                self.target_export_data.get("orgConfig", {}).get(api_type, {}).keys()  # noqa
+            )  # noqa pylint: disable=C0301
+        for api_name, each_validation in zip(export_objects,
+                                             validation[api_type]):
             proxy_bundle = f"{api_name}.zip"
-            if proxy_bundle in export_bundles:
-                logger.info(f"Validating {api_type}: {api_name}")  # noqa pylint: disable=W1203
-                each_validation = self.validate_proxy(
-                    bundle_dir, api_type, proxy_bundle
-                )  # noqa pylint: disable=C0301
-            else:
-                each_validation["name"] = api_name
-                each_validation["importable"] = False
-                each_validation["reason"] = [
-                    {
-                        "violations": [
-                            "Proxy bundle parse issue OR No valid revisions found"  # noqa
-                        ]  # noqa pylint: disable=C0301
-                    }
-                ]
             if not self.target_compare:
                 each_validation["imported"] = "UNKNOWN"
             else:
                 if api_name in objects:
                     each_validation["imported"] = True
-                    each_comparison = self.compare_proxy(
+                    compare_jobs.append((
+                        each_validation,
                         f"{export_dir}/{api_type}/{proxy_bundle}",
                         f"{target_export_dir}/{api_type}/{proxy_bundle}",
-                    )
-                    each_validation['reason'][0]['violations'].extend(each_comparison)  # noqa
+                    ))
                 else:
                     each_validation["imported"] = False
-            validation[api_type].append(each_validation)
-            each_validation = {}
+        if self.validation_cache is not None:
+            self.validation_cache.save()
+        for (each_validation, _, _), each_comparison in zip(
+                compare_jobs, self.compare_proxies(compare_jobs)):
+            each_validation['reason'][0]['violations'].extend(each_comparison)  # noqa
         return validation
 
+    def pre_validate(self, api_type, api_name):
+        """Runs the local validation rules on a proxy.
+
+        Args:
+            api_type (str): 'apis' or 'sharedflows'.
+            api_name (str): The API proxy name.
+
+        Returns:
+            list: Violations found locally.
+        """
+        if self.pre_validator is None or self.skip_target_validation:
+            return []
+        return self.pre_validator.validate(api_type, api_name)
+
+    def compare_proxies(self, compare_jobs):
+        """Compares source and target proxy bundles in parallel.
+
+        Args:
+            compare_jobs (list): (validation, source bundle,
+                target bundle) tuples.
+
+        Returns:
+            list: Comparison results, in the order of compare_jobs.
+        """
+        source_bundles = [job[1] for job in compare_jobs]
+        target_bundles = [job[2] for job in compare_jobs]
+        if self.compare_workers == 1 or len(compare_jobs) < 2:
+            return list(map(compare_proxy_bundles,
+                            source_bundles, target_bundles))
+        chunksize = max(1, len(compare_jobs) // (self.compare_workers * 4))
+        with concurrent.futures.ProcessPoolExecutor(
+                max_workers=self.compare_workers) as executor:
+            return list(executor.map(
+                compare_proxy_bundles, source_bundles, target_bundles,
+                chunksize=chunksize))
+
+    def validate_proxy_cached(self, export_dir, each_api_type, proxy_bundle):
+        """Validates a single proxy bundle, reusing cached results.
+
+        Args:
+            export_dir (str): Directory containing
+                proxy bundles.
+            each_api_type (str): Type of proxy ('apis' or
+                'sharedflows').
+            proxy_bundle (str): Proxy bundle filename.
+
+        Returns:
+            dict: Validation result for the proxy.
+        """
+        if self.validation_cache is None or self.skip_target_validation:
+            return self.validate_proxy(export_dir, each_api_type, proxy_bundle)
+        cache_key = self.validation_cache.key(
+            self.project_id, each_api_type, f"{export_dir}/{proxy_bundle}")
+        cached_validation = self.validation_cache.get(cache_key)
+        if cached_validation is not None:
+            logger.info(f"Reusing cached validation of {each_api_type}: {proxy_bundle}")  # noqa pylint: disable=W1203
+            cached_validation["name"] = proxy_bundle.split(".zip")[0]
+            return cached_validation
+        each_validation = self.validate_proxy(
+            export_dir, each_api_type, proxy_bundle)
+        self.validation_cache.put(cache_key, each_validation)
+        return each_validation
+
     def compare_proxy(self, source_proxy_bundle: str, target_proxy_bundle: str):  # noqa
         """Validates proxy bundles.
 
@@ -334,33 +479,7 @@ class ApigeeValidator:
             list: comparison results for API
                     proxy.
         """
-        diff = []
-        try:
-            with zipfile.ZipFile(source_proxy_bundle, "r") as source_zip:
-                with zipfile.ZipFile(target_proxy_bundle, "r") as target_zip:
-                    source_files = {
-                        f.filename for f in source_zip.infolist() if not f.is_dir()  # noqa
-                    }
-                    target_files = {
-                        f.filename for f in target_zip.infolist() if not f.is_dir()  # noqa
-                    }
-                    for file in source_files:
-                        file_dissect = file.split('/')
-                        if (file.endswith(".xml") and
-                                len(file_dissect) > 2 and
-                                file_dissect[1] not in ['manifests']):
-                            source_xml = ET.fromstring(source_zip.read(file))
-                            if file in target_files:
-                                target_xml = ET.fromstring(target_zip.read(file))  # noqa
-                                if not self.compare_xml_elements(
-                                    source_xml, target_xml
-                                ):
-                                    diff.append(f"Mismatch in file: {file}")
-                            else:
-                                diff.append(f"File missing in target: {file}")
-        except (zipfile.BadZipFile, FileNotFoundError) as e:
-            diff.append(f"Error processing proxy bundles: {e}")
-        return diff
+        return compare_proxy_bundles(source_proxy_bundle, target_proxy_bundle)
 
     def compare_xml_elements(self, elem1, elem2):
         """Validates proxy bundles.
@@ -370,19 +489,9 @@ class ApigeeValidator:
             elem2 (str): Target proxy xml.
 
         Returns:
-            bool:
+            bool: True if the canonical XML trees match.
         """
-        if elem1.tag != elem2.tag:
-            return False
-        if elem1.text and elem1.text.strip() != elem2.text and elem2.text.strip():  # noqa
-            return False
-        if elem1.attrib != elem2.attrib:
-            return False
-        if len(elem1) != len(elem2):
-            return False
-        return all(
-            self.compare_xml_elements(c1, c2) for c1, c2 in zip(elem1, elem2)
-        )
+        return find_xml_mismatch(elem1, elem2) is None
 
     @retry()
     def validate_proxy(self, export_dir, each_api_type, proxy_bundle):
@@ -406,6 +515,8 @@ class ApigeeValidator:
                 "reason": [{"violations": ["Validation skipped by user flag."]}],  # noqa
             }
 
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
         validation_response = self.xorhybrid.create_api(
             each_api_type, api_name, f"{export_dir}/{proxy_bundle}", "validate"
         )
@@ -488,3 +599,137 @@ class ApigeeValidator:
         if len(errors) == 0:
             return True, []
         return False, errors
+
+
+def xml_child_paths(element, path):
+    """Lists the children of an XML element with their paths.
+
+    Children are addressed by tag and 1-based position among the
+    siblings with the same tag, e.g. `/ProxyEndpoint/Flows[1]`.
+
+    Args:
+        element (Element): The XML element.
+        path (str): Path of the element.
+
+    Returns:
+        list: (child element, child path) tuples in document order.
+    """
+    positions = {}
+    children = []
+    for child in element:
+        positions[child.tag] = positions.get(child.tag, 0) + 1
+        children.append((child, f"{path}/{child.tag}[{positions[child.tag]}]"))
+    return children
+
+
+def xml_fingerprints(root):
+    """Computes canonical fingerprints of every subtree of an XML tree.
+
+    A fingerprint hashes the tag, sorted attributes and
+    whitespace-stripped text of an element together with the
+    fingerprints of its children, so formatting and attribute order
+    do not matter. The tree is walked iteratively (post-order), which
+    keeps deeply nested documents clear of the recursion limit.
+
+    Args:
+        root (Element): Root of the XML tree.
+
+    Returns:
+        dict: Subtree path to hex sha256 fingerprint.
+    """
+    fingerprints = {}
+    stack = [(root, f"/{root.tag}", None)]
+    while stack:
+        element, path, children = stack.pop()
+        if children is None:
+            children = xml_child_paths(element, path)
+            stack.append((element, path, children))
+            stack.extend((child, child_path, None)
+                         for child, child_path in reversed(children))
+            continue
+        fingerprints[path] = hashlib.sha256(json.dumps([
+            element.tag,
+            sorted(element.attrib.items()),
+            (element.text or "").strip(),
+            [fingerprints[child_path] for _, child_path in children],
+        ]).encode()).hexdigest()
+    return fingerprints
+
+
+def find_xml_mismatch(elem1, elem2):
+    """Finds the first differing subtree of two XML trees.
+
+    Args:
+        elem1 (Element): Source proxy xml.
+        elem2 (Element): Target proxy xml.
+
+    Returns:
+        str: Path of the outermost differing subtree, or None if
+            the trees match.
+    """
+    path = f"/{elem1.tag}"
+    if elem1.tag != elem2.tag:
+        return path
+    fingerprints1 = xml_fingerprints(elem1)
+    fingerprints2 = xml_fingerprints(elem2)
+    if fingerprints1[path] == fingerprints2[path]:
+        return None
+    while True:
+        children1 = xml_child_paths(elem1, path)
+        children2 = xml_child_paths(elem2, path)
+        if (elem1.attrib != elem2.attrib or
+                (elem1.text or "").strip() != (elem2.text or "").strip() or
+                [p for _, p in children1] != [p for _, p in children2]):
+            return path
+        for (child1, child_path), (child2, _) in zip(children1, children2):
+            if fingerprints1[child_path] != fingerprints2[child_path]:
+                elem1, elem2, path = child1, child2, child_path
+                break
+
+
+def compare_proxy_bundles(source_proxy_bundle, target_proxy_bundle):
+    """Compares the XML files of a source and target proxy bundle.
+
+    Members with the same CRC and size are identical and are not
+    parsed. Otherwise both sides are parsed and their canonical
+    fingerprints compared, and the outermost differing subtree of a
+    mismatching member is reported.
+
+    Args:
+        source_proxy_bundle (str): Source proxy bundle.
+        target_proxy_bundle (str): Target proxy bundle.
+
+    Returns:
+        list: comparison results for API
+                proxy.
+    """
+    diff = []
+    try:
+        with zipfile.ZipFile(source_proxy_bundle, "r") as source_zip:
+            with zipfile.ZipFile(target_proxy_bundle, "r") as target_zip:
+                target_files = {
+                    f.filename: f for f in target_zip.infolist() if not f.is_dir()  # noqa
+                }
+                for source_file in source_zip.infolist():
+                    file = source_file.filename
+                    file_dissect = file.split('/')
+                    if (source_file.is_dir() or
+                            not file.endswith(".xml") or
+                            len(file_dissect) <= 2 or
+                            file_dissect[1] in ['manifests']):
+                        continue
+                    target_file = target_files.get(file)
+                    if target_file is None:
+                        diff.append(f"File missing in target: {file}")
+                        continue
+                    if (source_file.CRC == target_file.CRC and
+                            source_file.file_size == target_file.file_size):
+                        continue
+                    mismatch = find_xml_mismatch(
+                        ET.fromstring(source_zip.read(file)),
+                        ET.fromstring(target_zip.read(file)))
+                    if mismatch is not None:
+                        diff.append(f"Mismatch in file: {file} at {mismatch}")
+    except (zipfile.BadZipFile, FileNotFoundError) as e:
+        diff.append(f"Error processing proxy bundles: {e}")
+    return diff
@@ -0,0 +1,388 @@
+#!/usr/bin/python  # noqa pylint: disable=R0801
+
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License
+
+"""Compact visualization of the exported artifacts.
+
+This module builds the artifact graph as a tree of organization,
+environments, resource types and resources, stored as a compact JSON
+list of nodes. Resource types with more resources than a threshold
+are aggregated into cluster nodes of at most threshold children, that
+are expanded in the browser on demand, so large organizations render
+without embedding or laying out every node upfront.
+"""
+
+import glob
+import html
+import importlib.util
+import json
+import os
+from string import Template
+from base_logger import logger
+
+SOURCE_UI_URL = "https://console.cloud.google.com"
+API_URL = "https://apigee.googleapis.com/v1"
+
+# Node kinds, indexes into NODE_STYLES.
+ORG, CATEGORY, RESOURCE, FAILED, CLUSTER, FAILED_CLUSTER = range(6)
+NODE_STYLES = [
+    {"color": "pink", "size": 30},
+    {"color": "#97c2fc", "size": 20},
+    {"color": "#97c2fc", "size": 10},
+    {"color": "red", "size": 10},
+    {"color": "black", "size": 20},
+    {"color": "darkred", "size": 20},
+]
+
+
+HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>$title</title>
+<script>$vis_js</script>
+<style>
+body { margin: 0; font-family: sans-serif; }
+#graph { width: 100%; height: 100vh; }
+#hint { position: absolute; top: 8px; left: 8px; color: #555; }
+</style>
+</head>
+<body>
+<div id="hint">Click a black node to expand or collapse it</div>
+<div id="graph"></div>
+<script type="application/json" id="graph-data">$graph</script>
+<script>
+var graph = JSON.parse(document.getElementById("graph-data").textContent);
+var clusterKinds = [$cluster, $failed_cluster];
+var children = graph.nodes.map(function () { return []; });
+graph.nodes.forEach(function (node, id) {
+  if (node[1] >= 0) { children[node[1]].push(id); }
+});
+var nodes = new vis.DataSet();
+var edges = new vis.DataSet();
+var expanded = {};
+
+function isCluster(id) {
+  return clusterKinds.indexOf(graph.nodes[id][2]) >= 0;
+}
+
+function title(id) {
+  var text = graph.nodes[id][3];
+  if (!text) { return undefined; }
+  var element = document.createElement("div");
+  element.innerHTML = text;
+  return element;
+}
+
+function show(id, batch) {
+  var node = graph.nodes[id];
+  var style = graph.styles[node[2]];
+  batch.nodes.push({id: id, label: node[0], title: title(id), shape: "dot",
+                    color: style.color, size: style.size});
+  if (node[1] >= 0) { batch.edges.push({id: id, from: id, to: node[1]}); }
+  if (!isCluster(id) || expanded[id]) {
+    children[id].forEach(function (child) { show(child, batch); });
+  }
+}
+
+function hide(id, batch) {
+  children[id].forEach(function (child) {
+    batch.push(child);
+    hide(child, batch);
+  });
+}
+
+function toggle(id) {
+  if (!isCluster(id)) { return; }
+  if (expanded[id]) {
+    var hidden = [];
+    hide(id, hidden);
+    expanded[id] = false;
+    nodes.remove(hidden);
+    edges.remove(hidden);
+    return;
+  }
+  expanded[id] = true;
+  var batch = {nodes: [], edges: []};
+  children[id].forEach(function (child) { show(child, batch); });
+  nodes.add(batch.nodes);
+  edges.add(batch.edges);
+}
+
+var initial = {nodes: [], edges: []};
+graph.nodes.forEach(function (node, id) {
+  if (node[1] < 0) { show(id, initial); }
+});
+nodes.add(initial.nodes);
+edges.add(initial.edges);
+var network = new vis.Network(
+  document.getElementById("graph"), {nodes: nodes, edges: edges},
+  {physics: {solver: "forceAtlas2Based",
+             stabilization: {iterations: 150}}});
+network.on("click", function (params) {
+  if (params.nodes.length) { toggle(params.nodes[0]); }
+});
+</script>
+</body>
+</html>
+""")
+
+
+def vis_network_js():
+    """Locates the vis-network library bundled with pyvis.
+
+    The library is located without importing pyvis, whose import is
+    slow, and the newest bundled version is used.
+
+    Returns:
+        str: The path of vis-network.min.js.
+
+    Raises:
+        FileNotFoundError: If pyvis or its vis-network library is
+                           not installed.
+    """
+    spec = importlib.util.find_spec("pyvis")
+    if spec is None or spec.origin is None:
+        raise FileNotFoundError(
+            "pyvis is required to write the visualization, "
+            "install it with pip install -r requirements.txt")
+    candidates = glob.glob(os.path.join(
+        os.path.dirname(spec.origin), "templates", "lib", "vis-*",
+        "vis-network.min.js"))
+    if not candidates:
+        raise FileNotFoundError(
+            f"vis-network.min.js not found in the pyvis package at "
+            f"{os.path.dirname(spec.origin)}")
+    return max(candidates, key=lambda path: [
+        int(part) if part.isdigit() else 0 for part in
+        os.path.basename(os.path.dirname(path))[4:].split(".")])
+
+
+class ArtifactGraph():
+    """A tree of artifacts, stored as a flat list of nodes.
+
+    Each node is a [label, parent, kind, title] list, where parent is
+    the index of the parent node, or -1 for the root, and kind is an
+    index into NODE_STYLES.
+    """
+
+    def __init__(self, threshold=100):
+        """Initializes ArtifactGraph.
+
+        Args:
+            threshold (int): Maximum number of children shown when a
+                             node is expanded.
+        """
+        self.threshold = threshold
+        self.nodes = []
+
+    def add_node(self, label, parent=-1, kind=RESOURCE, title=""):
+        """Adds a node to the graph.
+
+        Args:
+            label (str): The label of the node.
+            parent (int): The index of the parent node.
+            kind (int): The node kind.
+            title (str): The HTML shown when hovering the node, with
+                         any exported names and messages escaped.
+
+        Returns:
+            int: The index of the node.
+        """
+        self.nodes.append([label, parent, kind, title])
+        return len(self.nodes) - 1
+
+    def add_resources(self, parent, name, resources, offset=0, total=None):  # noqa pylint: disable=R0913,R0914,R0917
+        """Adds the resources of a type, aggregating large types.
+
+        When there are more resources than the threshold, they are
+        split into clusters of at most `threshold` consecutive
+        resources, and the clusters are themselves grouped the same
+        way until at most `threshold` nodes hang from the parent.
+
+        Args:
+            parent (int): The index of the resource type node.
+            name (str): The resource type, used in cluster labels.
+            resources (list): The (label, kind, title) of each
+                              resource.
+            offset (int): Position of the first resource among all
+                          resources of the type.
+            total (int): Number of resources of the type.
+        """
+        if len(resources) <= self.threshold:
+            for label, kind, title in resources:
+                self.add_node(label, parent, kind, title)
+            return
+
+        total = total or len(resources)
+        span = self.threshold
+        while -(-len(resources) // span) > self.threshold:
+            span *= self.threshold
+        for start in range(0, len(resources), span):
+            members = resources[start:start + span]
+            failed = sum(1 for _, kind, _ in members if kind == FAILED)
+            first = offset + start + 1
+            summary = f"Total - {len(members)} {html.escape(name)}"
+            if failed:
+                summary += f", {failed} not importable"
+            cluster = self.add_node(
+                f"{name} {first}-{first + len(members) - 1} of {total}",
+                parent, FAILED_CLUSTER if failed else CLUSTER, summary)
+            self.add_resources(
+                cluster, name, members, offset + start, total)
+
+    def to_json(self):
+        """Returns the graph as a JSON serializable dictionary."""
+        return {"styles": NODE_STYLES, "nodes": self.nodes}
+
+    def write_html(self, html_file, title):
+        """Writes the graph as a standalone HTML page.
+
+        The vis-network library bundled with pyvis is inlined, so
+        the page can be opened offline.
+
+        Args:
+            html_file (str): Path of the HTML file.
+            title (str): The page title.
+        """
+        with open(vis_network_js(), encoding="utf-8") as fl:
+            vis_js = fl.read()
+        graph = json.dumps(self.to_json(), separators=(",", ":"))
+        logger.info(f"Writing visualization to File {html_file}")  # noqa pylint: disable=W1203
+        with open(html_file, "w", encoding="utf-8") as fl:
+            fl.write(HTML_TEMPLATE.substitute(
+                title=title, vis_js=vis_js,
+                graph=graph.replace("</", "<\\/"),
+                cluster=CLUSTER, failed_cluster=FAILED_CLUSTER))
+
+    def write_json(self, json_file):
+        """Writes the graph as compact JSON.
+
+        Args:
+            json_file (str): Path of the JSON file.
+        """
+        logger.info(f"Writing visualization graph to File {json_file}")  # noqa pylint: disable=W1203
+        with open(json_file, "w", encoding="utf-8") as fl:
+            json.dump(self.to_json(), fl, separators=(",", ":"))
+
+
+def violations_title(violations):
+    """Formats the validation violations of a resource.
+
+    Args:
+        violations (list): The violations of the resource.
+
+    Returns:
+        str: The HTML title listing the violations.
+    """
+    reasons = " ".join(
+        f"{count}. " + html.escape(
+            violation.get("description", "")
+            if isinstance(violation, dict) else str(violation))
+        for count, violation in enumerate(violations, start=1))
+    return f"<b>Reason</b> : {reasons} "
+
+
+def category_title(resource_url, text):
+    """Formats the title of a node linking to the Apigee console.
+
+    Args:
+        resource_url (str): The URL of the resources in the console.
+        text (str): The link text.
+
+    Returns:
+        str: The HTML title, with the URL and text escaped.
+    """
+    url = html.escape(resource_url)
+    return f'<a href="{url}" target="_blank">{html.escape(text)}</a>'
+
+
+def build_artifact_graph(org, export_data, final_report, threshold=100):  # noqa pylint: disable=R0914
+    """Builds the artifact graph of an export.
+
+    Args:
+        org (str): The source organization.
+        export_data (dict): A dictionary containing the exported
+                            artifact data.
+        final_report (dict): The validation result of each resource,
+                             True when importable, else its reasons.
+        threshold (int): Maximum number of children shown when a
+                         node is expanded.
+
+    Returns:
+        ArtifactGraph: The artifact graph.
+    """
+    graph = ArtifactGraph(threshold)
+    org_url = SOURCE_UI_URL + org
+    root = graph.add_node(
+        f"ORG | {org}", kind=ORG,
+        title=category_title(org_url, f"Organization - {org}"))
+
+    org_links = {
+        "apiProducts": SOURCE_UI_URL + org + "/products",
+        "kvms": API_URL + "/key-value-maps/1/overview",
+    }
+    for key, value in export_data["orgConfig"].items():
+        node = graph.add_node(
+            f"ORG | {key.upper()}", root, CATEGORY, category_title(
+                org_links.get(key, f"{SOURCE_UI_URL}{org}/{key}"),
+                f"Org level {key}"))
+        results = final_report.get(key, {})
+        resources = []
+        for name in value:
+            result = results.get(name, True)
+            if key in ["apis", "sharedflows"] and result is not True:
+                resources.append((name, FAILED, violations_title(
+                    result[0].get("violations", []))))
+            else:
+                resources.append((name, RESOURCE, ""))
+        graph.add_resources(node, key, resources)
+
+    envs = graph.add_node(
+        "ORG | ENVs", root, CATEGORY,
+        category_title(API_URL + "/environments/1/overview",
+                       "Environments"))
+    env_links = {
+        "resourcefiles": API_URL + "/resource-files/1/overview",
+        "kvms": "key-value-maps",
+        "vhosts": "virtual-hosts",
+        "targetServers": "target-servers",
+    }
+    for env, value in export_data["envConfig"].items():
+        env_node = graph.add_node(
+            env, envs, CATEGORY, f"{html.escape(env)} Environment")
+        base_url = f"{SOURCE_UI_URL}{org}/environments/{env}/"
+        for resource, val in value.items():
+            link = env_links.get(resource, resource)
+            node = graph.add_node(
+                f"{env} | {resource.upper()}", env_node, CATEGORY,
+                category_title(
+                    link if link.startswith("http") else base_url + link,
+                    f"Env {env} level {resource}"))
+            results = final_report.get(f"{env} | {resource}", {})
+            resources = []
+            for name in val:
+                result = results.get(name, True)
+                if (resource in ["targetServers", "resourcefiles"]
+                        and result is not True):
+                    message = result[0].get(
+                        "error_msg", {}).get("message", "")
+                    resources.append(
+                        (name, FAILED,
+                         f"<b>Reason</b> : {html.escape(message)}"))
+                else:
+                    resources.append((name, RESOURCE, ""))
+            graph.add_resources(node, resource, resources)
+    return graph